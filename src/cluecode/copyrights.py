@@ -13,6 +13,8 @@ import re
 import string
 import sys
 
+from bisect import bisect_right
+from collections import Counter
 from collections import deque
 from time import time
 
@@ -225,6 +227,127 @@ def detect_copyrights_from_lines(
 ################################################################################
 
 
+class CompiledLexer(lex.Lexer):
+    """
+    A pygmars Lexer that matches Token values with regexes built as
+    alternations of the regex ``matchers`` and caches the label of up to
+    ``cache_size`` Token values.
+
+    This returns the same labels as the pygmars Lexer as the alternatives of a
+    regex are tried in sequence and the first alternative that matches is used,
+    but each regex call tests ``chunk_size`` matchers at once rather than one.
+    Larger alternations are slower as the regex engine cannot quickly reject a
+    value based on the prefix of each matcher. Token values such as
+    "Copyright", "(c)", "Inc." or years recur very often and their cached
+    labels are reused.
+
+    If ``with_stats`` is True, the number of labeled Tokens for each matcher is
+    collected in the ``hits_by_matcher`` mapping of {matcher index: count}.
+
+    For example:
+    >>> lexer = CompiledLexer([(r'^[0-9]+$', 'CD'), (r'^C', 'NNP'), (r'.*', 'NN')])
+    >>> [t.label for t in lexer.lex_strings(['Copyright', '2020', 'foo', '2020'])]
+    ['NNP', 'CD', 'NN', 'CD']
+    """
+
+    def __init__(
+        self,
+        matchers,
+        re_flags=0,
+        chunk_size=16,
+        cache_size=100_000,
+        with_stats=False,
+    ):
+        matchers = list(matchers)
+        super().__init__(matchers=matchers, re_flags=re_flags)
+        self.regexes = [regex for regex, _ in matchers]
+        self.labels = [label for _, label in matchers]
+        self.cache_size = cache_size
+
+        # list of (alternation regex match function, {group: matcher index})
+        # where each matcher is wrapped in a capturing group: this group is the
+        # last matched group when this matcher matches.
+        self.alternations = []
+        for start in range(0, len(matchers), chunk_size):
+            matcher_index_by_group = {}
+            alternatives = []
+            group = 1
+            for midx in range(start, min(start + chunk_size, len(matchers))):
+                regex = self.regexes[midx]
+                if not isinstance(regex, str):
+                    raise lex.InvalidLexerMatcher(
+                        f'CompiledLexer matcher must be a regex string: {regex!r}')
+                matcher_index_by_group[group] = midx
+                alternatives.append(f'({regex})')
+                group += re.compile(regex, flags=re_flags).groups + 1
+            alternation = re.compile('|'.join(alternatives), flags=re_flags)
+            self.alternations.append((alternation.match, matcher_index_by_group))
+
+        # {token value: matcher index or None} for the values seen so far
+        self.matcher_index_by_value = {}
+
+        self.hits_by_matcher = None
+        if with_stats:
+            self.hits_by_matcher = Counter()
+
+    def get_matcher_index(self, value):
+        """
+        Return the index of the first matcher that matches a ``value`` string
+        or None.
+        """
+        cache = self.matcher_index_by_value
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+
+        midx = None
+        for match, matcher_index_by_group in self.alternations:
+            matched = match(value)
+            if matched:
+                midx = matcher_index_by_group[matched.lastindex]
+                break
+
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[value] = midx
+        return midx
+
+    def lex_tokens(self, tokens, trace=False):
+        """
+        Return an iterable of pygmars.Token given a ``tokens`` Token iterable.
+        Assign a "label" to every token whose value is matched by one of regexp
+        rules of this lexer.
+        """
+        if trace:
+            # tracing reports each matcher tested for a Token
+            yield from super().lex_tokens(tokens, trace=trace)
+            return
+
+        get_matcher_index = self.get_matcher_index
+        labels = self.labels
+        hits_by_matcher = self.hits_by_matcher
+        for token in tokens:
+            midx = get_matcher_index(token.value)
+            if midx is not None:
+                token.label = labels[midx]
+                if hits_by_matcher is not None:
+                    hits_by_matcher[midx] += 1
+            yield token
+
+    def get_unused_matchers(self):
+        """
+        Return a list of (matcher index, matcher, label) for the matchers that
+        never labeled a Token. Only available if stats are collected.
+        """
+        hits_by_matcher = self.hits_by_matcher
+        return [
+            (midx, regex, label)
+            for midx, (regex, label) in enumerate(zip(self.regexes, self.labels))
+            if not hits_by_matcher[midx]
+        ]
+
+
 class CopyrightDetector(object):
     """
     Detect copyrights and authors.
@@ -234,7 +357,7 @@ class CopyrightDetector(object):
         """
         Initialize this detector with a lexer and a parser.
         """
-        self.lexer = lex.Lexer(matchers=PATTERNS)
+        self.lexer = CompiledLexer(matchers=PATTERNS)
         self.parser = parse.Parser(
             grammar=GRAMMAR,
             loop=1,
@@ -4318,6 +4441,60 @@ remove_non_chars = re.compile(r'[^a-z0-9]', re.IGNORECASE).sub
 
 has_trailing_year = re.compile(r'(?:19\d\d|20[0-4]\d)+$').findall
 
+# Find the markers of lines that may be candidate lines in raw, unprepared text.
+# This is a superset of what is_candidate(), is_end_of_statement() and the
+# "http" and debian checks of collect_candidate_lines() can accept once a line
+# is prepared, such that a line without any of these markers cannot be a
+# candidate line.
+find_candidate_markers = re.compile(
+    '|'.join([
+        # non-ASCII text may be transliterated to anything
+        r'[^\x00-\x7f]',
+        # statement markers, including the markers created by replacing spaced
+        # or escaped copyright signs and by deleting \xc2 or <s> tags
+        r'opyr|opyl|copr|right|reserv|auth|filecontributor|devel',
+        r'169|xa9|00a9|xc2|\\a9|<a9>|\|copy\||&copy|s/?>|@',
+        r'\([^a-z0-9\n]*c[^a-z0-9\n]*\)',
+        # "by " where the trailing space may come from a replaced character
+        r'by\W',
+        # years
+        r'19[6-9]\d|20\d\d',
+        # "http" in a line with only its letters and digits
+        r'h[^a-z0-9\n]*t[^a-z0-9\n]*t[^a-z0-9\n]*p',
+        # "reserved" at the end of a line with only its letters and digits
+        r'v[^a-z0-9\n]*e[^a-z0-9\n]*d[^a-z0-9\n]*$',
+    ]),
+    re.IGNORECASE | re.MULTILINE,
+).finditer
+
+
+def get_marked_line_indexes(lines):
+    """
+    Return a set of the indexes of the ``lines`` list of text strings that
+    contain some candidate markers. The other lines cannot be candidate lines.
+
+    For example:
+    >>> lines = ['int a;\\n', '/* Copyright 2020 Foo */\\n', 'a = b;\\n']
+    >>> sorted(get_marked_line_indexes(lines))
+    [1]
+    """
+    if not lines:
+        return set()
+
+    # scan the whole text at once rather than each line
+    line_starts = []
+    line_starts_append = line_starts.append
+    start = 0
+    for line in lines:
+        line_starts_append(start)
+        start += len(line) + 1
+
+    text = '\n'.join(lines)
+    return {
+        bisect_right(line_starts, marker.start()) - 1
+        for marker in find_candidate_markers(text)
+    }
+
 
 def collect_candidate_lines(numbered_lines):
     """
@@ -4335,16 +4512,31 @@ def collect_candidate_lines(numbered_lines):
     # used as a state and line counter
     in_copyright = 0
 
+    numbered_lines = list(numbered_lines)
     if TRACE_TOK:
-        numbered_lines = list(numbered_lines)
         logger_debug(f'collect_candidate_lines: numbered_lines: {numbered_lines!r}')
 
+    marked_line_indexes = get_marked_line_indexes([line for _ln, line in numbered_lines])
+    if not marked_line_indexes:
+        return
+
     # the previous line (chars only)
     previous_chars = None
-    for (ln, line) in numbered_lines:
+    for index, (ln, line) in enumerate(numbered_lines):
         if TRACE:
             logger_debug(f'## collect_candidate_lines: evaluating line: {(ln, line)!r}')
 
+        if not in_copyright and index not in marked_line_indexes:
+            # this line cannot be a candidate: skip preparing it
+            if candidates:
+                if TRACE:
+                    logger_debug(f'    collect_candidate_lines: not in COP: yielding candidates\n    {list(candidates)!r}\n')
+
+                yield list(candidates)
+                candidates_clear()
+                previous_chars = None
+            continue
+
         is_debian = 's>' in line
         prepared = prepare_text_line(line)
         if TRACE:
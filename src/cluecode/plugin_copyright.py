@@ -31,6 +31,8 @@ class CopyrightScanner(ScanPlugin):
     run_order = 6
     sort_order = 6
 
+    content_addressable = True
+
     options = [
         PluggableCommandLineOption(('-c', '--copyright',),
             is_flag=True, default=False,
@@ -28,6 +28,8 @@ class EmailScanner(ScanPlugin):
     run_order = 7
     sort_order = 7
 
+    content_addressable = True
+
     options = [
         PluggableCommandLineOption(('-e', '--email',),
             is_flag=True, default=False,
@@ -29,6 +29,8 @@ class UrlScanner(ScanPlugin):
     run_order = 8
     sort_order = 8
 
+    content_addressable = True
+
     options = [
         PluggableCommandLineOption(('-u', '--url',),
             is_flag=True, default=False,
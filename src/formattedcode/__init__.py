@@ -84,3 +84,45 @@ def validate_output_file_path(location):
                 raise InvalidScanCodeOutputFileError(
                     f'output file parent is not a writable directory: {os.fsdecode(location)!r}',
                 )
+
+
+class FilesWriter:
+    """
+    Write scan results for a ``codebase`` with scanned file mappings fed one at
+    a time. This is used to walk and serialize a codebase only once when
+    several output formats are requested together.
+
+    An OutputPlugin supports this by implementing a ``get_files_writer(codebase,
+    **kwargs)`` method that returns a FilesWriter. Subclasses implement start()
+    to write what comes before the files, write() to write a scanned file
+    mapping and finish() to write what comes after the files.
+
+    The default write() collects the mappings in the ``files`` list for output
+    formats that need the whole list of files at once in finish(). Writers must
+    not modify the scanned file mappings as these are shared with other writers.
+    """
+
+    def __init__(self, codebase, **kwargs):
+        self.codebase = codebase
+        self.kwargs = kwargs
+        self.files = []
+
+    def start(self):
+        pass
+
+    def write(self, scanned_file):
+        self.files.append(scanned_file)
+
+    def finish(self):
+        pass
+
+
+def write_files(writer, files):
+    """
+    Write the ``files`` iterable of scanned file mappings with the FilesWriter
+    ``writer``.
+    """
+    writer.start()
+    for scanned_file in files:
+        writer.write(scanned_file)
+    writer.finish()
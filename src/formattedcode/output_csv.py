@@ -21,6 +21,8 @@ from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
 
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
+from formattedcode import write_files
 
 # Tracing flags
 TRACE = os.environ.get('SCANCODE_DEBUG_OUTPUT_CSV', False)
@@ -58,12 +60,42 @@ class CsvOutput(OutputPlugin):
             help='[DEPRECATED] Write scan output as CSV to FILE. ' + DEPRECATED_MSG,
             help_group=OUTPUT_GROUP,
             sort_order=30),
+
+        PluggableCommandLineOption(('--csv-stream',),
+            is_flag=True,
+            default=False,
+            required_options=['csv'],
+            help='Write CSV rows as they are produced with columns computed '
+                 'upfront from the scanned attributes. This uses constant '
+                 'memory but fails on a file with a column that is not part of '
+                 'these standard columns.',
+            help_group=OUTPUT_GROUP,
+            sort_order=31),
     ]
 
     def is_enabled(self, csv, **kwargs):
         return csv
 
-    def process_codebase(self, codebase, csv, **kwargs):
+    def process_codebase(self, codebase, csv, csv_stream=False, **kwargs):
+        writer = self.get_files_writer(codebase, csv, csv_stream)
+        write_files(writer, self.get_files(codebase, **kwargs))
+
+    def get_files_writer(self, codebase, csv, csv_stream=False, **kwargs):
+        if csv_stream:
+            return CsvStreamFilesWriter(codebase, output_file=csv)
+        return CsvFilesWriter(codebase, output_file=csv)
+
+
+class CsvFilesWriter(FilesWriter):
+    """
+    Write the collected files from `codebase` as CSV to `output_file`.
+    """
+
+    def __init__(self, codebase, output_file, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+
+    def start(self):
         warnings.warn(
             DEPRECATED_MSG,
             DeprecationWarning,
@@ -72,11 +104,59 @@ class CsvOutput(OutputPlugin):
         import click
         click.secho('[DEPRECATION WARNING] ' + DEPRECATED_MSG, err=True)
 
-        results = self.get_files(codebase, **kwargs)
-        write_csv(results, csv)
+    def finish(self):
+        write_csv(self.files, self.output_file)
+
+
+class CsvStreamColumnError(Exception):
+    """
+    Raised when a CSV row has columns that are not in the streamed CSV columns.
+    """
+
+
+class CsvStreamFilesWriter(CsvFilesWriter):
+    """
+    Write each file from `codebase` as CSV rows to `output_file` as it comes,
+    using columns computed upfront from the first file attributes rather than
+    collected from all the rows. Raise a CsvStreamColumnError if a row has
+    other columns: these would be missing from the CSV header.
+    """
+
+    def __init__(self, codebase, output_file, **kwargs):
+        super().__init__(codebase, output_file, **kwargs)
+        self.writer = None
+        self.columns = None
+
+    def write(self, scanned_file):
+        if not self.writer:
+            fieldnames = get_csv_columns(scanned_file)
+            self.columns = frozenset(fieldnames)
+            self.writer = csv.DictWriter(self.output_file, fieldnames=fieldnames)
+            self.writer.writeheader()
+
+        columns = self.columns
+        for row in flatten_scan([scanned_file]):
+            unknown_columns = [k for k in row if k not in columns]
+            if unknown_columns:
+                raise CsvStreamColumnError(
+                    f'Cannot write CSV columns: {unknown_columns!r} of '
+                    f'{scanned_file["path"]!r} with --csv-stream. '
+                    'Use --csv without --csv-stream instead.'
+                )
+            self.writer.writerow(row)
+
+    def finish(self):
+        if not self.writer:
+            # no files: write an empty header line
+            csv.DictWriter(self.output_file, fieldnames=[]).writeheader()
 
 
 def write_csv(results, output_file):
+    """
+    Write the `results` scanned files as CSV to `output_file` using all the
+    columns found in the flattened rows. See CsvStreamFilesWriter to write
+    CSV rows without keeping these in memory.
+    """
     # FIXME: this is reading all in memory
     results = list(results)
 
@@ -103,22 +183,90 @@ def write_csv(results, output_file):
         w.writerow(r)
 
 
-def flatten_scan(scan, headers):
+# Columns of the license, copyright, email and url rows in the order of
+# flatten_scan(). These are the same for all the rows of a given key group.
+LICENSE_COLUMNS = [
+    'path',
+    'license_expression',
+    'detection_log',
+    'license_match__license_expression',
+    'license_match__license_expression_spdx',
+    'license_match__from_file',
+    'start_line',
+    'end_line',
+    'license_match__matcher',
+    'license_match__score',
+    'license_match__matched_length',
+    'license_match__match_coverage',
+    'license_match__rule_relevance',
+    'license_match__rule_identifier',
+    'license_match__rule_url',
+    'license_match__matched_text_diagnostics',
+]
+
+COPYRIGHT_COLUMNS = ['path', 'copyright', 'start_line', 'end_line', 'holder', 'author']
+
+EMAIL_COLUMNS = ['path', 'email', 'start_line', 'end_line']
+
+URL_COLUMNS = ['path', 'url', 'start_line', 'end_line']
+
+
+def get_csv_columns(scanned_file):
+    """
+    Return a list of CSV column names for the rows of files that have the same
+    attributes as the `scanned_file` mapping, in the same order as the columns
+    collected by flatten_scan(). All the files of a scan have the same
+    attributes.
+    """
+    columns = {'path': None}
+    columns.update(
+        (k, None) for k, v in scanned_file.items()
+        if k not in ('path', 'scan_errors')
+        and not isinstance(v, (list, dict))
+    )
+    columns['scan_errors'] = None
+
+    if 'license_detections' in scanned_file:
+        columns.update(dict.fromkeys(LICENSE_COLUMNS))
+
+    if any(k in scanned_file for k in ('copyrights', 'holders', 'authors')):
+        columns.update(dict.fromkeys(COPYRIGHT_COLUMNS))
+
+    if 'emails' in scanned_file:
+        columns.update(dict.fromkeys(EMAIL_COLUMNS))
+
+    if 'urls' in scanned_file:
+        columns.update(dict.fromkeys(URL_COLUMNS))
+
+    if 'package_data' in scanned_file:
+        columns.update(
+            ('package__' + k, None) for k in get_package_columns()
+            if k != 'components'
+        )
+
+    return list(columns)
+
+
+def flatten_scan(scan, headers=None):
     """
     Yield ordered dictionaries of key/values flattening the sequence
     data in a single line-separated value and keying always by path,
     given a ScanCode `scan` results list. Update the `headers` mapping
-    sequences with seen keys as a side effect.
+    sequences with seen keys as a side effect if provided.
     """
     seen = set()
 
     def collect_keys(mapping, key_group):
         """Update the headers with new keys."""
+        if headers is None:
+            return
         keys = mapping.keys()
         headers[key_group].extend(k for k in keys if k not in seen)
         seen.update(keys)
 
     for scanned_file in scan:
+        # make a copy: the scanned file mapping may be shared with other outputs
+        scanned_file = dict(scanned_file)
         path = scanned_file.pop('path')
 
         # removing any slash at the begening of the path
@@ -252,10 +400,10 @@ def pretty(data):
     return data
 
 
-def get_package_columns(_columns=set()):
+def get_package_columns(_columns={}):
     """
-    Return (and cache in_columns) a set of package column names included in the
-    CSV output.
+    Return (and cache in_columns) an ordered mapping of package column names
+    included in the CSV output, used as an ordered set.
     Some columsn are excluded for now such as lists of mappings: these do not
     serialize well to CSV
     """
@@ -288,7 +436,7 @@ def get_package_columns(_columns=set()):
     ]
 
     fields = package_data_fields + extra_columns
-    _columns = set(f for f in fields if f not in excluded_columns)
+    _columns.update((f, None) for f in fields if f not in excluded_columns)
     return _columns
 
 
@@ -16,6 +16,7 @@ from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
 
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
 from licensedcode.detection import get_matches_from_detection_mappings
 from scancode import notice
 
@@ -53,6 +54,27 @@ class DebianCopyrightOutput(OutputPlugin):
             output_file=output_debian,
         )
 
+    def get_files_writer(self, codebase, output_debian, **kwargs):
+        return DebianCopyrightFilesWriter(codebase, output_file=output_debian)
+
+
+class DebianCopyrightFilesWriter(FilesWriter):
+    """
+    Write the collected files from `codebase` in Debian copyright format to
+    `output_file`.
+    """
+
+    def __init__(self, codebase, output_file, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+
+    def finish(self):
+        debian_copyright = build_debian_copyright(self.codebase, files=self.files)
+        write_debian_copyright(
+            debian_copyright=debian_copyright,
+            output_file=self.output_file,
+        )
+
 
 def write_debian_copyright(debian_copyright, output_file):
     """
@@ -73,18 +95,20 @@ def write_debian_copyright(debian_copyright, output_file):
             output_file.close()
 
 
-def build_debian_copyright(codebase, **kwargs):
+def build_debian_copyright(codebase, files=None, **kwargs):
     """
     Return a DebianCopyrightobject built from the codebase.
     """
-    paragraphs = list(build_copyright_paragraphs(codebase, **kwargs))
+    paragraphs = list(build_copyright_paragraphs(codebase, files=files, **kwargs))
     return DebianCopyright(paragraphs=paragraphs)
 
 
-def build_copyright_paragraphs(codebase, **kwargs):
+def build_copyright_paragraphs(codebase, files=None, **kwargs):
     """
     Yield paragraphs built from the codebase.
     The codebase is assumed to contains license and copyright detections.
+    Use the optional `files` scanned file mappings if provided instead of
+    collecting these from the `codebase`.
     """
 
     codebase.add_files_count_to_current_header()
@@ -101,7 +125,10 @@ def build_copyright_paragraphs(codebase, **kwargs):
     # TODO: infer files patternsas in decopy
 
     # for now this is dumb and will generate one paragraph per scanned file
-    for scanned_file in OutputPlugin.get_files(codebase, **kwargs):
+    if files is None:
+        files = OutputPlugin.get_files(codebase, **kwargs)
+
+    for scanned_file in files:
         if scanned_file['type'] == 'directory':
             continue
         dfiles = scanned_file['path']
@@ -27,6 +27,8 @@ from commoncode.fileutils import file_name
 from commoncode.fileutils import file_base_name
 from commoncode.fileutils import parent_directory
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
+from formattedcode import write_files
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import OUTPUT_GROUP
 from plugincode.output import output_impl
@@ -77,18 +79,14 @@ class HtmlOutput(OutputPlugin):
         return html
 
     def process_codebase(self, codebase, html, **kwargs):
-        results = self.get_files(codebase, **kwargs)
-        version = codebase.get_or_create_current_header().tool_version
-        license_references = []
-        if hasattr(codebase.attributes, 'license_references'):
-            license_references = codebase.attributes.license_references
+        writer = self.get_files_writer(codebase, html)
+        write_files(writer, self.get_files(codebase, **kwargs))
+
+    def get_files_writer(self, codebase, html, **kwargs):
         template_loc = join(TEMPLATES_DIR, 'html', 'template.html')
-        output_file = html
-        write_templated(
-            output_file=output_file,
-            results=results,
-            license_references=license_references,
-            version=version,
+        return TemplatedFilesWriter(
+            codebase=codebase,
+            output_file=html,
             template_loc=template_loc,
         )
 
@@ -125,19 +123,40 @@ class CustomTemplateOutput(OutputPlugin):
         return custom_output and custom_template
 
     def process_codebase(self, codebase, custom_output, custom_template, **kwargs):
-        results = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, custom_output, custom_template)
+        write_files(writer, self.get_files(codebase, **kwargs))
+
+    def get_files_writer(self, codebase, custom_output, custom_template, **kwargs):
+        return TemplatedFilesWriter(
+            codebase=codebase,
+            output_file=custom_output,
+            template_loc=custom_template,
+        )
+
+
+class TemplatedFilesWriter(FilesWriter):
+    """
+    Write the collected files from `codebase` to `output_file` formatted with
+    the Jinja template at `template_loc`.
+    """
+
+    def __init__(self, codebase, output_file, template_loc, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+        self.template_loc = template_loc
+
+    def finish(self):
+        codebase = self.codebase
         version = codebase.get_or_create_current_header().tool_version
         license_references = []
         if hasattr(codebase.attributes, 'license_references'):
             license_references = codebase.attributes.license_references
-        template_loc = custom_template
-        output_file = custom_output
         write_templated(
-            output_file=output_file,
-            results=results,
+            output_file=self.output_file,
+            results=self.files,
             license_references=license_references,
             version=version,
-            template_loc=template_loc
+            template_loc=self.template_loc,
         )
 
 
@@ -268,11 +287,31 @@ class HtmlAppOutput(OutputPlugin):
         return html_app
 
     def process_codebase(self, codebase, input, html_app, **kwargs):  # NOQA
-        results = self.get_files(codebase, **kwargs)
-        version = codebase.get_or_create_current_header().tool_version
-        output_file = html_app
-        scanned_path = input
-        create_html_app(output_file, results, version, scanned_path)
+        writer = self.get_files_writer(codebase, input, html_app)
+        write_files(writer, self.get_files(codebase, **kwargs))
+
+    def get_files_writer(self, codebase, input, html_app, **kwargs):  # NOQA
+        return HtmlAppFilesWriter(
+            codebase=codebase,
+            output_file=html_app,
+            scanned_path=input,
+        )
+
+
+class HtmlAppFilesWriter(FilesWriter):
+    """
+    Write the collected files from `codebase` as a mini HTML application to
+    `output_file`.
+    """
+
+    def __init__(self, codebase, output_file, scanned_path, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+        self.scanned_path = scanned_path
+
+    def finish(self):
+        version = self.codebase.get_or_create_current_header().tool_version
+        create_html_app(self.output_file, self.files, version, self.scanned_path)
 
 
 class HtmlAppAssetCopyWarning(Exception):
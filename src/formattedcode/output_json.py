@@ -6,14 +6,24 @@
 # See https://github.com/nexB/scancode-toolkit for support or download.
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
+import json
+
 import jsonstreams
 
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
+from formattedcode import write_files
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import OUTPUT_GROUP
 from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
 
+try:
+    # optional faster JSON serializer
+    import orjson
+except ImportError:
+    orjson = None
+
 """
 Output plugins to write scan results as JSON.
 """
@@ -57,6 +67,9 @@ class JsonCompactOutput(OutputPlugin):
     def process_codebase(self, codebase, output_json, **kwargs):
         write_results(codebase, output_file=output_json, pretty=False, **kwargs)
 
+    def get_files_writer(self, codebase, output_json, **kwargs):
+        return JsonFilesWriter(codebase, output_file=output_json, pretty=False)
+
 
 @output_impl
 class JsonPrettyOutput(OutputPlugin):
@@ -76,55 +89,156 @@ class JsonPrettyOutput(OutputPlugin):
     def process_codebase(self, codebase, output_json_pp, **kwargs):
         write_results(codebase, output_file=output_json_pp, pretty=True, **kwargs)
 
+    def get_files_writer(self, codebase, output_json_pp, **kwargs):
+        return JsonFilesWriter(codebase, output_file=output_json_pp, pretty=True)
+
+
+class FastJSONEncoder(json.JSONEncoder):
+    """
+    A JSONEncoder that serializes with orjson when installed and when its output
+    is the same as the standard json encoder output, and otherwise with the
+    standard json encoder.
+
+    orjson only supports an indentation of two spaces with the "," and ": "
+    separators of the standard pretty-printed JSON, and never escapes non-ASCII
+    characters: it is used only for pretty-printed JSON with ASCII-only text.
+    orjson also writes floats differently (such as 3.5e-05 as 0.000035 and NaN
+    as null): it is not used for objects that contain a float.
+    """
+
+    def _orjson_encode(self, o):
+        """
+        Return a JSON string for ``o`` serialized with orjson or None.
+        """
+        if (
+            not orjson
+            or self.indent != 2
+            or self.item_separator != ','
+            or self.key_separator != ': '
+            or self.sort_keys
+            or has_float(o)
+        ):
+            return
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+        try:
+            encoded = orjson.dumps(o, option=option).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            return
+        if self.ensure_ascii and not encoded.isascii():
+            return
+        return encoded
+
+    def encode(self, o):
+        encoded = self._orjson_encode(o)
+        if encoded is None:
+            encoded = super().encode(o)
+        return encoded
+
+    def iterencode(self, o, _one_shot=False):
+        encoded = self._orjson_encode(o)
+        if encoded is None:
+            return super().iterencode(o, _one_shot)
+        return iter([encoded])
+
+
+def has_float(o):
+    """
+    Return True if ``o`` is a float or a list, tuple or mapping that contains a
+    float at any depth.
+    """
+    stack = [o]
+    stack_pop = stack.pop
+    stack_extend = stack.extend
+    while stack:
+        value = stack_pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            stack_extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack_extend(value)
+    return False
+
 
 def write_results(codebase, output_file, pretty=False, **kwargs):
     """
     Write headers, files, and other attributes from `codebase` to `output_file`
 
     Enable JSON indentation if `pretty` is True
+
+    The files are streamed one at a time: the list of files is never built in
+    memory.
+    """
+    # We pass this function's kwargs as arguments to OutputPlugin.get_files()
+    writer = JsonFilesWriter(codebase, output_file=output_file, pretty=pretty)
+    write_files(writer, OutputPlugin.get_files(codebase, **kwargs))
+
+
+class JsonFilesWriter(FilesWriter):
     """
-    # Set indentation for JSON output if `pretty` is True
-    # We use a separate dict for jsonstream kwargs since we are passing
-    # this function's kwargs as arguments to OutputPlugin.get_files()
-    if pretty:
-        jsonstreams_kwargs = dict(indent=2, pretty=True)
-    else:
-        jsonstreams_kwargs = dict(indent=None, pretty=False)
-
-    # If `output_file` is a path string, open the file at path `output_file` and use it as `output_file`
-    close_fd = False
-    if isinstance(output_file, str):
-        output_file = open(output_file, 'w')
-        close_fd = True
-
-    # Begin wri'w' JSON to `output_file`
-    with jsonstreams.Stream(
-        jsonstreams.Type.OBJECT,
-        fd=output_file,
-        close_fd=close_fd,
-        **jsonstreams_kwargs
-    ) as s:
+    Stream headers, files, and other attributes from `codebase` as JSON to
+    `output_file`. Enable JSON indentation if `pretty` is True.
+    """
+
+    def __init__(self, codebase, output_file, pretty=False, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+        self.pretty = pretty
+        self.stream = None
+        self.files_array = None
+
+    def start(self):
+        # Set indentation for JSON output if `pretty` is True
+        if self.pretty:
+            jsonstreams_kwargs = dict(indent=2, pretty=True)
+        else:
+            jsonstreams_kwargs = dict(indent=None, pretty=False)
+
+        # If `output_file` is a path string, open the file at path
+        # `output_file` and use it as `output_file`
+        output_file = self.output_file
+        close_fd = False
+        if isinstance(output_file, str):
+            output_file = open(output_file, 'w', encoding='utf-8')
+            close_fd = True
+
+        # Begin writing JSON to `output_file`
+        stream = self.stream = jsonstreams.Stream(
+            jsonstreams.Type.OBJECT,
+            fd=output_file,
+            close_fd=close_fd,
+            encoder=FastJSONEncoder,
+            **jsonstreams_kwargs
+        )
+
         # Write headers
+        codebase = self.codebase
         codebase.add_files_count_to_current_header()
         codebase_headers = codebase.get_headers()
-        s.write('headers', codebase_headers)
+        stream.write('headers', codebase_headers)
 
         # Write attributes
         if codebase.attributes:
             for attribute_key, attribute_value in codebase.attributes.to_dict().items():
-                s.write(attribute_key, attribute_value)
+                stream.write(attribute_key, attribute_value)
 
         # Write files
-        codebase_files = OutputPlugin.get_files(codebase, **kwargs)
-        # OutputPlugin.get_files() returns a generator, not JSON-serializable
-        codebase_files = list(codebase_files)
-        s.write('files', codebase_files)
+        self.files_array = stream.subarray('files')
+
+    def write(self, scanned_file):
+        self.files_array.write(scanned_file)
+
+    def finish(self):
+        self.files_array.close()
+        self.stream.close()
 
 
-def get_results(codebase, as_list=False, **kwargs):
+def get_results(codebase, as_list=False, files=None, **kwargs):
     """
     Return an ordered mapping of scan results collected from a `codebase`.
     if `as_list` consume the "files" iterator in a list sequence.
+    Use the optional `files` scanned file mappings if provided instead of
+    collecting these from the `codebase`.
     """
 
     codebase.add_files_count_to_current_header()
@@ -134,7 +248,8 @@ def get_results(codebase, as_list=False, **kwargs):
     if codebase.attributes:
         results.update(codebase.attributes.to_dict())
 
-    files = OutputPlugin.get_files(codebase, **kwargs)
+    if files is None:
+        files = OutputPlugin.get_files(codebase, **kwargs)
     if as_list:
         files = list(files)
     results['files'] = files
@@ -9,6 +9,8 @@
 import json
 
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
+from formattedcode import write_files
 from commoncode.cliutils import OUTPUT_GROUP
 from commoncode.cliutils import PluggableCommandLineOption
 from plugincode.output import OutputPlugin
@@ -36,27 +38,45 @@ class JsonLinesOutput(OutputPlugin):
 
     # TODO: reuse the json output code and merge that in a single plugin
     def process_codebase(self, codebase, output_json_lines, **kwargs):
-        # NOTE: we write as binary, not text
-        files = self.get_files(codebase, **kwargs)
+        writer = self.get_files_writer(codebase, output_json_lines)
+        write_files(writer, self.get_files(codebase, **kwargs))
 
+    def get_files_writer(self, codebase, output_json_lines, **kwargs):
+        return JsonLinesFilesWriter(codebase, output_file=output_json_lines)
+
+
+class JsonLinesFilesWriter(FilesWriter):
+    """
+    Write headers, attributes and one line for each file from `codebase` as
+    JSON Lines to `output_file`.
+    """
+
+    compact_separators = (u',', u':',)
+
+    def __init__(self, codebase, output_file, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+
+    def start(self):
+        codebase = self.codebase
+        output_json_lines = self.output_file
         codebase.add_files_count_to_current_header()
 
         headers = dict(headers=codebase.get_headers())
 
-        compact_separators = (u',', u':',)
         output_json_lines.write(
-            json.dumps(headers, separators=compact_separators))
+            json.dumps(headers, separators=self.compact_separators))
         output_json_lines.write('\n')
 
         for name, value in codebase.attributes.to_dict().items():
             if value:
                 smry = {name: value}
                 output_json_lines.write(
-                    json.dumps(smry, separators=compact_separators))
+                    json.dumps(smry, separators=self.compact_separators))
                 output_json_lines.write('\n')
 
-        for scanned_file in files:
-            scanned_file_line = {'files': [scanned_file]}
-            output_json_lines.write(
-                json.dumps(scanned_file_line, separators=compact_separators))
-            output_json_lines.write('\n')
+    def write(self, scanned_file):
+        scanned_file_line = {'files': [scanned_file]}
+        self.output_file.write(
+            json.dumps(scanned_file_line, separators=self.compact_separators))
+        self.output_file.write('\n')
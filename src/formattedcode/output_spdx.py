@@ -37,6 +37,8 @@ from spdx_tools.spdx.model import RelationshipType
 from spdx_tools.spdx.spdx_element_utils import calculate_package_verification_code
 
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
+from formattedcode import write_files
 from licensedcode.detection import get_matches_from_detection_mappings
 from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
@@ -82,13 +84,15 @@ class SpdxTvOutput(OutputPlugin):
         return spdx_tv
 
     def process_codebase(self, codebase, spdx_tv, **kwargs):
-        _process_codebase(
-            spdx_plugin=self,
+        writer = self.get_files_writer(codebase, spdx_tv, **kwargs)
+        write_files(writer, self.get_files(codebase, **kwargs))
+
+    def get_files_writer(self, codebase, spdx_tv, **kwargs):
+        return SpdxFilesWriter(
             codebase=codebase,
             input_path=kwargs.get('input', ''),
             output_file=spdx_tv,
             as_tagvalue=True,
-            **kwargs
         )
 
 
@@ -107,42 +111,45 @@ class SpdxRdfOutput(OutputPlugin):
         return spdx_rdf
 
     def process_codebase(self, codebase, spdx_rdf, **kwargs):
-        _process_codebase(
-            spdx_plugin=self,
+        writer = self.get_files_writer(codebase, spdx_rdf, **kwargs)
+        write_files(writer, self.get_files(codebase, **kwargs))
+
+    def get_files_writer(self, codebase, spdx_rdf, **kwargs):
+        return SpdxFilesWriter(
             codebase=codebase,
             input_path=kwargs.get('input', ''),
             output_file=spdx_rdf,
             as_tagvalue=False,
-            **kwargs
         )
 
 
-def _process_codebase(
-    spdx_plugin,
-    codebase,
-    input_path,
-    output_file,
-    as_tagvalue=True,
-    **kwargs,
-):
-    check_sha1(codebase)
-    files = spdx_plugin.get_files(codebase, **kwargs)
-    header = codebase.get_or_create_current_header()
-    tool_name = header.tool_name
-    tool_version = header.tool_version
-    notice = header.notice
-    package_name = build_package_name(input_path)
-
-    write_spdx(
-        codebase=codebase,
-        output_file=output_file,
-        files=files,
-        tool_name=tool_name,
-        tool_version=tool_version,
-        notice=notice,
-        package_name=package_name,
-        as_tagvalue=as_tagvalue,
-    )
+class SpdxFilesWriter(FilesWriter):
+    """
+    Write the collected files from `codebase` as an SPDX document to
+    `output_file`, as Tag/Value if `as_tagvalue` is True or as RDF otherwise.
+    """
+
+    def __init__(self, codebase, input_path, output_file, as_tagvalue=True, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.input_path = input_path
+        self.output_file = output_file
+        self.as_tagvalue = as_tagvalue
+
+    def start(self):
+        check_sha1(self.codebase)
+
+    def finish(self):
+        header = self.codebase.get_or_create_current_header()
+        write_spdx(
+            codebase=self.codebase,
+            output_file=self.output_file,
+            files=self.files,
+            tool_name=header.tool_name,
+            tool_version=header.tool_version,
+            notice=header.notice,
+            package_name=build_package_name(self.input_path),
+            as_tagvalue=self.as_tagvalue,
+        )
 
 
 def build_package_name(input_path):
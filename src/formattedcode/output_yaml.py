@@ -12,6 +12,7 @@ import saneyaml
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import OUTPUT_GROUP
 from formattedcode import FileOptionType
+from formattedcode import FilesWriter
 from formattedcode import output_json
 from plugincode.output import output_impl
 from plugincode.output import OutputPlugin
@@ -41,6 +42,24 @@ class YamlOutput(OutputPlugin):
         results = output_json.get_results(codebase, as_list=True, **kwargs)
         write_yaml(results, output_file=output_yaml, pretty=False)
 
+    def get_files_writer(self, codebase, output_yaml, **kwargs):
+        return YamlFilesWriter(codebase, output_file=output_yaml)
+
+
+class YamlFilesWriter(FilesWriter):
+    """
+    Write scan results from `codebase` and the collected files as YAML to
+    `output_file`.
+    """
+
+    def __init__(self, codebase, output_file, **kwargs):
+        super().__init__(codebase, **kwargs)
+        self.output_file = output_file
+
+    def finish(self):
+        results = output_json.get_results(self.codebase, files=self.files)
+        write_yaml(results, output_file=self.output_file, pretty=False)
+
 
 def write_yaml(results, output_file, **kwargs):
     """
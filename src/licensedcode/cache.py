@@ -7,12 +7,20 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from array import array
+from collections import defaultdict
+from hashlib import sha1
+from hashlib import sha256
+import mmap
 import os
 import pickle
 from shutil import rmtree
+from time import time
 
 from commoncode.fileutils import create_dir
+from intbitset import intbitset
 
+from scancode_config import __version__ as scancode_version
 from scancode_config import licensedcode_cache_dir
 from scancode_config import scancode_cache_dir
 
@@ -21,6 +29,18 @@ An on-disk persistent cache of LicenseIndex and related data structures such as
 the licenses database. The data are pickled and must be regenerated if there
 are any changes in the code or licenses text or rules. Loading and dumping the
 cached pickle is safe to use across multiple processes using lock files.
+
+The large per-rule structures of the LicenseIndex (the sequence, set and
+multiset of token ids and the high token postings of each rule) are not pickled.
+They are instead saved as flat arrays in a file next to the pickle and
+memory-mapped read-only at load time: all the scan worker processes share the
+same pages through the OS page cache and do not pay for unpickling these. The
+sets, multisets and postings of a rule are decoded when accessed.
+
+When building the index, the tokenized form of each rule text is cached on disk
+by a hash of its content and of the tokenizer code. Only new or modified rules
+are tokenized again on the next build that is not forced, optionally using
+multiple processes.
 """
 
 # This is the Pickle protocol we use, which was added in Python 3.4.
@@ -32,8 +52,13 @@ _LICENSE_CACHE = None
 LICENSE_INDEX_LOCK_TIMEOUT = 60 * 6
 LICENSE_INDEX_DIR = 'license_index'
 LICENSE_INDEX_FILENAME = 'index_cache'
+LICENSE_INDEX_ARRAYS_FILENAME = 'index_arrays'
 LICENSE_LOCKFILE_NAME = 'scancode_license_index_lockfile'
 LICENSE_CHECKSUM_FILE = 'scancode_license_index_tree_checksums'
+# this is stored outside of the LICENSE_INDEX_DIR as it is valid across builds
+LICENSE_RULE_TOKENS_FILENAME = 'rule_tokens_cache'
+# precomputed package license statements detections, valid for an index build
+LICENSE_STATEMENTS_FILENAME = 'license_statements_cache'
 
 
 class LicenseCache:
@@ -50,6 +75,7 @@ class LicenseCache:
         unknown_spdx_symbol=None,
         additional_license_directory=None,
         additional_license_plugins=None,
+        timings=None,
     ):
         # mapping of License objects by key
         self.db = db
@@ -64,6 +90,10 @@ class LicenseCache:
         # Additional licenses from directory and plugins
         self.additional_license_directory = additional_license_directory
         self.additional_license_plugins = additional_license_plugins
+        # mapping of {build phase: duration in seconds} for a built index
+        self.timings = timings or {}
+        # checksum of the index arrays file saved with the pickled index
+        self.arrays_checksum = None
 
     @staticmethod
     def load_or_build(
@@ -77,6 +107,7 @@ class LicenseCache:
         licenses_data_dir=None,
         rules_data_dir=None,
         additional_directory=None,
+        processes=1,
     ):
         """
         Load or build and save and return a LicenseCache object.
@@ -94,6 +125,13 @@ class LicenseCache:
         - ``additional_directory`` is an optional additional directory
           that contain additional licenses and rules in a /licenses and a /rules
           directories using the same format that we use for licenses and rules.
+        - ``processes`` is the number of processes used to tokenize the rules
+          that are not yet in the rule tokens cache when building the index.
+          A ``force`` build tokenizes all the rules and does not reuse this
+          cache.
+
+        The ``timings`` of each phase of a build are available in the returned
+        LicenseCache.
         """
         idx_cache_dir = os.path.join(licensedcode_cache_dir, LICENSE_INDEX_DIR)
         if only_builtin:
@@ -156,10 +194,13 @@ class LicenseCache:
                 )
                 # Here, the cache is either stale or non-existing: we need to
                 # rebuild all cached data (e.g. mostly the index) and cache it
+                timings = {}
+                start = time()
                 licenses_db = load_licenses_from_multiple_dirs(
                     additional_license_data_dirs=additional_license_dirs,
                     builtin_license_data_dir=licenses_data_dir,
                 )
+                timings['load licenses'] = time() - start
 
                 # create a single merged index containing license data from licenses_data_dir
                 # and data from additional directories
@@ -169,11 +210,19 @@ class LicenseCache:
                     rules_data_dir=rules_data_dir,
                     index_all_languages=index_all_languages,
                     additional_directories=plugin_directories,
+                    timings=timings,
+                    processes=processes,
+                    rule_tokens_cache_file=os.path.join(
+                        licensedcode_cache_dir, LICENSE_RULE_TOKENS_FILENAME),
+                    # a forced reindex tokenizes all the rules again
+                    reuse_rule_tokens=not force,
                 )
 
+                start = time()
                 spdx_symbols = build_spdx_symbols(licenses_db=licenses_db)
                 unknown_spdx_symbol = build_unknown_spdx_symbol(licenses_db=licenses_db)
                 licensing = build_licensing(licenses_db=licenses_db)
+                timings['build licensing'] = time() - start
 
                 license_cache = LicenseCache(
                     db=licenses_db,
@@ -183,11 +232,18 @@ class LicenseCache:
                     unknown_spdx_symbol=unknown_spdx_symbol,
                     additional_license_directory=additional_directory,
                     additional_license_plugins=plugin_directories,
+                    timings=timings,
                 )
 
                 # save the cache as pickle new tree checksum
-                with open(cache_file, 'wb') as fn:
-                    pickle.dump(license_cache, fn, protocol=PICKLE_PROTOCOL)
+                start = time()
+                dump_cache_file(license_cache, cache_file)
+                timings['save cache'] = time() - start
+
+                # precomputed license statements are stale with a new index
+                statements_file = os.path.join(idx_cache_dir, LICENSE_STATEMENTS_FILENAME)
+                if os.path.exists(statements_file):
+                    os.remove(statements_file)
 
                 return license_cache
 
@@ -208,6 +264,10 @@ def build_index(
     rules_data_dir=None,
     index_all_languages=False,
     additional_directories=None,
+    timings=None,
+    processes=1,
+    rule_tokens_cache_file=None,
+    reuse_rule_tokens=True,
 ):
     """
     Return an index built from rules and licenses directories
@@ -216,6 +276,12 @@ def build_index(
     Otherwise, only include the English license texts and rules (the default)
     If ``additional_directories`` is not None, we will include licenses and rules
     from these additional directories in the returned index.
+    If ``timings`` is a mapping, update it with the duration in seconds of the
+    loading, tokenizing and indexing of rules.
+    Tokenize rules using up to ``processes`` processes.
+    If ``rule_tokens_cache_file`` is provided, update it with the tokenized
+    rules of this index, and reuse the tokenized rules cached in this file if
+    ``reuse_rule_tokens`` is True.
     """
     from licensedcode.index import LicenseIndex
     from licensedcode.models import get_license_dirs
@@ -239,7 +305,11 @@ def build_index(
         # generate a single combined license db with all licenses
         licenses_db = load_licenses_from_multiple_dirs(license_dirs=combined_license_directories)
 
+    if timings is None:
+        timings = {}
+
     # if we have additional directories, extract the rules from them
+    start = time()
     additional_rule_dirs = get_rule_dirs(additional_dirs=additional_directories)
     validate_ignorable_clues(rule_directories=additional_rule_dirs, is_builtin=False)
     # then combine the rules in these additional directories with the rules in the original rules directory
@@ -255,15 +325,210 @@ def build_index(
 
     # only skip licenses to be indexed
     if not index_all_languages:
-        rules = (r for r in rules if r.language == 'en')
+        rules = [r for r in rules if r.language == 'en']
+    else:
+        rules = list(rules)
+    timings['load rules'] = time() - start
+
+    start = time()
+    cached_tokenized_by_key = {}
+    if rule_tokens_cache_file and reuse_rule_tokens:
+        cached_tokenized_by_key = load_rule_tokens_cache(rule_tokens_cache_file)
+
+    tokenized_by_key = tokenize_rules(
+        rules=rules,
+        processes=processes,
+        cached_tokenized_by_key=cached_tokenized_by_key,
+    )
+    if rule_tokens_cache_file and tokenized_by_key.keys() != cached_tokenized_by_key.keys():
+        dump_rule_tokens_cache(tokenized_by_key, rule_tokens_cache_file)
+
+    tokenized_by_identifier = {
+        rule.identifier: tokenized_by_key[get_rule_tokens_key(rule)]
+        for rule in rules
+    }
+    timings['tokenize rules'] = time() - start
 
-    return LicenseIndex(
+    start = time()
+    index = LicenseIndex(
         rules,
         _legalese=legalese,
         _spdx_tokens=spdx_tokens,
         _license_tokens=license_tokens,
         _all_languages=index_all_languages,
+        _tokenized_by_identifier=tokenized_by_identifier,
     )
+    timings['index rules'] = time() - start
+    return index
+
+
+def get_rule_tokens_key(rule):
+    """
+    Return a rule tokens cache key string for a ``rule`` Rule. This is a hash of
+    the rule text and of the rule tokenizer code: rules with the same text share
+    the same tokenized form until the tokenizer changes.
+    """
+    content = f'{get_rule_tokenizer_checksum()}:{rule.is_from_license}:{rule.text}'
+    return sha1(content.encode('utf-8')).hexdigest()
+
+
+# modules whose code determines the tokenized form of a rule text
+RULE_TOKENIZER_MODULES = (
+    'licensedcode.models',
+    'licensedcode.spans',
+    'licensedcode.stopwords',
+    'licensedcode.tokenize',
+)
+
+_rule_tokenizer_checksum = None
+
+
+def get_rule_tokenizer_checksum():
+    """
+    Return a checksum string of the code of the modules used to tokenize rule
+    texts, such as the tokenizers, stopwords and key phrases parsing.
+    """
+    global _rule_tokenizer_checksum
+    if not _rule_tokenizer_checksum:
+        import importlib
+        checksum = sha1()
+        for module_name in RULE_TOKENIZER_MODULES:
+            module = importlib.import_module(module_name)
+            with open(module.__file__, 'rb') as inp:
+                checksum.update(inp.read())
+        _rule_tokenizer_checksum = checksum.hexdigest()
+    return _rule_tokenizer_checksum
+
+
+def _tokenize_rule(key_text_is_from_license_and_identifier):
+    """
+    Return a tuple of (rule tokens cache key, tokenized rule text) for a tuple
+    of (key, text, is_from_license, identifier). This runs in a worker process.
+    """
+    from licensedcode.models import tokenize_rule_text
+    key, text, is_from_license, identifier = key_text_is_from_license_and_identifier
+    tokenized = tokenize_rule_text(
+        text=text,
+        is_from_license=is_from_license,
+        identifier=identifier,
+    )
+    return key, tokenized
+
+
+def tokenize_rules(rules, processes=1, cached_tokenized_by_key=None):
+    """
+    Return a mapping of {rule tokens cache key: tokenized rule text} for a
+    ``rules`` list of Rule, where a tokenized rule text is a tuple of (tokens,
+    stopwords_by_pos, key_phrase_spans).
+
+    Reuse the tokenized rule texts available in the ``cached_tokenized_by_key``
+    mapping and only tokenize the other rules, using up to ``processes``
+    processes. The returned mapping contains only the keys of ``rules``.
+    """
+    cached_tokenized_by_key = cached_tokenized_by_key or {}
+    tokenized_by_key = {}
+    to_tokenize = {}
+    for rule in rules:
+        key = get_rule_tokens_key(rule)
+        cached = cached_tokenized_by_key.get(key)
+        if cached:
+            tokenized_by_key[key] = cached
+        elif key not in to_tokenize:
+            to_tokenize[key] = (key, rule.text, rule.is_from_license, rule.identifier)
+
+    if processes > 1 and len(to_tokenize) > 1:
+        from scancode.pool import get_pool
+        pool = get_pool(processes=processes)
+        try:
+            tokenized = list(pool.imap_unordered(
+                _tokenize_rule, to_tokenize.values(), chunksize=100))
+            pool.close()
+        finally:
+            pool.terminate()
+    else:
+        tokenized = map(_tokenize_rule, to_tokenize.values())
+
+    tokenized_by_key.update(tokenized)
+    return tokenized_by_key
+
+
+def load_rule_tokens_cache(location):
+    """
+    Return a mapping of {rule tokens cache key: tokenized rule text} loaded from
+    a rule tokens cache file at ``location``. Return an empty mapping if this
+    file does not exist, is not readable or was created by another ScanCode
+    version.
+    """
+    return load_versioned_mapping(location)
+
+
+def dump_rule_tokens_cache(tokenized_by_key, location):
+    """
+    Save a ``tokenized_by_key`` mapping of {rule tokens cache key: tokenized
+    rule text} to a rule tokens cache file at ``location``.
+    """
+    dump_versioned_mapping(tokenized_by_key, location)
+
+
+def load_versioned_mapping(location):
+    """
+    Return a mapping loaded from a pickle file at ``location`` saved with
+    dump_versioned_mapping(). Return an empty mapping if this file does not
+    exist, is not readable or was created by another ScanCode version.
+    """
+    if not os.path.exists(location):
+        return {}
+    try:
+        with open(location, 'rb') as inp:
+            version, mapping = pickle.load(inp)
+    except Exception:
+        # a corrupted cache is rebuilt from scratch
+        return {}
+    if version != scancode_version:
+        return {}
+    return mapping
+
+
+def dump_versioned_mapping(mapping, location):
+    """
+    Save a ``mapping`` with the current ScanCode version to a pickle file at
+    ``location``.
+    """
+    tmp_location = f'{location}.{os.getpid()}.tmp'
+    with open(tmp_location, 'wb') as out:
+        pickle.dump((scancode_version, mapping), out, protocol=PICKLE_PROTOCOL)
+    os.replace(tmp_location, location)
+
+
+def get_license_statements_file():
+    """
+    Return the location of the precomputed package license statements table
+    file stored with the license index.
+    """
+    return os.path.join(
+        licensedcode_cache_dir, LICENSE_INDEX_DIR, LICENSE_STATEMENTS_FILENAME)
+
+
+def load_license_statements_table(location=None):
+    """
+    Return a mapping of {license statement cache key: detection results}
+    loaded from a precomputed package license statements table file at
+    ``location`` or the default location. Return an empty mapping if this
+    file does not exist, is not readable or was created by another ScanCode
+    version.
+    """
+    location = location or get_license_statements_file()
+    return load_versioned_mapping(location)
+
+
+def dump_license_statements_table(table, location=None):
+    """
+    Save a ``table`` mapping of {license statement cache key: detection
+    results} to a precomputed package license statements table file at
+    ``location`` or the default location.
+    """
+    location = location or get_license_statements_file()
+    dump_versioned_mapping(table, location)
 
 
 def build_licensing(licenses_db=None):
@@ -387,7 +652,8 @@ def get_cache(
     only_builtin=False,
     force=False,
     index_all_languages=False,
-    additional_directory=None
+    additional_directory=None,
+    processes=1,
 ):
     """
     Return a LicenseCache either rebuilt, cached or loaded from disk.
@@ -395,12 +661,14 @@ def get_cache(
     If ``index_all_languages`` is True, include texts in all languages when
     building the license index. Otherwise, only include the English license \
     texts and rules (the default)
+    Use up to ``processes`` processes to tokenize rules when building the index.
     """
     return populate_cache(
         only_builtin=only_builtin,
         force=force,
         index_all_languages=index_all_languages,
         additional_directory=additional_directory,
+        processes=processes,
     )
 
 
@@ -408,7 +676,8 @@ def populate_cache(
     only_builtin=False,
     force=False,
     index_all_languages=False,
-    additional_directory=None
+    additional_directory=None,
+    processes=1,
 ):
     """
     Return, load or build and cache a LicenseCache.
@@ -425,10 +694,62 @@ def populate_cache(
             # used for testing only
             timeout=LICENSE_INDEX_LOCK_TIMEOUT,
             additional_directory=additional_directory,
+            processes=processes,
         )
     return _LICENSE_CACHE
 
 
+def get_arrays_file(cache_file):
+    """
+    Return the location of the index arrays file stored next to a
+    ``cache_file`` pickle.
+    """
+    return os.path.join(os.path.dirname(cache_file), LICENSE_INDEX_ARRAYS_FILENAME)
+
+
+def get_mapped_index_attributes():
+    """
+    Return a tuple of the names of the LicenseIndex per-rule attributes saved in
+    the index arrays file rather than pickled.
+    """
+    from licensedcode.index import USE_BIGRAM_MULTISETS
+    if USE_BIGRAM_MULTISETS:
+        # bigram multisets are keyed by tuples and cannot be stored flat
+        return 'tids_by_rid', 'sets_by_rid', 'high_postings_by_rid'
+    return 'tids_by_rid', 'sets_by_rid', 'msets_by_rid', 'high_postings_by_rid'
+
+
+def dump_cache_file(license_cache, cache_file):
+    """
+    Save a ``license_cache`` LicenseCache to ``cache_file``. The large index
+    per-rule structures are saved separately as flat arrays in a
+    memory-mappable file. Both files share the checksum of the arrays: they are
+    written to temporary files first and then renamed, the pickle last.
+    """
+    index = license_cache.index
+    arrays_file = get_arrays_file(cache_file)
+    # write then rename: never truncate a file that may be mapped by another
+    # process as this would crash that process
+    tmp_arrays_file = f'{arrays_file}.{os.getpid()}.tmp'
+    tmp_cache_file = f'{cache_file}.{os.getpid()}.tmp'
+
+    license_cache.arrays_checksum = dump_index_arrays(index, tmp_arrays_file)
+
+    # these are not pickled: they are memory-mapped at load time
+    mapped = {name: getattr(index, name) for name in get_mapped_index_attributes()}
+    for name in mapped:
+        setattr(index, name, None)
+    try:
+        with open(tmp_cache_file, 'wb') as fn:
+            pickle.dump(license_cache, fn, protocol=PICKLE_PROTOCOL)
+    finally:
+        for name, value in mapped.items():
+            setattr(index, name, value)
+
+    os.replace(tmp_arrays_file, arrays_file)
+    os.replace(tmp_cache_file, cache_file)
+
+
 def load_cache_file(cache_file):
     """
     Return a LicenseCache loaded from ``cache_file``.
@@ -436,7 +757,16 @@ def load_cache_file(cache_file):
     with open(cache_file, 'rb') as lfc:
         # Note: weird but read() + loads() is much (twice++???) faster than load()
         try:
-            return pickle.load(lfc)
+            license_cache = pickle.load(lfc)
+            index = license_cache.index
+            if index.tids_by_rid is None:
+                arrays = IndexArrays(
+                    location=get_arrays_file(cache_file),
+                    checksum=getattr(license_cache, 'arrays_checksum', None),
+                )
+                for name in get_mapped_index_attributes():
+                    setattr(index, name, MAPPED_CLASS_BY_ATTRIBUTE[name](arrays))
+            return license_cache
         except Exception as e:
             msg = (
                 'ERROR: Failed to load license cache (the file may be corrupted ?).\n'
@@ -447,6 +777,260 @@ def load_cache_file(cache_file):
             raise Exception(msg) from e
 
 
+# Layout of an index arrays file, all in native byte order:
+# - 8 bytes magic
+# - 32 bytes checksum: the sha256 digest of the arrays table and data
+# - 8 bytes count of arrays as an unsigned long long
+# - for each array, 24 bytes: an 8 bytes name, an 8 bytes typecode and the
+#   length in items of the array as an unsigned long long
+# - the data of all the arrays concatenated, each padded to 8 bytes
+INDEX_ARRAYS_MAGIC = b'SCIDXA02'
+OFFSET_TYPECODE = 'Q'
+TOKEN_ID_TYPECODE = 'h'
+
+
+def dump_index_arrays(index, location):
+    """
+    Save the per-rule structures of a LicenseIndex ``index`` as flat arrays in
+    a file at ``location``. Return the checksum of these arrays.
+
+    Each of the sequences of token ids, token ids sets and multisets and high
+    token postings of all the rules are concatenated in one array with an array
+    of offsets by rule id.
+    """
+    arrays = {}
+    arrays.update(flatten_token_ids(index.tids_by_rid, prefix=b'tids'))
+    arrays.update(flatten_token_ids(
+        (tids_set and sorted(tids_set) for tids_set in index.sets_by_rid),
+        prefix=b'sets',
+    ))
+
+    if 'msets_by_rid' in get_mapped_index_attributes():
+        msets = [mset and sorted(mset.items()) for mset in index.msets_by_rid]
+        arrays.update(flatten_token_ids(
+            (items and [tid for tid, _ in items] for items in msets),
+            prefix=b'mset',
+        ))
+        arrays[b'mset_cnt'] = array(
+            'L', (count for items in msets if items for _, count in items))
+
+    postings_tids = []
+    postings_positions = []
+    for postings in index.high_postings_by_rid:
+        if postings is None:
+            postings_tids.append(None)
+            continue
+        postings = sorted(postings.items())
+        postings_tids.append([tid for tid, _ in postings])
+        postings_positions.extend(positions for _, positions in postings)
+    arrays.update(flatten_token_ids(postings_tids, prefix=b'hpos'))
+    arrays.update(flatten_token_ids(postings_positions, prefix=b'hpop'))
+
+    header = array(OFFSET_TYPECODE, [len(arrays)]).tobytes()
+    data = []
+    for name, arr in arrays.items():
+        header += name.ljust(8) + arr.typecode.encode('ascii').ljust(8)
+        header += array(OFFSET_TYPECODE, [len(arr)]).tobytes()
+        arr_data = arr.tobytes()
+        data.append(arr_data + bytes(-len(arr_data) % 8))
+
+    checksum = sha256(header)
+    for arr_data in data:
+        checksum.update(arr_data)
+    checksum = checksum.digest()
+
+    with open(location, 'wb') as out:
+        out.write(INDEX_ARRAYS_MAGIC)
+        out.write(checksum)
+        out.write(header)
+        for arr_data in data:
+            out.write(arr_data)
+
+    return checksum
+
+
+def flatten_token_ids(sequences, prefix):
+    """
+    Return a mapping of {name: array} with a ``prefix``-named array of all the
+    concatenated token ids ``sequences``, an array of the offset of each
+    sequence in it and an array of flags set for the sequences that are not
+    None.
+    """
+    offsets = array(OFFSET_TYPECODE, [0])
+    has_sequences = array('b')
+    tids = array(TOKEN_ID_TYPECODE)
+    for sequence in sequences:
+        has_sequences.append(sequence is not None)
+        if sequence is not None:
+            tids.extend(sequence)
+        offsets.append(len(tids))
+    return {prefix: tids, prefix + b'_off': offsets, prefix + b'_has': has_sequences}
+
+
+class IndexArrays:
+    """
+    A read-only mapping of {name: memoryview} of the arrays of a memory-mapped
+    index arrays file. Raise an Exception if the file does not have the
+    expected ``checksum`` when provided, e.g. if it does not belong to the same
+    index build as the pickled index.
+    """
+
+    def __init__(self, location, checksum=None):
+        self.location = location
+        with open(location, 'rb') as inp:
+            self._mmap = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buf = memoryview(self._mmap)
+        magic_len = len(INDEX_ARRAYS_MAGIC)
+        if bytes(buf[:magic_len]) != INDEX_ARRAYS_MAGIC:
+            raise Exception(f'Invalid license index arrays file: {location!r}')
+
+        checksum_end = magic_len + 32
+        self.checksum = bytes(buf[magic_len:checksum_end])
+        if checksum is not None and self.checksum != checksum:
+            raise Exception(
+                f'License index arrays file: {location!r} does not belong to '
+                'the same index build as the license index cache.'
+            )
+
+        table_start = checksum_end + 8
+        (count,) = buf[checksum_end:table_start].cast(OFFSET_TYPECODE)
+        data_start = table_start + count * 24
+        self._arrays = arrays = {}
+        for i in range(count):
+            entry = table_start + i * 24
+            name = bytes(buf[entry:entry + 8]).rstrip()
+            typecode = bytes(buf[entry + 8:entry + 16]).rstrip().decode('ascii')
+            (length,) = buf[entry + 16:entry + 24].cast(OFFSET_TYPECODE)
+            data_end = data_start + length * array(typecode).itemsize
+            arrays[name] = buf[data_start:data_end].cast(typecode)
+            data_start = data_end + (-data_end % 8)
+
+    def __getitem__(self, name):
+        return self._arrays[name]
+
+    def __reduce__(self):
+        # an mmap cannot be pickled: map the file again instead
+        return IndexArrays, (self.location, self.checksum)
+
+
+class MappedRuleArrays:
+    """
+    A read-only list-like mapping of {rid: value or None} backed by the
+    ``prefix``-named arrays of an IndexArrays. Subclasses decode a value from
+    the slice of the rule data.
+
+    If ``keep_decoded`` is True, a decoded value is kept and reused on the
+    next accesses: only the rules that are matching candidates in a process
+    are decoded, once.
+    """
+    prefix = None
+    keep_decoded = False
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self._data = arrays[self.prefix]
+        self._offsets = arrays[self.prefix + b'_off']
+        self._has_values = arrays[self.prefix + b'_has']
+        self._count = len(self._offsets) - 1
+        self._decoded = {}
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, rid):
+        if self.keep_decoded:
+            decoded = self._decoded.get(rid)
+            if decoded is not None:
+                return decoded
+
+        if not 0 <= rid < self._count:
+            raise IndexError(rid)
+        if not self._has_values[rid]:
+            return None
+        offsets = self._offsets
+        decoded = self.decode(offsets[rid], offsets[rid + 1])
+        if self.keep_decoded:
+            self._decoded[rid] = decoded
+        return decoded
+
+    def decode(self, start, end):
+        return self._data[start:end]
+
+    def __iter__(self):
+        for rid in range(self._count):
+            yield self[rid]
+
+    def __reduce__(self):
+        return self.__class__, (self.arrays,)
+
+
+class MappedTokenIds(MappedRuleArrays):
+    """
+    The sequence of token ids by rid. Each item is a zero-copy memoryview of
+    signed short token ids that behaves like the array('h') it replaces.
+    """
+    prefix = b'tids'
+
+
+class MappedTokenIdsSets(MappedRuleArrays):
+    """
+    The intbitset of token ids by rid, decoded on first access.
+    """
+    prefix = b'sets'
+    keep_decoded = True
+
+    def decode(self, start, end):
+        return intbitset(self._data[start:end].tolist())
+
+
+class MappedTokenIdsMultisets(MappedRuleArrays):
+    """
+    The multiset of token ids by rid as a {tid: count} defaultdict, decoded on
+    first access.
+    """
+    prefix = b'mset'
+    keep_decoded = True
+
+    def __init__(self, arrays):
+        super().__init__(arrays)
+        self._counts = arrays[b'mset_cnt']
+
+    def decode(self, start, end):
+        return defaultdict(int, zip(self._data[start:end], self._counts[start:end]))
+
+
+class MappedHighPostings(MappedRuleArrays):
+    """
+    The high token postings by rid as a {tid: positions} mapping or None,
+    decoded on first access. Each positions is a zero-copy memoryview of signed short
+    positions.
+    """
+    prefix = b'hpos'
+    keep_decoded = True
+
+    def __init__(self, arrays):
+        super().__init__(arrays)
+        self._positions = arrays[b'hpop']
+        self._positions_offsets = arrays[b'hpop_off']
+
+    def decode(self, start, end):
+        positions = self._positions
+        positions_offsets = self._positions_offsets
+        return {
+            tid: positions[positions_offsets[i]:positions_offsets[i + 1]]
+            for i, tid in enumerate(self._data[start:end], start)
+        }
+
+
+MAPPED_CLASS_BY_ATTRIBUTE = {
+    'tids_by_rid': MappedTokenIds,
+    'sets_by_rid': MappedTokenIdsSets,
+    'msets_by_rid': MappedTokenIdsMultisets,
+    'high_postings_by_rid': MappedHighPostings,
+}
+
+
 def get_index(
     only_builtin=False,
     force=False,
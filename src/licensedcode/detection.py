@@ -561,6 +561,20 @@ class LicenseDetectionFromResult(LicenseDetection):
         return detection
 
 
+def get_file_region_from_mapping(license_detection_mapping, path):
+    """
+    Return a FileRegion for a LicenseDetection mapping
+    ``license_detection_mapping`` found in the file at ``path``, computed
+    from the start and end lines of its match mappings.
+    """
+    matches = license_detection_mapping["matches"]
+    return FileRegion(
+        path=path,
+        start_line=min(match['start_line'] for match in matches),
+        end_line=max(match['end_line'] for match in matches),
+    )
+
+
 def detections_from_license_detection_mappings(
     license_detection_mappings,
     file_path,
@@ -582,6 +596,78 @@ def detections_from_license_detection_mappings(
     return license_detections
 
 
+class LicenseDetectionStore:
+    """
+    An in-process store of the license detections of a codebase, grouped by
+    detection identifier.
+
+    The license detections of files and packages are stored as mappings on
+    Resources and the same detection is often found in many files. This store
+    keeps a single typed LicenseDetection for each detection identifier, with
+    the FileRegion of each file where this detection was found. A
+    LicenseDetection mapping is rehydrated only the first time its identifier is
+    seen: the identifier is computed from the matched rules, scores and texts,
+    so the other mappings with this identifier differ only by their file and
+    lines. The unique detections are converted back to mappings once for output
+    with UniqueDetection.to_dict().
+    """
+
+    def __init__(self):
+        # mapping of {detection identifier: LicenseDetection}
+        self.detections_by_identifier = {}
+        # mapping of {detection identifier: list of FileRegion}
+        self.file_regions_by_identifier = defaultdict(list)
+
+    def __len__(self):
+        """
+        Return the number of stored detections, including duplicates.
+        """
+        return sum(len(regions) for regions in self.file_regions_by_identifier.values())
+
+    def add(self, detection):
+        """
+        Add a LicenseDetection ``detection`` with a file_region to this store.
+        """
+        identifier = detection.identifier
+        if identifier not in self.detections_by_identifier:
+            self.detections_by_identifier[identifier] = detection
+        self.file_regions_by_identifier[identifier].append(detection.file_region)
+
+    def add_mappings(self, license_detection_mappings, file_path):
+        """
+        Add a list of LicenseDetection ``license_detection_mappings`` found in
+        the file at ``file_path`` to this store.
+        """
+        detections_by_identifier = self.detections_by_identifier
+        file_regions_by_identifier = self.file_regions_by_identifier
+
+        for license_detection_mapping in license_detection_mappings:
+            identifier = license_detection_mapping["identifier"]
+            if identifier in detections_by_identifier:
+                file_region = get_file_region_from_mapping(
+                    license_detection_mapping=license_detection_mapping,
+                    path=file_path,
+                )
+            else:
+                detection = LicenseDetectionFromResult.from_license_detection_mapping(
+                    license_detection_mapping=license_detection_mapping,
+                    file_path=file_path,
+                )
+                detections_by_identifier[identifier] = detection
+                file_region = detection.file_region
+
+            file_regions_by_identifier[identifier].append(file_region)
+
+    def items(self):
+        """
+        Yield tuples of (LicenseDetection, list of FileRegion) for each unique
+        detection of this store.
+        """
+        file_regions_by_identifier = self.file_regions_by_identifier
+        for identifier, detection in self.detections_by_identifier.items():
+            yield detection, file_regions_by_identifier[identifier]
+
+
 def get_new_identifier_from_detections(initial_detection, detections_added, license_expression):
     """
     Return a new UUID based on two sets of detections: `initial_detection` is
@@ -740,8 +826,9 @@ def populate_matches_with_path(matches, path):
 
 def collect_license_detections(codebase, include_license_clues=True):
     """
-    Return a list of LicenseDetectionFromResult object rehydrated from
-    LicenseDetection mappings, from resources and packages in a ``codebase``.
+    Return a LicenseDetectionStore of the LicenseDetectionFromResult objects
+    rehydrated from LicenseDetection mappings, from resources and packages in a
+    ``codebase``.
 
     As a side effect, this also corrects `declared_license_expression` in packages
     according to their license detections. This is required because package fields
@@ -755,11 +842,10 @@ def collect_license_detections(codebase, include_license_clues=True):
     has_packages = hasattr(codebase.root, 'package_data')
     has_licenses = hasattr(codebase.root, 'license_detections')
 
-    all_license_detections = []
+    all_license_detections = LicenseDetectionStore()
 
     for resource in codebase.walk():
 
-        resource_license_detections = []
         if has_licenses:
             license_detections = getattr(resource, 'license_detections', []) or []
             for detection in license_detections:
@@ -769,11 +855,10 @@ def collect_license_detections(codebase, include_license_clues=True):
             codebase.save_resource(resource)
 
             if license_detections:
-                license_detection_objects = detections_from_license_detection_mappings(
+                all_license_detections.add_mappings(
                     license_detection_mappings=license_detections,
                     file_path=resource.path,
                 )
-                resource_license_detections.extend(license_detection_objects)
 
             if include_license_clues and license_clues:
                 license_matches = LicenseMatchFromResult.from_dicts(
@@ -783,15 +868,12 @@ def collect_license_detections(codebase, include_license_clues=True):
                 for group_of_matches in group_matches(license_matches=license_matches):
                     detection = LicenseDetection.from_matches(matches=group_of_matches)
                     detection.file_region = detection.get_file_region(path=resource.path)
-                    resource_license_detections.append(detection)
-
-            all_license_detections.extend(resource_license_detections)
+                    all_license_detections.add(detection)
 
         if TRACE:
             logger_debug(
                 f'license detections collected at path {resource.path}:',
-                f'resource_license_detections: {resource_license_detections}\n',
-                f'all_license_detections: {all_license_detections}',
+                f'all_license_detections: {len(all_license_detections)}',
             )
 
         if has_packages:
@@ -838,11 +920,10 @@ def collect_license_detections(codebase, include_license_clues=True):
                 codebase.save_resource(resource)
 
             if package_license_detection_mappings:
-                package_license_detection_objects = detections_from_license_detection_mappings(
+                all_license_detections.add_mappings(
                     license_detection_mappings=package_license_detection_mappings,
                     file_path=resource.path,
                 )
-                all_license_detections.extend(package_license_detection_objects)
 
     if has_packages and has_licenses:
         for package in getattr(codebase.attributes, 'packages', []):
@@ -915,17 +996,19 @@ class UniqueDetection:
     def get_unique_detections(cls, license_detections):
         """
         Return all unique UniqueDetection from a ``license_detections`` list of
-        LicenseDetection.
+        LicenseDetection or LicenseDetectionStore.
         """
-        detections_by_id = get_detections_by_id(license_detections)
+        if isinstance(license_detections, LicenseDetectionStore):
+            detections_and_file_regions = license_detections.items()
+        else:
+            detections_and_file_regions = (
+                (all_detections[0], [detection.file_region for detection in all_detections])
+                for all_detections in get_detections_by_id(license_detections).values()
+            )
+
         unique_license_detections = []
 
-        for all_detections in detections_by_id.values():
-            file_regions = [
-                detection.file_region
-                for detection in all_detections
-            ]
-            detection = next(iter(all_detections))
+        for detection, file_regions in detections_and_file_regions:
             detection_log = []
             if hasattr(detection, "detection_log"):
                 if detection.detection_log:
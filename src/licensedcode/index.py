@@ -19,6 +19,7 @@ from time import time
 
 from intbitset import intbitset
 
+from licensedcode._vendor import attr
 from licensedcode import SMALL_RULE
 from licensedcode import TINY_RULE
 from licensedcode.legalese import common_license_words
@@ -30,10 +31,12 @@ from licensedcode import match_set
 from licensedcode import match_spdx_lid
 from licensedcode import match_unknown
 from licensedcode.dmp import match_blocks as match_blocks_dmp
+from licensedcode.profiling import NULL_PROFILE
 from licensedcode.seq import match_blocks as match_blocks_seq
 from licensedcode import query
 from licensedcode import tokenize
 from licensedcode.spans import Span
+from textcode.analysis import is_large_file
 
 """
 Main license index construction, query processing and matching entry points for
@@ -134,11 +137,13 @@ class LicenseIndex(object):
         'rules_by_id',
         'rules_by_rid',
         'tids_by_rid',
+        'hispans_by_rid',
 
         'high_postings_by_rid',
 
         'sets_by_rid',
         'msets_by_rid',
+        'rids_by_high_tid',
 
         'rid_by_hash',
         'rules_automaton',
@@ -161,6 +166,7 @@ class LicenseIndex(object):
         _spdx_tokens=frozenset(),
         _license_tokens=frozenset(),
         _all_languages=False,
+        _tokenized_by_identifier=None,
     ):
         """
         Initialize the index with an iterable of Rule objects.
@@ -169,6 +175,8 @@ class LicenseIndex(object):
         ``_license_tokens`` is a set of "license" tokens used as start or end of a rule
         If ``_all_languages`` is True, use all spoken languages license and rules.
         Otherwise, use only English rules and licenses.
+        ``_tokenized_by_identifier`` is an optional mapping of {rule identifier:
+        tokenized rule text} of pre-tokenized rules. See Rule.tokens().
         """
         # total number of unique known tokens
         self.len_tokens = 0
@@ -200,6 +208,11 @@ class LicenseIndex(object):
         # maping-like of rule_id -> sequence of token_ids
         self.tids_by_rid = []
 
+        # maping-like of rule_id -> Span of the positions of the high/legalese
+        # token ids in this rule sequence of token_ids. Used to build the
+        # hispan of exact matches to a whole rule.
+        self.hispans_by_rid = []
+
         # mapping-like of rule id->(mapping of (token_id->[positions, ...])
         # We track only high/good tokens there. This is a "traditional"
         # inverted index postings list
@@ -209,6 +222,11 @@ class LicenseIndex(object):
         self.sets_by_rid = []
         self.msets_by_rid = []
 
+        # mapping-like of high token id -> intbitset of the rule ids that
+        # contain this token. This is an inverted index used to select the
+        # candidate rules sharing high tokens with a query for set matching.
+        self.rids_by_high_tid = []
+
         # mapping of hash -> single rid for hash match: duplicated rules are not allowed
         self.rid_by_hash = {}
 
@@ -246,6 +264,7 @@ class LicenseIndex(object):
                 _legalese=_legalese,
                 _spdx_tokens=_spdx_tokens,
                 _license_tokens=_license_tokens,
+                _tokenized_by_identifier=_tokenized_by_identifier,
             )
 
             if TRACE_TOKEN_DOC_FREQ:
@@ -268,6 +287,7 @@ class LicenseIndex(object):
         _legalese=common_license_words,
         _spdx_tokens=frozenset(),
         _license_tokens=frozenset(),
+        _tokenized_by_identifier=None,
     ):
         """
         Add a list of Rule objects to the index and constructs optimized and
@@ -276,6 +296,8 @@ class LicenseIndex(object):
         ``_legalese`` is a sorted mapping of common license-specific words aka. legalese as {token: id}
         ``_spdx_tokens`` is a set of token strings used in SPDX license identifiers
         ``_license_tokens`` is a set of "license" tokens used as start or end of a rule
+        ``_tokenized_by_identifier`` is an optional mapping of {rule identifier:
+        tokenized rule text} of pre-tokenized rules.
         """
         if self.optimized:
             raise Exception('Index has been optimized and cannot be updated.')
@@ -315,7 +337,9 @@ class LicenseIndex(object):
                 logger_debug('rules_by_rid:', _rid, _rule)
 
         # ensure that rules are sorted
-        rules_by_rid.sort()
+        # OPTIMIZED: compute the sort key of a rule once rather than for each
+        # comparison of the attrs-generated ordering methods
+        rules_by_rid.sort(key=get_rule_sort_key)
         len_rules = len(rules_by_rid)
 
         # create index data structures
@@ -323,6 +347,7 @@ class LicenseIndex(object):
         # index structures
         ########################################################################
         tids_by_rid_append = self.tids_by_rid.append
+        hispans_by_rid_append = self.hispans_by_rid.append
 
         false_positive_rids_add = self.false_positive_rids.add
         regular_rids_add = self.regular_rids.add
@@ -333,6 +358,7 @@ class LicenseIndex(object):
         self.high_postings_by_rid = high_postings_by_rid = [None] * len_rules
         self.sets_by_rid = sets_by_rid = [None] * len_rules
         self.msets_by_rid = msets_by_rid = [None] * len_rules
+        rids_by_high_tid = [[] for _ in range(len_legalese)]
 
         # track all duplicate rules: fail and report dupes at once at the end
         dupe_rules_by_hash = defaultdict(list)
@@ -364,6 +390,7 @@ class LicenseIndex(object):
 
         # OPTIMIZED: bind frequently used objects to local scope
         rid_by_hash = self.rid_by_hash
+        tokenized_by_identifier_get = (_tokenized_by_identifier or {}).get
         match_hash_index_hash = match_hash.index_hash
         match_set_tids_set_counter = match_set.tids_set_counter
         match_set_multiset_counter = match_set.multiset_counter
@@ -392,7 +419,8 @@ class LicenseIndex(object):
             # "weak" rules can only be matched with an automaton exactly.
             is_weak = True
 
-            for rts in rule.tokens():
+            tokenized = tokenized_by_identifier_get(rule.identifier)
+            for rts in rule.tokens(tokenized=tokenized):
                 rule_tokens_append(rts)
                 rtid = dictionary_get(rts)
                 if rtid is None:
@@ -409,6 +437,9 @@ class LicenseIndex(object):
                 except Exception as e:
                     raise Exception(rtid, rts, rule) from e
 
+            hispans_by_rid_append(Span(
+                pos for pos, tid in enumerate(rule_token_ids) if tid < len_legalese))
+
             rule_length = rule.length
             is_tiny = rule_length < TINY_RULE
 
@@ -528,6 +559,9 @@ class LicenseIndex(object):
             ####################################################################
             ####################################################################
 
+            for tid in tids_set_high:
+                rids_by_high_tid[tid].append(rid)
+
             ####################
             # update rule thresholds
             ####################
@@ -552,6 +586,10 @@ class LicenseIndex(object):
         self.digit_only_tids = intbitset([
             i for i, s in enumerate(self.tokens_by_tid) if s.isdigit()])
 
+        # OPTIMIZED: for speed and memory: convert the inverted index to bitsets
+        ########################################################################
+        self.rids_by_high_tid = [intbitset(rids) for rids in rids_by_high_tid]
+
         # Finalize automatons
         ########################################################################
         self.rules_automaton.make_automaton()
@@ -716,10 +754,11 @@ class LicenseIndex(object):
         return matches
 
     def get_approximate_matches(self, query, matched_qspans, existing_matches,
-                                deadline=sys.maxsize, **kwargs):
+                                deadline=sys.maxsize, profile=NULL_PROFILE, **kwargs):
         """
         Approximate matching strategy breaking a query in query_runs and using
         multiple local alignments (aka. diff). Return a list of matches.
+        Collect candidates counts in the ``profile`` MatchProfile.
         """
         matches = []
         matchable_rids = self.approx_matchable_rids
@@ -738,6 +777,7 @@ class LicenseIndex(object):
             high_resemblance=True,
             _use_bigrams=USE_BIGRAM_MULTISETS,
         )
+        profile.count('near dupe candidates', len(near_dupe_candidates))
 
         # if near duplicates, we only match the whole file at once against these
         # candidates
@@ -748,7 +788,8 @@ class LicenseIndex(object):
                     logger_debug(rank, sv1, sv2, can.identifier)
 
             matched = self.get_query_run_approximate_matches(
-                whole_query_run, near_dupe_candidates, already_matched_qspans, deadline)
+                whole_query_run, near_dupe_candidates, already_matched_qspans, deadline,
+                profile=profile)
 
             matches.extend(matched)
 
@@ -772,6 +813,7 @@ class LicenseIndex(object):
             logger_debug('get_approximate_matches: len(query.query_runs):', len(query.query_runs))
 
         MAX_CANDIDATES = 70
+        profile.count('query runs', len(query.query_runs))
         for query_run in query.query_runs:
             # inverted index match and ranking, query run-level
             candidates = match_set.compute_candidates(
@@ -782,6 +824,7 @@ class LicenseIndex(object):
                 high_resemblance=False,
                 _use_bigrams=USE_BIGRAM_MULTISETS,
             )
+            profile.count('candidates', len(candidates))
 
             if TRACE_APPROX_CANDIDATES:
                 logger_debug('get_query_run_approximate_matches: candidates:')
@@ -789,7 +832,7 @@ class LicenseIndex(object):
                     logger_debug(rank, sv1, sv2, can.identifier)
 
             matched = self.get_query_run_approximate_matches(
-                query_run, candidates, matched_qspans, deadline)
+                query_run, candidates, matched_qspans, deadline, profile=profile)
 
             matches.extend(matched)
 
@@ -805,10 +848,12 @@ class LicenseIndex(object):
         candidates,
         matched_qspans,
         deadline=sys.maxsize,
+        profile=NULL_PROFILE,
         **kwargs,
     ):
         """
         Return Return a list of approximate matches for a single query run.
+        Count the match_blocks calls in the ``profile`` MatchProfile.
         """
         matches = []
 
@@ -841,6 +886,8 @@ class LicenseIndex(object):
                     tid: postings for tid, postings in high_postings.items()
                         if tid in high_intersection}
 
+            match_blocks = profile.counted(match_blocks, 'match_blocks calls')
+
             start_offset = 0
             while True:
                 rule_matches = match_seq.match_sequence(
@@ -893,6 +940,7 @@ class LicenseIndex(object):
         approximate=True,
         unknown_licenses=False,
         deadline=sys.maxsize,
+        profile=None,
         _skip_hash_match=False,
         **kwargs,
     ):
@@ -918,6 +966,9 @@ class LicenseIndex(object):
         ``deadline`` is a time.time() value in seconds by which the processing
         should stop and return whatever was matched so far.
 
+        If ``profile`` is a MatchProfile, add the time spent in each matching
+        stage and matching counters to this profile.
+
         ``_skip_hash_match`` is used only for testing.
         """
         assert 0 <= min_score <= 100
@@ -925,13 +976,28 @@ class LicenseIndex(object):
         if not location and not query_string:
             return []
 
-        qry = query.build_query(
-            location=location,
-            query_string=query_string,
-            idx=self,
-            text_line_threshold=15,
-            bin_line_threshold=50,
-        )
+        if location and is_large_file(location):
+            return self.match_windows(
+                location=location,
+                min_score=min_score,
+                as_expression=as_expression,
+                expression_symbols=expression_symbols,
+                approximate=approximate,
+                unknown_licenses=unknown_licenses,
+                deadline=deadline,
+                profile=profile,
+                **kwargs,
+            )
+
+        profile = profile or NULL_PROFILE
+        with profile.stage('query'):
+            qry = query.build_query(
+                location=location,
+                query_string=query_string,
+                idx=self,
+                text_line_threshold=15,
+                bin_line_threshold=50,
+            )
 
         if TRACE:
             logger_debug('Index.match: for:', location, 'query:', qry)
@@ -947,10 +1013,80 @@ class LicenseIndex(object):
             approximate=approximate,
             unknown_licenses=unknown_licenses,
             deadline=deadline,
+            profile=profile,
             _skip_hash_match=_skip_hash_match,
             **kwargs,
         )
 
+    def match_windows(
+        self,
+        location,
+        window_tokens=query.QUERY_WINDOW_TOKENS,
+        overlap_tokens=None,
+        deadline=sys.maxsize,
+        profile=None,
+        **kwargs,
+    ):
+        """
+        Return a sequence of LicenseMatch by matching the very large file at
+        ``location`` against this index in overlapping windows of about
+        ``window_tokens`` tokens such that only one window Query is in memory
+        at a time. See match() for the other arguments.
+
+        The windows overlap by ``overlap_tokens`` tokens, which is the length of
+        the longest rule by default, and a match is kept only from the window
+        that "owns" the line where it starts. The matches positions are relative
+        to the query of their window: the matches of different windows are
+        compared by lines to discard the matches contained in a larger match of
+        another window, such as the partial match of a window to the end of a
+        match with large gaps that starts in the previous window.
+        """
+        profile = profile or NULL_PROFILE
+        if overlap_tokens is None:
+            overlap_tokens = max(rule.length for rule in self.rules_by_rid)
+
+        windows = query.build_query_windows(
+            location=location,
+            idx=self,
+            window_tokens=window_tokens,
+            overlap_tokens=overlap_tokens,
+            text_line_threshold=15,
+            bin_line_threshold=50,
+        )
+
+        matches = []
+        while True:
+            with profile.stage('query'):
+                window = next(windows, None)
+            if not window:
+                break
+
+            start_line, end_line, qry = window
+            if TRACE:
+                logger_debug(
+                    'Index.match_windows: for:', location,
+                    'window:', start_line, end_line, 'query:', qry,
+                )
+
+            window_matches = self.match_query(
+                qry=qry,
+                deadline=deadline,
+                profile=profile,
+                **kwargs,
+            )
+            matches.extend(
+                m for m in window_matches
+                if start_line <= m.start_line
+                and (end_line is None or m.start_line < end_line)
+            )
+
+            if time() > deadline:
+                break
+
+        with profile.stage('final refine'):
+            matches, _discarded = match.filter_contained_window_matches(matches)
+        return matches
+
     def match_query(
         self,
         qry,
@@ -960,6 +1096,7 @@ class LicenseIndex(object):
         approximate=True,
         unknown_licenses=False,
         deadline=sys.maxsize,
+        profile=None,
         _skip_hash_match=False,
         **kwargs,
     ):
@@ -967,13 +1104,16 @@ class LicenseIndex(object):
         Return a sequence of LicenseMatch by matching the ``qry`` Query against
         this index. See Index.match() for arguments documentation.
         """
+        profile = profile or NULL_PROFILE
+        profile.count('queries')
 
         whole_query_run = qry.whole_query_run()
         if not whole_query_run or not whole_query_run.matchables:
             return []
 
         if not _skip_hash_match:
-            matches = match_hash.hash_match(self, whole_query_run)
+            with profile.stage('hash'):
+                matches = match_hash.hash_match(self, whole_query_run)
             if matches:
                 match.set_matched_lines(matches, qry.line_by_pos)
                 return matches
@@ -984,7 +1124,8 @@ class LicenseIndex(object):
         )
 
         if as_expression:
-            matches = get_spdx_id_matches(qry, from_spdx_id_lines=False)
+            with profile.stage('spdx_lid'):
+                matches = get_spdx_id_matches(qry, from_spdx_id_lines=False)
             match.set_matched_lines(matches, qry.line_by_pos)
             return matches
 
@@ -1010,12 +1151,14 @@ class LicenseIndex(object):
                 logger_debug()
                 logger_debug('match_query: matching with matcher:', matcher_name)
 
-            matched = matcher(
-                qry,
-                matched_qspans=already_matched_qspans,
-                existing_matches=matches,
-                deadline=deadline,
-            )
+            with profile.stage(matcher_name):
+                matched = matcher(
+                    qry,
+                    matched_qspans=already_matched_qspans,
+                    existing_matches=matches,
+                    deadline=deadline,
+                    profile=profile,
+                )
 
             if TRACE:
                 self.debug_matches(
@@ -1025,7 +1168,9 @@ class LicenseIndex(object):
                     query_string=qry.query_string,
                 )
 
-            matched = match.merge_matches(matched)
+            with profile.stage(matcher_name):
+                matched = match.merge_matches(matched)
+            profile.count(f'{matcher_name} matches', len(matched))
             matches.extend(matched)
 
             # Subtract whole text matched if this is long enough
@@ -1057,51 +1202,54 @@ class LicenseIndex(object):
                 break
 
         # refining matches without filtering false positives
-        matches, _discarded = match.refine_matches(
-            matches=matches,
-            query=qry,
-            min_score=min_score,
-            filter_false_positive=False,
-            merge=True,
-        )
+        with profile.stage('refine'):
+            matches, _discarded = match.refine_matches(
+                matches=matches,
+                query=qry,
+                min_score=min_score,
+                filter_false_positive=False,
+                merge=True,
+            )
 
         if unknown_licenses:
-            good_matches, weak_matches = match.split_weak_matches(matches)
-            # collect the positions that are "good matches" to exclude from
-            # matching for unknown_licenses. Create a Span to check for unknown
-            # based on this.
-            original_qspan = Span(0, len(qry.tokens) - 1)
-            good_qspans = (m.qspan for m in good_matches)
-            good_qspan = Span().union(*good_qspans)
-
-            unmatched_qspan = original_qspan.difference(good_qspan)
-
-            # for each subspan, run unknown license detection
-            unknown_matches = []
-            for unspan in unmatched_qspan.subspans():
-                unquery_run = query.QueryRun(
-                    query=qry,
-                    start=unspan.start,
-                    end=unspan.end,
-                )
+            with profile.stage('unknown'):
+                good_matches, weak_matches = match.split_weak_matches(matches)
+                # collect the positions that are "good matches" to exclude from
+                # matching for unknown_licenses. Create a Span to check for unknown
+                # based on this.
+                original_qspan = Span(0, len(qry.tokens) - 1)
+                good_qspans = (m.qspan for m in good_matches)
+                good_qspan = Span().union(*good_qspans)
+
+                unmatched_qspan = original_qspan.difference(good_qspan)
+
+                # for each subspan, run unknown license detection
+                unknown_matches = []
+                for unspan in unmatched_qspan.subspans():
+                    unquery_run = query.QueryRun(
+                        query=qry,
+                        start=unspan.start,
+                        end=unspan.end,
+                    )
 
-                unknown_match = match_unknown.match_unknowns(
-                    idx=self,
-                    query_run=unquery_run,
-                    automaton=self.unknown_automaton,
-                )
+                    unknown_match = match_unknown.match_unknowns(
+                        idx=self,
+                        query_run=unquery_run,
+                        automaton=self.unknown_automaton,
+                    )
 
-                if unknown_match:
-                    unknown_matches.append(unknown_match)
+                    if unknown_match:
+                        unknown_matches.append(unknown_match)
 
-            unknown_matches = match.filter_invalid_contained_unknown_matches(
-                unknown_matches=unknown_matches,
-                good_matches=good_matches,
-            )
+                unknown_matches = match.filter_invalid_contained_unknown_matches(
+                    unknown_matches=unknown_matches,
+                    good_matches=good_matches,
+                )
 
-            matches.extend(unknown_matches)
-            # reinject weak matches and let refine matches keep the bests
-            matches.extend(weak_matches)
+                matches.extend(unknown_matches)
+                # reinject weak matches and let refine matches keep the bests
+                matches.extend(weak_matches)
+            profile.count('unknown matches', len(unknown_matches))
 
         if not matches:
             return []
@@ -1114,13 +1262,14 @@ class LicenseIndex(object):
                 query_string=qry.query_string,
                 with_text=True, qry=qry)
 
-        matches, _discarded = match.refine_matches(
-            matches=matches,
-            query=qry,
-            min_score=min_score,
-            filter_false_positive=True,
-            merge=True,
-        )
+        with profile.stage('final refine'):
+            matches, _discarded = match.refine_matches(
+                matches=matches,
+                query=qry,
+                min_score=min_score,
+                filter_false_positive=True,
+                merge=True,
+            )
 
         matches.sort()
 
@@ -1153,9 +1302,11 @@ class LicenseIndex(object):
             'rid_by_hash',
             'rules_by_rid',
             'tids_by_rid',
+            'hispans_by_rid',
 
             'sets_by_rid',
             'msets_by_rid',
+            'rids_by_high_tid',
 
             'regular_rids',
             'approx_matchable_rids',
@@ -1187,6 +1338,22 @@ class LicenseIndex(object):
         return u' '.join('None' if t is None else self.tokens_by_tid[t] for t in tokens)
 
 
+def get_rule_sort_key(rule):
+    """
+    Return a sort key for a ``rule`` Rule. Sorting on this key yields the same
+    order as sorting using the attrs-generated Rule ordering methods.
+    """
+    key = []
+    for field in attr.fields(rule.__class__):
+        if not field.order:
+            continue
+        value = getattr(rule, field.name)
+        if field.order_key:
+            value = field.order_key(value)
+        key.append(value)
+    return tuple(key)
+
+
 def get_weak_rids(len_legalese, tids_by_rid, _idx):
     """
     Return a set of "weak" rule ids made entirely of junk tokens: they can only
@@ -1534,6 +1534,77 @@ def restore_non_overlapping(matches, discarded):
     return to_keep, to_discard
 
 
+def filter_contained_window_matches(
+    matches,
+    trace=TRACE_FILTER_CONTAINED,
+    reason=DiscardReason.CONTAINED,
+):
+    """
+    Return a filtered list of kept LicenseMatch matches and a list of
+    discardable matches given a `matches` list of LicenseMatch matched in the
+    window queries of the same file. See LicenseIndex.match_windows().
+
+    The matches of each window are refined in their window, but the positions
+    of matches from different windows are relative to their own window Query
+    and cannot be compared: these matches are compared by lines instead. Of two
+    matches from different windows, the smaller match is discarded if its lines
+    are contained in the lines of the other match or if both matches are to the
+    same rule and have overlapping lines.
+    """
+    if len(matches) < 2:
+        return matches, []
+
+    # sort on start line, longer lines span, longer match
+    sorter = lambda m: (m.start_line, -m.end_line, -m.len(), -m.hilen())
+    matches = sorted(matches, key=sorter)
+
+    discarded = set()
+    for i, current_match in enumerate(matches):
+        if i in discarded:
+            continue
+
+        for j in range(i + 1, len(matches)):
+            next_match = matches[j]
+            if next_match.start_line > current_match.end_line:
+                break
+
+            if j in discarded or next_match.query is current_match.query:
+                continue
+
+            next_is_contained = next_match.end_line <= current_match.end_line
+            current_is_contained = (
+                next_is_contained
+                and next_match.start_line == current_match.start_line
+            )
+            same_rule = next_match.rule == current_match.rule
+            if not (next_is_contained or same_rule):
+                continue
+
+            next_size = next_match.len(), next_match.hilen()
+            current_size = current_match.len(), current_match.hilen()
+            if next_size <= current_size:
+                if trace:
+                    logger_debug(
+                        '    ---> ###filter_contained_window_matches: '
+                        'removed next contained in current', next_match)
+                discarded.add(j)
+
+            elif current_is_contained or same_rule:
+                if trace:
+                    logger_debug(
+                        '    ---> ###filter_contained_window_matches: '
+                        'removed current contained in next', current_match)
+                discarded.add(i)
+                break
+
+    kept = [m for i, m in enumerate(matches) if i not in discarded]
+    discarded = [m for i, m in enumerate(matches) if i in discarded]
+    for disc in discarded:
+        disc.discard_reason = reason
+
+    return kept, discarded
+
+
 def filter_below_rule_minimum_coverage(
     matches,
     trace=TRACE_FILTER_RULE_MIN_COVERAGE,
@@ -7,9 +7,11 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from bisect import bisect_left
 from itertools import groupby
 
 import ahocorasick
+from intbitset import intbitset
 
 from licensedcode import SMALL_RULE
 from licensedcode.match import LicenseMatch
@@ -110,15 +112,17 @@ def exact_match(
         matched_spans = list(matched_spans)
         logger_debug(' ##exact_AHO: matched_spans', matched_spans)
 
-    len_legalese = idx.len_legalese
     rules_by_rid = idx.rules_by_rid
-    tids_by_rid = idx.tids_by_rid
+    hispans_by_rid = idx.hispans_by_rid
     query = query_run.query
     for rid, qspan, ispan in matched_spans:
-        itokens = tids_by_rid[rid]
-        hispan = Span(p for p in ispan if itokens[p] < len_legalese)
-
         rule = rules_by_rid[rid]
+        # OPTIMIZED: use the precomputed high positions of the whole rule
+        hispan = hispans_by_rid[rid]
+        if ispan.start != 0 or ispan.end != rule.length - 1:
+            # a match to a rule fragment
+            hispan = hispan & ispan
+
         match = LicenseMatch(
             rule=rule,
             qspan=qspan,
@@ -144,18 +148,41 @@ def get_matched_spans(positions, matchables):
     (rid, qstart, qend, istart, iend). Skip position that is not entirely
     within the `matchables` set of matchable positions.
     """
-    for rid, match_qstart, match_qend, istart, iend in positions:
+    if not matchables:
+        return
+
+    # OPTIMIZED: rather than checking each position of a match, we check that
+    # a match is within the first and last matchable positions and that there
+    # is no unmatchable "hole" position between its start and end.
+    first_matchable = matchables[0]
+    last_matchable = matchables[-1]
+    holes = None
 
-        qspan = Span(list(range(match_qstart, match_qend)))
-        # TODO: this should be optimized?
-        # e.g. with not qspan.set.issubset(matchables):
-        if any(p not in matchables for p in qspan):
+    for rid, match_qstart, match_qend, istart, iend in positions:
+        if match_qstart < first_matchable or match_qend - 1 > last_matchable:
             if TRACE: logger_debug(
                 '   #exact_AHO:get_matched_spans not matchable match:',
-                'any(p not in matchables for p in qspan)',
-                'discarding rule:', rid)
+                'outside of matchables', 'discarding rule:', rid)
             continue
-        ispan = Span(list(range(istart, iend)))
+
+        if holes is None:
+            # sorted list of non-matchable positions between the first and
+            # last matchable positions, computed once on the first match
+            holes = intbitset(range(first_matchable, last_matchable + 1))
+            holes.difference_update(matchables)
+            holes = list(holes)
+
+        if holes:
+            next_hole = bisect_left(holes, match_qstart)
+            if next_hole < len(holes) and holes[next_hole] < match_qend:
+                if TRACE: logger_debug(
+                    '   #exact_AHO:get_matched_spans not matchable match:',
+                    'has unmatchable position', holes[next_hole],
+                    'discarding rule:', rid)
+                continue
+
+        qspan = Span(range(match_qstart, match_qend))
+        ispan = Span(range(istart, iend))
         yield rid, qspan, ispan
 
 
@@ -281,8 +308,7 @@ def filter_already_matched_overlapping_matches(matches, query):
 
     matched_pos = query.matched
     for match in matches:
-        # FIXME: do not use internals!!!
-        match_qspan_set = match.qspan._set
+        match_qspan_set = match.qspan.set
         if match_qspan_set & matched_pos:
             # discard any match that has any position already matched
             if TRACE_FRAG: logger_debug('    ==> DISCARDING ALREADY MATCHED:', match)
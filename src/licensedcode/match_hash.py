@@ -67,12 +67,10 @@ def hash_match(idx, query_run, **kwargs):
     rid = idx.rid_by_hash.get(query_hash)
     if rid is not None:
         rule = idx.rules_by_rid[rid]
-        itokens = idx.tids_by_rid[rid]
-        len_legalese = idx.len_legalese
         logger_debug('match_hash: Match:', rule.identifier)
         qspan = Span(range(query_run.start, query_run.end + 1))
         ispan = Span(range(0, rule.length))
-        hispan = Span(p for p in ispan if itokens[p] < len_legalese)
+        hispan = idx.hispans_by_rid[rid]
         match = LicenseMatch(
             rule=rule,
             qspan=qspan,
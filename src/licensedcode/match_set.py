@@ -34,9 +34,11 @@ vector to rank. This is essentially a traditional IR inverted index approach.
 
 But we also want to return every matches and not just probabilistic top-ranked
 matches based on frequencies as is typically done in a search engine. Therefore
-we compute the intersection of the query against every rules. This proves more
-efficient than a traditional inverted intersection in part because the queries
-are much larger (1000's of tokens) than a traditional search engine query.
+we compute the intersection of the query against every rules that could match.
+A rule can only be matched if it shares at least one high (legalese) token with
+the query: we use an inverted index of rule ids by high token id to collect
+these rules such that we do not compute intersections with the many other rules
+that cannot match.
 
 Since we use integers to represent tokens, we reduce the problem to integer set
 or multisets/bags/counters intersections. Furthermore, we have a finite and
@@ -273,10 +275,12 @@ def compute_candidates(query_run, idx, matchable_rids, top=50,
     sortable_candidates_append = sortable_candidates.append
 
     sets_by_rid = idx.sets_by_rid
+    rules_by_rid = idx.rules_by_rid
 
-    for rid, rule in enumerate(idx.rules_by_rid):
+    for rid in get_high_tids_rids(qset, idx):
         if rid not in matchable_rids:
             continue
+        rule = rules_by_rid[rid]
 
         scores_vectors, high_set_intersection = compare_token_sets(
             qset=qset,
@@ -367,6 +371,28 @@ def compute_candidates(query_run, idx, matchable_rids, top=50,
     return candidates[:top]
 
 
+def get_high_tids_rids(qset, idx):
+    """
+    Return an intbitset of the rule ids of rules that contain at least one of
+    the high token ids of a `qset` query token ids intbitset using the `idx`
+    LicenseIndex inverted index of rule ids by high token ids.
+
+    Other rules have no high tokens in common with the query and cannot be
+    matched: compare_token_sets() always filters them out.
+    """
+    rids_by_high_tid = idx.rids_by_high_tid
+    len_legalese = idx.len_legalese
+    # NOTE: intbitset iterate token ids in sorted order and high token ids
+    # are lower than len_legalese
+    high_rids = []
+    for tid in qset:
+        if tid >= len_legalese:
+            break
+        high_rids.append(rids_by_high_tid[tid])
+
+    return intbitset().union(*high_rids)
+
+
 def compare_token_sets(qset, iset,
         intersector, counter, high_intersection_filter,
         len_legalese, unique,
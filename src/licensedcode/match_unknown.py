@@ -9,7 +9,6 @@
 
 import ahocorasick
 
-from licensedcode import tokenize
 from licensedcode.models import UnknownRule
 from licensedcode.match import get_full_qspan_matched_text
 from licensedcode.match import LicenseMatch
@@ -68,13 +67,17 @@ def add_ngrams(
     Add the `tids` sequence of token ids to an unknown ngram automaton.
     """
     if rule_length >= unknown_ngram_length:
-        tids_ngrams = tokenize.ngrams(tids, ngram_length=unknown_ngram_length)
-        toks_ngrams = tokenize.ngrams(tokens, ngram_length=unknown_ngram_length)
-        for tids_ngram, toks_ngram in zip(tids_ngrams, toks_ngrams):
-            if is_good_tokens_ngram(toks_ngram, tids_ngram, len_legalese):
-                # note that we do not store positions as values, only the ngram
-                # since we do not keep the rule origin of an ngram
-                automaton.add_word(tids_ngram)
+        good_starts = get_good_tokens_ngram_starts(
+            tokens=tokens,
+            tids=tids,
+            len_legalese=len_legalese,
+            ngram_length=unknown_ngram_length,
+        )
+        for start in good_starts:
+            tids_ngram = tuple(tids[start:start + unknown_ngram_length])
+            # note that we do not store positions as values, only the ngram
+            # since we do not keep the rule origin of an ngram
+            automaton.add_word(tids_ngram)
 
 
 markers = frozenset([
@@ -129,6 +132,50 @@ def is_good_tokens_ngram(
     return True
 
 
+def get_good_tokens_ngram_starts(
+    tokens,
+    tids,
+    len_legalese,
+    ngram_length=UNKNOWN_NGRAM_LENGTH,
+    markers=markers,
+):
+    """
+    Yield the start positions of the "good" ngrams of ``ngram_length`` in a
+    ``tokens`` sequence of token strings and its corresponding ``tids`` sequence
+    of token ids.
+
+    This is the same as checking each ngram with is_good_tokens_ngram() but
+    faster as each token is checked only once: we keep running counts of the
+    tokens that are digits, single chars, high tokens or "bad" tokens (years
+    and markers) and compare these counts at the start and end of each ngram.
+    """
+    min_good = 3
+
+    digits = [0]
+    singles = [0]
+    highs = [0]
+    bads = [0]
+    for token, tid in zip(tokens, tids):
+        is_digit = token.isdigit()
+        digits.append(digits[-1] + is_digit)
+        singles.append(singles[-1] + (len(token) == 1))
+        highs.append(highs[-1] + (tid < len_legalese))
+        is_bad = (is_digit and len(token) == 4) or token in markers
+        bads.append(bads[-1] + is_bad)
+
+    for start in range(len(tids) - ngram_length + 1):
+        end = start + ngram_length
+        if (
+            digits[end] - digits[start] < min_good
+            and singles[end] - singles[start] < min_good
+            and highs[end] > highs[start]
+            and bads[end] == bads[start]
+            # too little token diversity, e.g. this is a repeat
+            and len(set(tids[start:end])) > 2
+        ):
+            yield start
+
+
 def match_unknowns(
     idx,
     query_run,
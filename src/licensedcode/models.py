@@ -2159,10 +2159,14 @@ class Rule(BasicRule):
 
         return self
 
-    def tokens(self):
+    def tokens(self, tokenized=None):
         """
         Return a sequence of token strings for this rule text.
 
+        If ``tokenized`` is provided, it is a tuple of (tokens,
+        stopwords_by_pos, key_phrase_spans) as returned by tokenize_rule_text()
+        for this rule text and it is used rather than tokenizing the text again.
+
         SIDE EFFECT: Computed attributes such as "length", "relevance",
         "is_continuous",  "minimum_coverage" and "stopword_by_pos" are
         recomputed as a side effect.
@@ -2178,14 +2182,21 @@ class Rule(BasicRule):
         ):
             self.minimum_coverage = 100
 
-        toks, stopwords_by_pos = index_tokenizer_with_stopwords(text)
+        if tokenized:
+            toks, stopwords_by_pos, key_phrase_spans = tokenized
+        else:
+            toks, stopwords_by_pos = index_tokenizer_with_stopwords(text)
+            key_phrase_spans = None
+
         self.length = len(toks)
         self.stopwords_by_pos = stopwords_by_pos
         self.set_relevance()
 
         # set key phrase spans that must be present for the rule
         # to pass through refinement
-        self.key_phrase_spans = self.build_key_phrase_spans()
+        if key_phrase_spans is None:
+            key_phrase_spans = self.build_key_phrase_spans()
+        self.key_phrase_spans = key_phrase_spans
         self._set_continuous()
 
         return toks
@@ -2844,6 +2855,25 @@ def find_rule_base_location(name_prefix, rules_directory=rules_data_dir):
         idx += 1
 
 
+def tokenize_rule_text(text, is_from_license=False, identifier=None):
+    """
+    Return a tuple of (tokens, stopwords_by_pos, key_phrase_spans) for a rule
+    ``text``. This is the part of Rule.tokens() that depends only on the rule
+    text and that can be computed in another process or cached.
+    Raise an InvalidRule exception reporting the rule ``identifier`` if the key
+    phrases of ``text`` are invalid.
+    """
+    toks, stopwords_by_pos = index_tokenizer_with_stopwords(text)
+    if is_from_license:
+        key_phrase_spans = []
+    else:
+        try:
+            key_phrase_spans = list(get_key_phrase_spans(text))
+        except Exception as e:
+            raise InvalidRule(f'Invalid rule: {identifier}: {text[:200]!r}') from e
+    return toks, stopwords_by_pos, key_phrase_spans
+
+
 def get_key_phrase_spans(text):
     """
     Yield Spans of key phrase token positions found in the rule ``text``.
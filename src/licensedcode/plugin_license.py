@@ -7,11 +7,13 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import json
 import logging
 import os
 from functools import partial
 
 import attr
+import click
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import SCAN_GROUP
 from commoncode.cliutils import SCAN_OPTIONS_GROUP
@@ -32,6 +34,7 @@ from licensedcode.detection import LicenseDetectionFromResult
 from licensedcode.detection import sort_unique_detections
 from licensedcode.detection import UniqueDetection
 from licensedcode.detection import use_referenced_license_expression
+from licensedcode.profiling import MatchProfile
 from packagedcode.utils import combine_expressions
 from scancode.api import SCANCODE_LICENSEDB_URL
 
@@ -85,6 +88,8 @@ class LicenseScanner(ScanPlugin):
     run_order = 4
     sort_order = 4
 
+    content_addressable = True
+
     options = [
         PluggableCommandLineOption(('-l', '--license'),
             is_flag=True,
@@ -138,7 +143,18 @@ class LicenseScanner(ScanPlugin):
             required_options=['license'],
             help='[EXPERIMENTAL] Detect unknown licenses. ',
             help_group=SCAN_OPTIONS_GROUP,
-        )
+        ),
+
+        PluggableCommandLineOption(
+            ('--license-profile',),
+            type=click.Path(exists=False, file_okay=True, dir_okay=False, writable=True),
+            metavar='FILE',
+            required_options=['license'],
+            help='Write to FILE a JSON profile of license detection with the '
+                 'time spent in each matching stage and matching counters for '
+                 'each file and for the whole codebase.',
+            help_group=SCAN_OPTIONS_GROUP,
+        ),
     ]
 
     def is_enabled(self, license, **kwargs):  # NOQA
@@ -160,6 +176,7 @@ class LicenseScanner(ScanPlugin):
         license_diagnostics=False,
         license_url_template=SCANCODE_LICENSEDB_URL,
         unknown_licenses=False,
+        license_profile=None,
         **kwargs
     ):
 
@@ -171,17 +188,31 @@ class LicenseScanner(ScanPlugin):
             license_diagnostics=license_diagnostics,
             license_url_template=license_url_template,
             unknown_licenses=unknown_licenses,
+            license_profile=bool(license_profile),
         )
 
-    def process_codebase(self, codebase, license_text=False, license_diagnostics=False, license_text_diagnostics=False, **kwargs):
+    def process_codebase(
+        self,
+        codebase,
+        license_text=False,
+        license_diagnostics=False,
+        license_text_diagnostics=False,
+        license_profile=None,
+        **kwargs,
+    ):
         """
         Post-process ``codebase`` to follow referenced filenames to license
         matches in other files.
         Also add top-level unique ``license_detections``.
+        Write a license detection profile to the ``license_profile`` file if
+        provided.
         """
         from licensedcode import cache
         cche = cache.get_cache()
 
+        if license_profile:
+            write_license_profile(codebase=codebase, location=license_profile)
+
         cle = codebase.get_or_create_current_header()
 
         if cche.additional_license_directory:
@@ -248,6 +279,33 @@ class LicenseScanner(ScanPlugin):
         )
 
 
+def write_license_profile(codebase, location):
+    """
+    Write a JSON license detection profile to the file at ``location``.
+    The per-file profiles collected by get_licenses() in the "license_profile"
+    extra_data of each ``codebase`` file Resource are removed from these
+    Resources and written with their total for the whole codebase. Files are
+    sorted by decreasing total matching time.
+    """
+    total = MatchProfile()
+    files = []
+    for resource in codebase.walk():
+        if not resource.is_file:
+            continue
+        file_profile = resource.extra_data.pop('license_profile', None)
+        if not file_profile:
+            continue
+        codebase.save_resource(resource)
+        file_profile = MatchProfile.from_dict(file_profile)
+        total.update(file_profile)
+        files.append(dict(path=resource.path, **file_profile.to_dict()))
+
+    files.sort(key=lambda f: sum(f['timings'].values()), reverse=True)
+    profile = dict(codebase=total.to_dict(), files=files)
+    with open(location, 'w') as out:
+        json.dump(profile, out, indent=2)
+
+
 def add_referenced_filenames_license_matches_for_detections(resource, codebase):
     """
     Return an updated ``resource`` saving it in place, after adding new license
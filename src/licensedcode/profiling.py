@@ -0,0 +1,115 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+from collections import Counter
+from contextlib import contextmanager
+from contextlib import nullcontext
+from time import time
+
+"""
+Profile license detection: collect the time spent in each license matching
+stage and counters such as the number of approximate matching candidates and
+the number of match_blocks calls.
+"""
+
+
+class MatchProfile:
+    """
+    Collect the durations of the license matching stages in ``timings`` as a
+    mapping of {stage name: seconds} and ``counts`` as a mapping of {counter
+    name: count}. A MatchProfile can be passed as a ``profile`` argument to
+    LicenseIndex.match() and accumulates data across multiple calls.
+
+    For example:
+    >>> profile = MatchProfile()
+    >>> with profile.stage('query'):
+    ...     profile.count('query runs', 2)
+    >>> profile.counts['query runs']
+    2
+    >>> 'query' in profile.timings
+    True
+    """
+
+    def __init__(self, timings=None, counts=None):
+        self.timings = dict(timings or {})
+        self.counts = Counter(counts or {})
+
+    def __bool__(self):
+        return True
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Return a context manager that adds the time spent in its block to the
+        ``name`` stage duration.
+        """
+        start = time()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time() - start
+
+    def count(self, name, value=1):
+        """
+        Add ``value`` to the ``name`` counter.
+        """
+        self.counts[name] += value
+
+    def counted(self, func, name):
+        """
+        Return a wrapper of the ``func`` callable that increments the ``name``
+        counter on each call.
+        """
+        counts = self.counts
+
+        def counting_func(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+
+        return counting_func
+
+    def update(self, other):
+        """
+        Add the timings and counts of an ``other`` MatchProfile to this profile.
+        """
+        for name, duration in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0) + duration
+        self.counts.update(other.counts)
+
+    def to_dict(self):
+        return dict(
+            timings={name: round(duration, 6) for name, duration in self.timings.items()},
+            counts=dict(self.counts),
+        )
+
+    @classmethod
+    def from_dict(cls, mapping):
+        return cls(timings=mapping.get('timings'), counts=mapping.get('counts'))
+
+
+class NullMatchProfile(MatchProfile):
+    """
+    A MatchProfile that does not collect anything, used when profiling is not
+    enabled.
+    """
+
+    def __bool__(self):
+        return False
+
+    def stage(self, name):
+        return nullcontext()
+
+    def count(self, name, value=1):
+        pass
+
+    def counted(self, func, name):
+        return func
+
+
+NULL_PROFILE = NullMatchProfile()
@@ -23,6 +23,7 @@ from commoncode.text import toascii
 from licensedcode.spans import Span
 from licensedcode.tokenize import query_lines
 from licensedcode.tokenize import query_tokenizer
+from textcode.analysis import numbered_text_lines
 
 """
 Build license queries from scanned files to feed the detection pipeline.
@@ -107,6 +108,10 @@ MAX_TOKEN_PER_LINE = 25
 # or non-legalese/junk lines
 LINES_THRESHOLD = 4
 
+# Very large files are matched in windows of about `QUERY_WINDOW_TOKENS` tokens
+# rather than as a single query. See build_query_windows().
+QUERY_WINDOW_TOKENS = 500_000
+
 
 def build_query(
     location=None,
@@ -152,6 +157,147 @@ def build_query(
     return qry
 
 
+def build_query_windows(
+    location,
+    idx,
+    window_tokens=QUERY_WINDOW_TOKENS,
+    overlap_tokens=0,
+    text_line_threshold=15,
+    bin_line_threshold=50,
+):
+    """
+    Yield tuples of (start line, end line, Query) for overlapping windows of
+    the text of the file at ``location`` given an ``idx`` LicenseIndex. This is
+    used to match very large files with a bounded memory usage.
+
+    Each window contains about ``window_tokens`` tokens and is extended before
+    and after by lines with at least ``overlap_tokens`` tokens. The start and
+    end line numbers are the range of lines that a window "owns", where the end
+    line is excluded and is None for the last window. A match that starts in
+    this range and is not longer than ``overlap_tokens`` is fully contained in
+    the window Query.
+    """
+    T = typecode.get_type(location)
+    if not T.contains_text:
+        return
+
+    if T.is_binary:
+        line_threshold = bin_line_threshold
+    else:
+        line_threshold = text_line_threshold
+
+    numbered_lines = numbered_text_lines(location, demarkup=False)
+    windows = get_numbered_lines_windows(
+        numbered_lines=numbered_lines,
+        window_tokens=window_tokens,
+        overlap_tokens=overlap_tokens,
+    )
+    for start_line, end_line, window in windows:
+        qry = Query(
+            query_string=get_window_text(window),
+            idx=idx,
+            line_threshold=line_threshold,
+            start_line=window[0][0],
+            has_long_lines=T.is_text_with_long_lines,
+            is_binary=T.is_binary,
+        )
+        yield start_line, end_line, qry
+
+
+def get_numbered_lines_windows(numbered_lines, window_tokens, overlap_tokens):
+    """
+    Yield tuples of (start line, end line, window) where a window is a list of
+    (line number, line) tuples from a ``numbered_lines`` iterable of (line
+    number, line) tuples. See build_query_windows() for details.
+
+    Windows are only split between two lines with different line numbers. For
+    example:
+
+    >>> lines = [(1, 'a b'), (2, 'c d'), (2, 'e f'), (3, 'g h'), (4, 'i j')]
+    >>> for start, end, window in get_numbered_lines_windows(lines, 4, 2):
+    ...     print(start, end, [ln for ln, _ in window])
+    1 3 [1, 2, 2, 3]
+    3 None [2, 2, 3, 4]
+    """
+    # list of (line number, line, number of tokens) for the current window
+    window = []
+    # index in the window of the first line "owned" by the window
+    start = 0
+    # index in the window of the first line after the lines owned by the
+    # window or None if not yet known
+    end = None
+    owned_tokens = 0
+    trailing_tokens = 0
+
+    for line_number, line in numbered_lines:
+        line_tokens = len(list(query_tokenizer(line)))
+        is_line_start = not window or window[-1][0] != line_number
+        window.append((line_number, line, line_tokens))
+
+        if is_line_start:
+            if end is None and owned_tokens >= window_tokens:
+                end = len(window) - 1
+
+            if end is not None and trailing_tokens >= overlap_tokens:
+                # the current line is not part of this window
+                yield (
+                    window[start][0],
+                    window[end][0],
+                    [(ln, l) for ln, l, _ in window[:-1]],
+                )
+
+                # keep enough lines before the next window start
+                new_start = end
+                leading_tokens = 0
+                while new_start > 0 and (
+                    leading_tokens < overlap_tokens
+                    or window[new_start - 1][0] == window[new_start][0]
+                ):
+                    new_start -= 1
+                    leading_tokens += window[new_start][2]
+
+                window = window[new_start:]
+                start = end - new_start
+                end = None
+                owned_tokens = trailing_tokens
+                trailing_tokens = 0
+
+        if end is None:
+            owned_tokens += line_tokens
+        else:
+            trailing_tokens += line_tokens
+
+    if window:
+        yield window[start][0], None, [(ln, l) for ln, l, _ in window]
+
+
+# characters that str.splitlines() treats as line breaks
+split_on_line_breaks = re.compile(r'[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]+').split
+
+
+def get_window_text(window):
+    """
+    Return a text string from a ``window`` list of (line number, line) tuples
+    such that each line number is a single line of this text: line breaks
+    inside a line are replaced by spaces and multiple consecutive tuples with
+    the same line number are joined in one line.
+
+    For example:
+    >>> get_window_text([(1, 'a\\r\\n'), (2, 'b\\x0cc'), (2, ' d'), (3, 'e')])
+    'a\\nb c d\\ne\\n'
+    """
+    texts = []
+    texts_append = texts.append
+    previous_line_number = None
+    for line_number, line in window:
+        if previous_line_number is not None and line_number != previous_line_number:
+            texts_append('\n')
+        texts_append(' '.join(l for l in split_on_line_breaks(line) if l))
+        previous_line_number = line_number
+    texts_append('\n')
+    return ''.join(texts)
+
+
 class Query(object):
     """
     A query represent a whole file or string being scanned for licenses. It
@@ -200,6 +346,8 @@ class Query(object):
         idx=None,
         line_threshold=LINES_THRESHOLD,
         start_line=1,
+        has_long_lines=False,
+        is_binary=False,
         _test_mode=False,
     ):
         """
@@ -208,6 +356,10 @@ class Query(object):
         Break query in runs when there are at least `line_threshold` empty lines
         or junk-only lines.
         Line numbers start at ``start_line`` which is 1-based by default.
+
+        The ``has_long_lines`` and ``is_binary`` flags are detected from the
+        file type for a `location` and can be set for a `query_string` built
+        from the text of such a file.
         """
         assert (location or query_string) and idx
 
@@ -219,10 +371,10 @@ class Query(object):
         self.start_line = start_line
 
         # True if the text is made of very long lines
-        self.has_long_lines = False
+        self.has_long_lines = has_long_lines
 
         # True if the query is binary
-        self.is_binary = False
+        self.is_binary = is_binary
 
         # known token ids array
         self.tokens = []
@@ -591,10 +743,12 @@ class Query(object):
             ft = typecode.get_type(self.location)
             if ft.is_text_with_long_lines:
                 self.has_long_lines = True
-                tokens_by_line = break_long_lines(tokens_by_line)
             if ft.is_binary:
                 self.is_binary = True
 
+        if self.has_long_lines:
+            tokens_by_line = break_long_lines(tokens_by_line)
+
         for tokens in tokens_by_line:
             # have we reached a run break point?
             if len(query_run) > 0 and empty_lines >= line_threshold:
@@ -816,7 +970,7 @@ class QueryRun(object):
         if not qspans:
             return matchables
 
-        matched = intbitset.union(*[q._set for q in qspans])
+        matched = intbitset.union(*[q.set for q in qspans])
         matchables = intbitset(matchables)
         matchables.difference_update(matched)
         return matchables
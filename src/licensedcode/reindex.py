@@ -46,27 +46,45 @@ from licensedcode.models import load_dump_licenses
     conflicting_options=['only_builtin'],
     cls=PluggableCommandLineOption,
 )
+@click.option(
+    '-n', '--processes',
+    type=int,
+    default=1,
+    metavar='INT',
+    help='Set the number of parallel processes to use to tokenize the license '
+         'rules that are not yet cached. [default: 1]',
+    cls=PluggableCommandLineOption,
+)
 @click.help_option('-h', '--help')
 def reindex_licenses(
     only_builtin,
     all_languages,
     additional_directory,
     load_dump,
+    processes,
     *args,
     **kwargs,
 ):
     """Reindex scancode licenses and exit"""
 
-    from licensedcode.cache import get_index
+    from licensedcode.cache import get_cache
     click.echo('Rebuilding the license index...')
     if load_dump:
         load_dump_licenses()
-    get_index(
+    license_cache = get_cache(
         only_builtin=only_builtin,
         force=True,
         index_all_languages=bool(all_languages),
-        additional_directory=additional_directory
+        additional_directory=additional_directory,
+        processes=processes,
     )
+    for phase, duration in license_cache.timings.items():
+        click.echo(f'  {phase}: {duration:.2f}s')
+
+    click.echo('Precomputing common package license statements...')
+    from licensedcode.cache import dump_license_statements_table
+    from packagedcode.licensing import build_license_statements_table
+    dump_license_statements_table(build_license_statements_table())
     click.echo('Done.')
 
 
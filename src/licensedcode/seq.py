@@ -104,6 +104,93 @@ def extend_match(besti, bestj, bestsize, a, b, alo, ahi, blo, bhi, matchables):
     return Match(besti, bestj, bestsize)
 
 
+def get_matching_runs(a, b, alo, ahi, b2j, len_good, matchables):
+    """
+    Return a list of all the maximal junk-free matching runs of a and b in
+    a[alo:ahi] and b as (-size, i, j) tuples sorted by decreasing size, then
+    increasing start "i" in a, then increasing start "j" in b.
+
+    Each run is a diagonal of consecutive high, matchable tokens of a that are
+    at consecutive positions in b. Any junk-free match that find_longest_match
+    would find in a sub-range is one of these runs clipped to this sub-range.
+    """
+    runs = []
+    runs_append = runs.append
+    b2j_get = b2j.get
+    bhi = len(b)
+
+    # mappings of {diagonal (i - j): run start or end in a} for the last run
+    # seen on each diagonal, where the end is exclusive
+    starts_by_diagonal = {}
+    ends_by_diagonal = {}
+    ends_by_diagonal_get = ends_by_diagonal.get
+    nothing = []
+    for i in range(alo, ahi):
+        cura = a[i]
+        if cura >= len_good or i not in matchables:
+            continue
+        for j in b2j_get(cura, nothing):
+            if j >= bhi:
+                break
+            diagonal = i - j
+            end = ends_by_diagonal_get(diagonal)
+            if end != i:
+                if end is not None:
+                    start = starts_by_diagonal[diagonal]
+                    runs_append((start - end, start, start - diagonal))
+                starts_by_diagonal[diagonal] = i
+            ends_by_diagonal[diagonal] = i + 1
+
+    for diagonal, start in starts_by_diagonal.items():
+        runs_append((start - ends_by_diagonal[diagonal], start, start - diagonal))
+
+    runs.sort()
+    return runs
+
+
+def find_longest_run(runs, alo, ahi, blo, bhi):
+    """
+    Return the longest junk-free matching block of a and b in a[alo:ahi] and
+    b[blo:bhi] as a (i, j, k) tuple given a list of matching `runs` as returned
+    by get_matching_runs. Return (alo, blo, 0) if no blocks match.
+
+    This returns the same block as find_longest_match does before extending it:
+    of all maximal matching blocks, the one that starts earliest in a, and of
+    these the one that starts earliest in b.
+    """
+    besti, bestj, bestsize = alo, blo, 0
+    for negsize, runi, runj in runs:
+        runsize = -negsize
+        if runsize < bestsize:
+            # runs are sorted by decreasing size and a run clipped to the range
+            # cannot be longer than itself: nothing better is left.
+            break
+
+        # clip the run to the range
+        offset = alo - runi
+        if blo - runj > offset:
+            offset = blo - runj
+        if offset < 0:
+            offset = 0
+        cut = runi + runsize - ahi
+        if runj + runsize - bhi > cut:
+            cut = runj + runsize - bhi
+        if cut < 0:
+            cut = 0
+        size = runsize - offset - cut
+        if size <= 0:
+            continue
+
+        starti = runi + offset
+        startj = runj + offset
+        if size > bestsize or (
+            size == bestsize and (starti, startj) < (besti, bestj)
+        ):
+            besti, bestj, bestsize = starti, startj, size
+
+    return besti, bestj, bestsize
+
+
 def match_blocks(a, b, a_start, a_end, b2j, len_good, matchables=frozenset(), *args, **kwargs):
     """
     Return a list of matching block Match triples describing matching
@@ -123,21 +210,54 @@ def match_blocks(a, b, a_start, a_end, b2j, len_good, matchables=frozenset(), *a
     The triples are monotonically increasing in i and in j.  It is also
     guaranteed that adjacent triples never describe adjacent equal blocks.
     Instead adjacent blocks are merged and collapsed in a single block.
+
+    This returns the same blocks as match_blocks_reference but computes the
+    matching runs of high tokens only once, rather than once for each longest
+    match lookup in a sub-range.
+    """
+    runs = get_matching_runs(a, b, a_start, a_end, b2j, len_good, matchables)
+    if not runs:
+        return []
+
+    def longest_match(alo, ahi, blo, bhi):
+        besti, bestj, bestsize = find_longest_run(runs, alo, ahi, blo, bhi)
+        return extend_match(besti, bestj, bestsize, a, b, alo, ahi, blo, bhi, matchables)
+
+    return get_matching_blocks(longest_match, a_start, a_end, len(b))
+
+
+def match_blocks_reference(a, b, a_start, a_end, b2j, len_good, matchables=frozenset(), *args, **kwargs):
+    """
+    Return a list of matching block Match triples like match_blocks does, using
+    find_longest_match for each longest match lookup. This is the reference,
+    slower implementation.
+    """
+
+    def longest_match(alo, ahi, blo, bhi):
+        return find_longest_match(a, b, alo, ahi, blo, bhi, b2j, len_good, matchables)
+
+    return get_matching_blocks(longest_match, a_start, a_end, len(b))
+
+
+def get_matching_blocks(longest_match, a_start, a_end, b_len):
+    """
+    Return a list of non-adjacent matching block Match triples using the
+    `longest_match` callable to find the longest match in a sub-range such as
+    longest_match(alo, ahi, blo, bhi) -> Match.
     """
 
     # This non-recursive algorithm is using a list as a queue of blocks. We
     # still need to look at and append partial results to matching_blocks in a
     # loop. The matches are sorted at the end.
 
-    queue = [(a_start, a_end, 0, len(b))]
+    queue = [(a_start, a_end, 0, b_len)]
     queue_append = queue.append
     queue_pop = queue.pop
     matching_blocks = []
     matching_blocks_append = matching_blocks.append
     while queue:
         alo, ahi, blo, bhi = queue_pop()
-        i, j, k = x = find_longest_match(
-            a, b, alo, ahi, blo, bhi, b2j, len_good, matchables)
+        i, j, k = x = longest_match(alo, ahi, blo, bhi)
         # a[alo:i] vs b[blo:j] unknown
         # a[i:i+k] same as b[j:j+k]
         # a[i+k:ahi] vs b[j+k:bhi] unknown
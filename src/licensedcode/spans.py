@@ -45,8 +45,15 @@ class Span(Set):
     A Span is hashable and not meant to be modified once created, like a frozenset.
     It is equivalent to a sparse closed interval.
     Originally derived and heavily modified from Whoosh Span.
+
+    Most spans are contiguous. These are stored as a start and end closed
+    interval and their set algebra is computed on these bounds. The intbitset
+    of their items is only built on demand when combined with a non-contiguous
+    span. Other spans are stored as an intbitset.
     """
 
+    __slots__ = ('_start', '_end', '_bitset',)
+
     def __init__(self, *args):
         """
         Create a new Span from a start and end ints or an iterable of ints.
@@ -95,50 +102,159 @@ class Span(Set):
         True
         >>> hash(Span([5, 6, 7, 8, 9, 10 ,11, 12])) == hash(Span(5, 12))
         True
+        >>> Span(range(5, 13)) == Span(5, 12)
+        True
         """
+        # the start and end of a contiguous span or None
+        self._start = None
+        self._end = None
+        # the intbitset of the items of this span: None for a contiguous span
+        # until computed
+        self._bitset = None
+
         len_args = len(args)
 
         if len_args == 0:
-            self._set = intbitset()
+            self._bitset = intbitset()
 
         elif len_args == 1:
             # args0 is a single int or an iterable of ints
-            if isinstance(args[0], int):
-                self._set = intbitset(args)
+            items = args[0]
+            if isinstance(items, int):
+                self._set_bounds(items, items)
+
+            elif isinstance(items, range) and items.step == 1:
+                self._set_bounds(items.start, items.stop - 1)
+
+            elif isinstance(items, Span):
+                self._start = items._start
+                self._end = items._end
+                self._bitset = items._bitset
+
             else:
                 # some sequence or iterable
-                self._set = intbitset(list(args[0]))
+                self._set_bitset(intbitset(list(items)))
 
         elif len_args == 2:
             # args0 and args1 describe a start and end closed range
-            self._set = intbitset(range(args[0], args[1] + 1))
+            self._set_bounds(args[0], args[1])
 
         else:
             # args0 is a single int or args is an iterable of ints
             # args is an iterable of ints
-            self._set = intbitset(list(args))
+            self._set_bitset(intbitset(list(args)))
+
+    def _set_bounds(self, start, end):
+        """
+        Set this span items to the ``start`` and ``end`` closed interval.
+        """
+        if start > end:
+            self._bitset = intbitset()
+        elif start < 0:
+            # intbitset raises an exception for negative ints
+            self._bitset = intbitset(range(start, end + 1))
+        else:
+            self._start = start
+            self._end = end
+
+    def _set_bitset(self, bitset):
+        """
+        Set this span items to the ``bitset`` intbitset, also tracking its
+        bounds if its items are contiguous.
+        """
+        self._bitset = bitset
+        if bitset:
+            start = bitset[0]
+            end = bitset[-1]
+            if len(bitset) == end - start + 1:
+                self._start = start
+                self._end = end
+
+    @classmethod
+    def _from_bitset(cls, bitset):
+        span = cls()
+        span._set_bitset(bitset)
+        return span
 
     @classmethod
     def _from_iterable(cls, it):
         return cls(list(it))
 
+    def __getstate__(self):
+        return self._start, self._end, self._bitset
+
+    def __setstate__(self, state):
+        self._start, self._end, self._bitset = state
+
+    @property
+    def is_contiguous(self):
+        """
+        Return True if this span is not empty and all its items are contiguous.
+
+        For example:
+        >>> Span(4, 8).is_contiguous
+        True
+        >>> Span([4, 8]).is_contiguous
+        False
+        >>> (Span(4, 6) | Span([7, 8])).is_contiguous
+        True
+        >>> Span().is_contiguous
+        False
+        """
+        return self._start is not None
+
     def __len__(self):
-        return len(self._set)
+        if self._start is not None:
+            return self._end - self._start + 1
+        return len(self._bitset)
 
     def __iter__(self):
-        return iter(self._set)
+        if self._start is not None:
+            return iter(range(self._start, self._end + 1))
+        return iter(self._bitset)
 
     def __hash__(self):
-        return hash(tuple(self._set))
+        return hash(tuple(self))
 
     def __eq__(self, other):
-        return isinstance(other, Span) and self._set == other._set
+        if not isinstance(other, Span):
+            return False
+        if self._start is not None or other._start is not None:
+            # contiguous spans are only equal to contiguous spans
+            return self._start == other._start and self._end == other._end
+        return self._bitset == other._bitset
 
     def __and__(self, *others):
-        return Span(self._set.intersection(*[o._set for o in others]))
+        start = self._start
+        end = self._end
+        if start is not None and all(o._start is not None for o in others):
+            for other in others:
+                start = max(start, other._start)
+                end = min(end, other._end)
+            return Span(start, end)
+        return Span._from_bitset(self.set.intersection(*[o.set for o in others]))
 
     def __or__(self, *others):
-        return Span(self._set.union(*[o._set for o in others]))
+        spans = [self]
+        spans.extend(others)
+        if all(s._start is not None for s in spans):
+            spans.sort(key=lambda s: s._start)
+            start = spans[0]._start
+            end = spans[0]._end
+            for span in spans[1:]:
+                if span._start > end + 1:
+                    # there is a gap: this is not a contiguous union
+                    break
+                end = max(end, span._end)
+            else:
+                return Span(start, end)
+        # empty spans are not contiguous and do not add anything to a union
+        bitsets = [s.set for s in spans if s]
+        if not bitsets:
+            return Span()
+        if len(bitsets) == 1:
+            return Span._from_bitset(intbitset(bitsets[0]))
+        return Span._from_bitset(bitsets[0].union(*bitsets[1:]))
 
     def union(self, *others):
         """
@@ -152,7 +268,7 @@ class Span(Set):
         Return the difference of two or more spans as a new span.
         (i.e. all positions that are in this span but not the others.)
         """
-        return Span(self._set.difference(*[o._set for o in others]))
+        return Span._from_bitset(self.set.difference(*[o.set for o in others]))
 
     def __repr__(self):
         """
@@ -198,38 +314,55 @@ class Span(Set):
         False
         """
         if isinstance(other, Span):
-            return self._set.issuperset(other._set)
+            return self.issuperset(other)
 
         if isinstance(other, int):
-            return self._set.__contains__(other)
+            if self._start is not None:
+                return self._start <= other <= self._end
+            return self._bitset.__contains__(other)
 
         if isinstance(other, (set, frozenset)):
-            return self._set.issuperset(intbitset(other))
+            return self.set.issuperset(intbitset(other))
 
         if isinstance(other, intbitset):
-            return self._set.issuperset(other)
+            return self.set.issuperset(other)
 
     @property
     def set(self):
-        return self._set
+        """
+        Return the intbitset of the items of this span.
+        """
+        bitset = self._bitset
+        if bitset is None:
+            bitset = self._bitset = intbitset(range(self._start, self._end + 1))
+        return bitset
 
     def issubset(self, other):
-        return self._set.issubset(other._set)
+        return other.issuperset(self)
 
     def issuperset(self, other):
-        return self._set.issuperset(other._set)
+        if other._start is None and not other._bitset:
+            # an empty span is a subset of any span
+            return True
+        if self._start is not None:
+            return self._start <= other.start and other.end <= self._end
+        return self.set.issuperset(other.set)
 
     @property
     def start(self):
-        if not self._set:
+        if self._start is not None:
+            return self._start
+        if not self._bitset:
             raise TypeError('Empty Span has no start.')
-        return self._set[0]
+        return self._bitset[0]
 
     @property
     def end(self):
-        if not self._set:
+        if self._end is not None:
+            return self._end
+        if not self._bitset:
             raise TypeError('Empty Span has no end.')
-        return self._set[-1]
+        return self._bitset[-1]
 
     @classmethod
     def sort(cls, spans):
@@ -284,7 +417,9 @@ class Span(Set):
         >>> Span([0]).magnitude()
         1
         """
-        if not self._set:
+        if self._start is not None:
+            return self._end - self._start + 1
+        if not self._bitset:
             return 0
         return self.end - self.start + 1
 
@@ -305,7 +440,7 @@ class Span(Set):
         >>> Span().density()
         0
         """
-        if not self._set:
+        if not self:
             return 0
         return len(self) / self.magnitude()
 
@@ -326,19 +461,24 @@ class Span(Set):
         1
         >>> Span([4, 5]).overlap(Span([6, 7]))
         0
+        >>> Span([4, 6]).overlap(Span(4, 7))
+        2
         """
-        return len(self & other)
+        if self._start is not None and other._start is not None:
+            return max(0, min(self._end, other._end) - max(self._start, other._start) + 1)
+        return len(self.set & other.set)
 
     def resemblance(self, other):
         """
         Return a resemblance coefficient as a float between 0 and 1.
         0 means the spans are completely different and 1 identical.
         """
-        if self._set.isdisjoint(other._set):
+        overlap = self.overlap(other)
+        if not overlap:
             return 0
-        if self._set == other._set:
+        if self == other:
             return 1
-        resemblance = self.overlap(other) / len(self | other)
+        resemblance = overlap / (len(self) + len(other) - overlap)
         return resemblance
 
     def containment(self, other):
@@ -348,11 +488,12 @@ class Span(Set):
             - 1 means the other span is entirely contained in this span.
             - 0 means that the other span is not contained at all this span.
         """
-        if self._set.isdisjoint(other._set):
+        overlap = self.overlap(other)
+        if not overlap:
             return 0
-        if self._set == other._set:
+        if self == other:
             return 1
-        containment = self.overlap(other) / len(other)
+        containment = overlap / len(other)
         return containment
 
     def surround(self, other):
@@ -471,4 +612,6 @@ class Span(Set):
         >>> span.subspans()
         [Span(12), Span(15, 17), Span(24), Span(35), Span(58), Span(63, 64)]
         """
+        if self._start is not None:
+            return [self]
         return Span.from_ints(self)
@@ -27,6 +27,7 @@ from packagedcode.licensing import get_declared_license_expression_spdx
 from packagedcode.licensing import get_license_detections_and_expression
 from packagedcode.utils import combine_expressions
 from packagedcode.utils import get_ancestor
+from packagedcode.utils import get_rootfs_path_index
 from textcode.analysis import as_unicode
 
 
@@ -96,12 +97,11 @@ class AlpineInstalledDatabaseHandler(models.DatafileHandler):
             for ref in package.file_references
         }
 
-        resources = []
-        for res in root_resource.walk(codebase):
-            ref = file_references_by_path.get(res.path)
-            if not ref:
-                continue
+        # the paths of the rootfs are indexed once for all the packages
+        path_index = get_rootfs_path_index(root_resource=root_resource, codebase=codebase)
 
+        resources = []
+        for res in path_index.get_resources(file_references_by_path, codebase):
             # path is found and processed: remove it, so we can check if we
             # found all of them
             del file_references_by_path[res.path]
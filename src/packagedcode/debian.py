@@ -21,6 +21,7 @@ from packageurl import PackageURL
 
 from packagedcode import models
 from packagedcode.utils import get_ancestor
+from packagedcode.utils import get_rootfs_path_index
 from packagedcode.utils import parse_maintainer_name_email
 
 """
@@ -309,13 +310,14 @@ class DebianInstalledStatusDatabaseHandler(models.DatafileHandler):
 
             f'usr/share/doc/{package_name}/copyright',
         ]))
+        # the paths of the rootfs are indexed once for all the packages
+        path_index = get_rootfs_path_index(root_resource=root_resource, codebase=codebase)
+
         resources = []
         # TODO: keep track of missing files
-        for res in root_resource.walk(codebase):
+        for res in path_index.get_resources_by_suffix(assemblable_paths, codebase):
             if TRACE:
                 logger_debug(f'   debian: assemble: root_walk: res: {res}')
-            if not res.path.endswith(assemblable_paths):
-                continue
 
             for pkgdt in res.package_data:
                 package_data = models.PackageData.from_dict(pkgdt)
@@ -368,11 +370,7 @@ class DebianInstalledStatusDatabaseHandler(models.DatafileHandler):
             else:
                 file_references_by_path[ref_path] = ref
 
-        for res in root_resource.walk(codebase):
-            ref = file_references_by_path.get(res.path)
-            if not ref:
-                continue
-
+        for res in path_index.get_resources(file_references_by_path, codebase):
             # path is found and processed: remove it, so we can check if we found all of them
             del file_references_by_path[res.path]
             package_adder(package_uid, res, codebase)
@@ -442,10 +440,8 @@ class DebianDistrolessInstalledDatabaseHandler(models.DatafileHandler):
         )
         resources = []
         if package_uid:
-            for res in root_resource.walk(codebase):
-                if not res.path.endswith(assemblable_paths):
-                    continue
-
+            path_index = get_rootfs_path_index(root_resource=root_resource, codebase=codebase)
+            for res in path_index.get_resources_by_suffix(assemblable_paths, codebase):
                 for pkgdt in res.package_data:
                     package.update(
                         package_data=pkgdt,
@@ -9,6 +9,8 @@
 
 import logging
 import os
+from collections import OrderedDict
+from copy import deepcopy
 
 from license_expression import Licensing
 
@@ -822,6 +824,229 @@ def get_normalized_license_detections(
     return license_detections
 
 
+# Common extracted license statements precomputed when reindexing licenses
+COMMON_EXTRACTED_LICENSE_STATEMENTS = [
+    'MIT',
+    'ISC',
+    'BSD',
+    'Apache-2.0',
+    'Apache 2.0',
+    'Apache License 2.0',
+    'Apache License, Version 2.0',
+    'Apache Software License',
+    'BSD-2-Clause',
+    'BSD-3-Clause',
+    'BSD License',
+    '0BSD',
+    'Unlicense',
+    'CC0-1.0',
+    'CC-BY-4.0',
+    'MPL-2.0',
+    'GPL-2.0',
+    'GPL-2.0-only',
+    'GPL-2.0-or-later',
+    'GPL-3.0',
+    'GPL-3.0-only',
+    'GPL-3.0-or-later',
+    'GPLv2',
+    'GPLv3',
+    'LGPL-2.1',
+    'LGPL-2.1-only',
+    'LGPL-2.1-or-later',
+    'LGPL-3.0',
+    'LGPL-3.0-only',
+    'LGPL-3.0-or-later',
+    'AGPL-3.0',
+    'AGPL-3.0-only',
+    'AGPL-3.0-or-later',
+    'EPL-1.0',
+    'EPL-2.0',
+    'Python-2.0',
+    'Artistic-2.0',
+    'Zlib',
+    'WTFPL',
+    'BlueOak-1.0.0',
+    'PSF',
+    'Ruby',
+    'MIT License',
+    'MIT OR Apache-2.0',
+    'Apache-2.0 OR MIT',
+    '(MIT OR Apache-2.0)',
+    '(Apache-2.0 OR MIT)',
+    '(MIT AND Zlib)',
+    '(MIT OR CC0-1.0)',
+    '(BSD-2-Clause OR MIT OR Apache-2.0)',
+    '(BSD-3-Clause OR GPL-2.0)',
+    'Apache-2.0 WITH LLVM-exception',
+    'UNLICENSED',
+]
+
+# Maximum number of extracted license statements detections cached in memory
+LICENSE_STATEMENTS_CACHE_SIZE = 10000
+
+
+class LicenseStatementsCache:
+    """
+    A bounded least recently used cache of license detection results for
+    extracted license statements, with an optional read-only ``precomputed``
+    mapping of common statements results. The same few statements such as
+    "MIT" are found in most package manifests and are detected only once.
+
+    The ``hits``, ``precomputed_hits`` and ``misses`` counters track the use
+    of this cache.
+    """
+
+    def __init__(self, maxsize=LICENSE_STATEMENTS_CACHE_SIZE, precomputed=None):
+        self.maxsize = maxsize
+        # mapping of {cache key: results}, least recently used first
+        self.results_by_key = OrderedDict()
+        # mapping of {cache key: updated statement} for the list or mapping
+        # statements that are updated in place when detected
+        self.updated_statements_by_key = {}
+        # mapping of {cache key: results} or None if not yet loaded
+        self.precomputed = precomputed
+        self.hits = 0
+        self.precomputed_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the cached results for ``key`` or None.
+        """
+        results_by_key = self.results_by_key
+        results = results_by_key.get(key)
+        if results is not None:
+            results_by_key.move_to_end(key)
+            self.hits += 1
+            return results
+
+        if self.precomputed is None:
+            from licensedcode.cache import load_license_statements_table
+            self.precomputed = load_license_statements_table()
+
+        results = self.precomputed.get(key)
+        if results is not None:
+            self.precomputed_hits += 1
+            return results
+
+        self.misses += 1
+
+    def set(self, key, results, updated_statement=None):
+        """
+        Cache ``results`` for ``key``, evicting the least recently used
+        results if this cache is full. Also cache an ``updated_statement`` if
+        the detection updated the statement of ``key`` in place.
+        """
+        results_by_key = self.results_by_key
+        results_by_key[key] = results
+        if updated_statement is not None:
+            self.updated_statements_by_key[key] = updated_statement
+        if len(results_by_key) > self.maxsize:
+            evicted_key, _ = results_by_key.popitem(last=False)
+            self.updated_statements_by_key.pop(evicted_key, None)
+
+    def get_updated_statement(self, key):
+        """
+        Return the cached updated statement for ``key`` or None.
+        """
+        return self.updated_statements_by_key.get(key)
+
+    def clear(self):
+        self.results_by_key.clear()
+        self.updated_statements_by_key.clear()
+        self.precomputed = None
+        self.hits = self.precomputed_hits = self.misses = 0
+
+    def get_counts(self):
+        """
+        Return a mapping of {counter name: value} for this cache usage.
+        """
+        return dict(
+            hits=self.hits,
+            precomputed_hits=self.precomputed_hits,
+            misses=self.misses,
+        )
+
+
+# global in-memory cache of extracted license statements detections
+_LICENSE_STATEMENTS_CACHE = LicenseStatementsCache()
+
+
+def get_license_statements_cache():
+    return _LICENSE_STATEMENTS_CACHE
+
+
+def get_license_statement_cache_key(
+    extracted_license_statement,
+    default_relation_license,
+    try_as_expression,
+    approximate,
+    package_data_class,
+):
+    """
+    Return a hashable cache key for the detection of an
+    ``extracted_license_statement`` with these arguments or None if this
+    statement cannot be cached.
+    """
+    if isinstance(extracted_license_statement, str):
+        statement = extracted_license_statement
+    elif isinstance(extracted_license_statement, (list, dict)):
+        statement = repr(extracted_license_statement)
+    else:
+        return
+
+    statement_type = type(extracted_license_statement).__name__
+    class_name = package_data_class and package_data_class.__name__
+    return (
+        statement_type,
+        statement,
+        default_relation_license or 'AND',
+        bool(try_as_expression),
+        bool(approximate),
+        class_name,
+    )
+
+
+def build_license_statements_table(
+    statements=tuple(COMMON_EXTRACTED_LICENSE_STATEMENTS),
+    relations=('AND', 'OR'),
+):
+    """
+    Return a mapping of {cache key: detection results} for the
+    ``statements`` extracted license statements detected with each default
+    ``relations`` and the default detection arguments.
+
+    The keys have the same shape as the keys of runtime lookups: there is one
+    entry for each package data class used at runtime to detect licenses
+    with a datasource-specific procedure, and one entry for all the other
+    datasources.
+    """
+    from packagedcode import PACKAGE_DATA_CLASS_BY_DATASOURCE_ID
+
+    package_data_classes = [None]
+    for package_data_class in PACKAGE_DATA_CLASS_BY_DATASOURCE_ID.values():
+        if package_data_class not in package_data_classes:
+            package_data_classes.append(package_data_class)
+
+    table = {}
+    for statement in statements:
+        for relation in relations:
+            for package_data_class in package_data_classes:
+                key = get_license_statement_cache_key(
+                    extracted_license_statement=statement,
+                    default_relation_license=relation,
+                    try_as_expression=True,
+                    approximate=True,
+                    package_data_class=package_data_class,
+                )
+                table[key] = _get_license_detections_and_expression(
+                    extracted_license_statement=statement,
+                    default_relation_license=relation,
+                    package_data_class=package_data_class,
+                )
+    return table
+
+
 def get_license_detections_and_expression(
     extracted_license_statement,
     default_relation_license=None,
@@ -843,16 +1068,99 @@ def get_license_detections_and_expression(
 
     Return None if the `query_string` is empty. Return "unknown" as a license
     expression if there is a `query_string` but nothing was detected.
+
+    The results are cached in memory and reused for the same statement unless
+    custom ``expression_symbols`` are provided.
     """
     from packagedcode import PACKAGE_DATA_CLASS_BY_DATASOURCE_ID
 
+    if not extracted_license_statement:
+        return [], None
+
+    package_data_class = PACKAGE_DATA_CLASS_BY_DATASOURCE_ID.get(datasource_id)
+
+    key = None
+    if not expression_symbols:
+        key = get_license_statement_cache_key(
+            extracted_license_statement=extracted_license_statement,
+            default_relation_license=default_relation_license,
+            try_as_expression=try_as_expression,
+            approximate=approximate,
+            package_data_class=package_data_class,
+        )
+
+    if key is None:
+        return _get_license_detections_and_expression(
+            extracted_license_statement=extracted_license_statement,
+            default_relation_license=default_relation_license,
+            try_as_expression=try_as_expression,
+            approximate=approximate,
+            expression_symbols=expression_symbols,
+            package_data_class=package_data_class,
+        )
+
+    statements_cache = get_license_statements_cache()
+    results = statements_cache.get(key)
+    if results is None:
+        results = _get_license_detections_and_expression(
+            extracted_license_statement=extracted_license_statement,
+            default_relation_license=default_relation_license,
+            try_as_expression=try_as_expression,
+            approximate=approximate,
+            package_data_class=package_data_class,
+        )
+        # some package data classes update a list or mapping statement in
+        # place (such as removing empty Maven license fields): we cache and
+        # replay this update on the next cache hits
+        updated_statement = None
+        if not isinstance(extracted_license_statement, str):
+            if repr(extracted_license_statement) != key[1]:
+                updated_statement = deepcopy(extracted_license_statement)
+        statements_cache.set(key, results, updated_statement)
+
+    else:
+        updated_statement = statements_cache.get_updated_statement(key)
+        if updated_statement is not None:
+            update_statement_in_place(
+                statement=extracted_license_statement,
+                updated_statement=deepcopy(updated_statement),
+            )
+
+    # the detection mappings are updated in place by callers
+    return deepcopy(results)
+
+
+def update_statement_in_place(statement, updated_statement):
+    """
+    Update a list or mapping ``statement`` in place with the content of
+    ``updated_statement``.
+    """
+    if isinstance(statement, list):
+        statement[:] = updated_statement
+    else:
+        statement.clear()
+        statement.update(updated_statement)
+
+
+def _get_license_detections_and_expression(
+    extracted_license_statement,
+    default_relation_license=None,
+    try_as_expression=True,
+    approximate=True,
+    expression_symbols=None,
+    package_data_class=None,
+):
+    """
+    Return a list of LicenseDetection mappings and a license expression
+    detected in `extracted_license_statement`. See
+    get_license_detections_and_expression() for details.
+    """
     detection_data = []
     license_expression = None
 
     if not extracted_license_statement:
         return detection_data, license_expression
 
-    package_data_class = PACKAGE_DATA_CLASS_BY_DATASOURCE_ID.get(datasource_id)
     if package_data_class:
         license_detections = package_data_class.get_license_detections_for_extracted_license_statement(
             extracted_license=extracted_license_statement,
@@ -9,6 +9,7 @@
 
 import functools
 import logging
+import multiprocessing
 import os
 
 import attr
@@ -17,6 +18,7 @@ import click
 from commoncode.cliutils import PluggableCommandLineOption
 from commoncode.cliutils import DOC_GROUP
 from commoncode.cliutils import SCAN_GROUP
+from commoncode.resource import Codebase
 from commoncode.resource import Resource
 from commoncode.resource import strip_first_path_segment
 from plugincode.scan import scan_impl
@@ -31,11 +33,13 @@ from packagedcode.licensing import add_referenced_license_matches_for_package
 from packagedcode.licensing import add_referenced_license_detection_from_package
 from packagedcode.licensing import add_license_from_sibling_file
 from packagedcode.licensing import get_license_expression_from_detection_mappings
+from packagedcode.licensing import get_license_statements_cache
 from packagedcode.models import add_to_package
 from packagedcode.models import Dependency
 from packagedcode.models import Package
 from packagedcode.models import PackageData
 from packagedcode.models import PackageWithResources
+from packagedcode.utils import clear_rootfs_path_indexes
 
 TRACE = os.environ.get('SCANCODE_DEBUG_PACKAGE_API', False)
 TRACE_ASSEMBLY = os.environ.get('SCANCODE_DEBUG_PACKAGE_ASSEMBLY', False)
@@ -187,7 +191,14 @@ class PackageScanner(ScanPlugin):
     def is_enabled(self, package, system_package, package_only, **kwargs):
         return package or system_package or package_only
 
-    def get_scanner(self, package=True, system_package=False, package_only=False, **kwargs):
+    def get_scanner(
+        self,
+        package=True,
+        system_package=False,
+        package_only=False,
+        timing=False,
+        **kwargs,
+    ):
         """
         Return a scanner callable to scan a file for package data.
         """
@@ -198,9 +209,17 @@ class PackageScanner(ScanPlugin):
             application=package,
             system=system_package,
             package_only=package_only,
+            license_statements_stats=timing,
         )
 
-    def process_codebase(self, codebase, strip_root=False, package_only=False, **kwargs):
+    def process_codebase(
+        self,
+        codebase,
+        strip_root=False,
+        package_only=False,
+        timing=False,
+        **kwargs,
+    ):
         """
         Populate the ``codebase`` top level ``packages`` and ``dependencies``
         with package and dependency instances, assembling parsed package data
@@ -208,7 +227,25 @@ class PackageScanner(ScanPlugin):
 
         Also perform additional package license detection that depends on either
         file license detection or the package detections.
+
+        If ``timing`` is True, add the extracted license statements detection
+        cache counts to the codebase header extra_data.
         """
+        counts_before = get_license_statements_cache().get_counts()
+
+        self._process_codebase(codebase, strip_root, package_only, **kwargs)
+
+        if timing:
+            add_license_statements_cache_counts(codebase, counts_before)
+
+    def _process_codebase(
+        self,
+        codebase,
+        strip_root=False,
+        package_only=False,
+        processes=1,
+        **kwargs,
+    ):
         # If we only want purls, we want to skip both the package
         # assembly and the extra package license detection steps
         if package_only:
@@ -216,8 +253,7 @@ class PackageScanner(ScanPlugin):
 
         has_licenses = hasattr(codebase.root, 'license_detections')
 
-        # These steps add proper license detections to package_data and hence
-        # this is performed before top level packages creation
+        package_data_paths = []
         for resource in codebase.walk(topdown=False):
             # populate `from_file` attribute in matches
             for package_data in resource.package_data:
@@ -233,31 +269,21 @@ class PackageScanner(ScanPlugin):
                         path=resource.path,
                     )
 
-            if not has_licenses:
-                #TODO: Add the steps where we detect licenses from files for only a package scan
-                # in the multiprocessing get_package_data API function
-                continue
-
-            # If we don't detect license in package_data but there is license detected in file
-            # we add the license expression from the file to a package
-            modified = add_license_from_file(resource, codebase)
-            if TRACE_LICENSE and modified:
-                logger_debug(f'packagedcode: process_codebase: add_license_from_file: modified: {modified}')
-
-            if codebase.has_single_resource:
-                continue
+            if resource.is_file and resource.package_data:
+                package_data_paths.append(resource.path)
 
-            # If there is referenced files in a extracted license statement, we follow
-            # the references, look for license detections and add them back
-            modified = list(add_referenced_license_matches_for_package(resource, codebase))
-            if TRACE_LICENSE and modified:
-                logger_debug(f'packagedcode: process_codebase: add_referenced_license_matches_for_package: modified: {modified}')
-
-            # If there is a LICENSE file on the same level as the manifest, and no license
-            # is detected in the package_data, we add the license from the file
-            modified = add_license_from_sibling_file(resource, codebase)
-            if TRACE_LICENSE and modified:
-                logger_debug(f'packagedcode: process_codebase: add_license_from_sibling_file: modified: {modified}')
+        # These steps add proper license detections to package_data and hence
+        # this is performed before top level packages creation
+        #TODO: Add the steps where we detect licenses from files for only a package scan
+        # in the multiprocessing get_package_data API function
+        if has_licenses:
+            run_resource_step(
+                codebase=codebase,
+                resource_step=add_license_to_package_data,
+                attributes=('package_data', 'license_detections'),
+                paths=package_data_paths,
+                processes=processes,
+            )
 
         # Create codebase-level packages and dependencies
         create_package_and_deps(codebase, strip_root=strip_root, **kwargs)
@@ -265,12 +291,234 @@ class PackageScanner(ScanPlugin):
 
         if has_licenses:
             # This step is dependent on top level packages
-            for resource in codebase.walk(topdown=False):
-                # If there is a unknown reference to a package we add the license
-                # from the package license detection
-                modified = list(add_referenced_license_detection_from_package(resource, codebase))
-                if TRACE_LICENSE and modified:
-                    logger_debug(f'packagedcode: process_codebase: add_referenced_license_matches_from_package: modified: {modified}')
+            license_detections_paths = [
+                resource.path for resource in codebase.walk(topdown=False)
+                if resource.is_file and resource.license_detections
+            ]
+            # Without top level packages, references are resolved using the
+            # files at the root which can be updated in this step: we then
+            # process each Resource in sequence
+            run_resource_step(
+                codebase=codebase,
+                resource_step=add_license_from_package,
+                attributes=(
+                    'license_detections',
+                    'detected_license_expression',
+                    'detected_license_expression_spdx',
+                ),
+                paths=license_detections_paths,
+                processes=processes if codebase.attributes.packages else 1,
+            )
+
+
+def add_license_to_package_data(resource, codebase):
+    """
+    Add license detections to the package_data of a ``resource`` that has none
+    using the ``resource`` license detections, the files referenced in its
+    extracted license statements or its sibling legal files. Return True if the
+    ``resource`` was updated and saved in the ``codebase``.
+    """
+    # If we don't detect license in package_data but there is license detected in file
+    # we add the license expression from the file to a package
+    modified = add_license_from_file(resource, codebase)
+    if TRACE_LICENSE and modified:
+        logger_debug(f'packagedcode: process_codebase: add_license_from_file: modified: {modified}')
+
+    if codebase.has_single_resource:
+        return bool(modified)
+
+    # If there is referenced files in a extracted license statement, we follow
+    # the references, look for license detections and add them back
+    modified_referenced = list(add_referenced_license_matches_for_package(resource, codebase))
+    if TRACE_LICENSE and modified_referenced:
+        logger_debug(f'packagedcode: process_codebase: add_referenced_license_matches_for_package: modified: {modified_referenced}')
+
+    # If there is a LICENSE file on the same level as the manifest, and no license
+    # is detected in the package_data, we add the license from the file
+    modified_sibling = add_license_from_sibling_file(resource, codebase)
+    if TRACE_LICENSE and modified_sibling:
+        logger_debug(f'packagedcode: process_codebase: add_license_from_sibling_file: modified: {modified_sibling}')
+
+    return bool(modified or modified_referenced or modified_sibling)
+
+
+def add_license_from_package(resource, codebase):
+    """
+    Add the license detections of the package of a ``resource`` to its license
+    detections that reference this package. Return True if the ``resource`` was
+    updated and saved in the ``codebase``.
+    """
+    # If there is a unknown reference to a package we add the license
+    # from the package license detection
+    modified = list(add_referenced_license_detection_from_package(resource, codebase))
+    if TRACE_LICENSE and modified:
+        logger_debug(f'packagedcode: process_codebase: add_referenced_license_matches_from_package: modified: {modified}')
+    return bool(modified)
+
+
+# Use worker processes to run a step on the Resources of a codebase only for at
+# least this many Resources: below this, starting the processes takes longer
+# than running the step in the main process.
+MIN_PARALLEL_RESOURCES = 500
+
+# The Codebase used in a worker process of run_resource_step(). It is set in
+# each worker by the pool initializer to its own copy of the Codebase.
+_worker_codebase = None
+
+
+def run_resource_step(
+    codebase,
+    resource_step,
+    attributes,
+    paths,
+    processes=1,
+    min_parallel_resources=None,
+):
+    """
+    Run the ``resource_step`` callable on each Resource of a ``codebase`` at
+    ``paths``. ``resource_step`` is called with a Resource and the ``codebase``
+    and returns True if it updated and saved this Resource. ``attributes`` are
+    the names of the Resource attributes that ``resource_step`` can update.
+
+    Use up to ``processes`` worker processes for at least
+    ``min_parallel_resources`` ``paths`` (default to MIN_PARALLEL_RESOURCES).
+    The ``paths`` are grouped by parent directory and each worker runs
+    ``resource_step`` on its own copy of the ``codebase`` for a whole group.
+    The ``attributes`` of the files of the directory of an updated group are
+    saved back in the ``codebase`` in the ``paths`` order. For this,
+    ``resource_step`` must update only the Resources of its directory and it
+    must not depend on the updates made by the same step in other directories.
+    """
+    if min_parallel_resources is None:
+        min_parallel_resources = MIN_PARALLEL_RESOURCES
+
+    if not can_use_worker_processes(codebase, processes, len(paths), min_parallel_resources):
+        for path in paths:
+            resource_step(codebase.get_resource(path), codebase)
+        return
+
+    from scancode.pool import get_pool
+
+    # a step can share package and license detections between the files of a
+    # directory: a whole directory is processed and returned at once to keep
+    # these shared
+    paths_by_parent = {}
+    for path in paths:
+        parent_path, _, _ = path.rpartition('/')
+        paths_by_parent.setdefault(parent_path, []).append(path)
+    groups = list(paths_by_parent.values())
+
+    runner = functools.partial(
+        _run_resource_step,
+        resource_step=resource_step,
+        attributes=attributes,
+    )
+    chunksize = max(1, len(groups) // (processes * 4))
+
+    pool = None
+    try:
+        pool = get_pool(
+            processes=processes,
+            initializer=_init_resource_step_worker,
+            initargs=(codebase,),
+        )
+        updates = pool.imap(runner, groups, chunksize=chunksize)
+        pool.close()
+
+        for group_updates in updates:
+            for path, values in group_updates:
+                resource = codebase.get_resource(path)
+                for name, value in values.items():
+                    setattr(resource, name, value)
+                codebase.save_resource(resource)
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+
+
+def can_use_worker_processes(codebase, processes, resources_count, min_parallel_resources):
+    """
+    Return True if a step can run on ``resources_count`` Resources of a
+    ``codebase`` using ``processes`` worker processes.
+    """
+    if not processes or processes < 2 or resources_count < max(min_parallel_resources, 2):
+        return False
+
+    # the Codebase is passed to forked workers as-is: it cannot be pickled to
+    # spawned workers as its Resource class is created at runtime
+    if multiprocessing.get_start_method() != 'fork':
+        return False
+
+    # Resources cached on disk would be saved concurrently by the workers
+    return not any(
+        resource is Codebase.CACHED_RESOURCE
+        for resource in codebase.resources_by_path.values()
+    )
+
+
+def _init_resource_step_worker(codebase):
+    """
+    Initialize a run_resource_step() worker process with its ``codebase``.
+    """
+    global _worker_codebase
+    _worker_codebase = codebase
+
+
+def _run_resource_step(paths, resource_step, attributes):
+    """
+    Run ``resource_step`` in a worker process on the Resources at ``paths`` of
+    the same directory. Return a list of (path, {attribute name: value}) for
+    the files of this directory if any Resource was updated or an empty list.
+    """
+    codebase = _worker_codebase
+    modified = False
+    for path in paths:
+        if resource_step(codebase.get_resource(path), codebase):
+            modified = True
+
+    if not modified:
+        return []
+
+    parent = codebase.get_resource(paths[0]).parent(codebase)
+    return [
+        (child.path, {name: getattr(child, name) for name in attributes})
+        for child in parent.children(codebase)
+        if child.is_file and any(getattr(child, name) for name in attributes)
+    ]
+
+
+def add_license_statements_cache_counts(codebase, counts_before):
+    """
+    Add the extracted license statements detection cache counts and hit rate
+    to the ``codebase`` current header extra_data.
+
+    These are the sum of the per-file counts collected by get_package_data()
+    in the "license_statements_cache" extra_data of each Resource (which are
+    removed from these Resources) and of the counts in this process since the
+    ``counts_before`` mapping of cache counts.
+    """
+    counts = {
+        name: value - counts_before[name]
+        for name, value in get_license_statements_cache().get_counts().items()
+    }
+
+    for resource in codebase.walk():
+        file_counts = resource.extra_data.pop('license_statements_cache', None)
+        if not file_counts:
+            continue
+        codebase.save_resource(resource)
+        for name, value in file_counts.items():
+            counts[name] += value
+
+    lookups = sum(counts.values())
+    if not lookups:
+        return
+
+    cached = counts['hits'] + counts['precomputed_hits']
+    counts['hit_rate'] = round(cached / lookups, 4)
+    header = codebase.get_or_create_current_header()
+    header.extra_data['license_statements_cache'] = counts
 
 
 def add_license_from_file(resource, codebase):
@@ -373,6 +621,25 @@ def get_package_and_deps(codebase, package_adder=add_to_package, strip_root=Fals
     Return a tuple of (Packages list, Dependency list) from the parsed package
     data present in the codebase files.package_data attributes.
     """
+    # the rootfs path indexes shared by the installed package handlers are
+    # only valid during assembly
+    clear_rootfs_path_indexes(codebase)
+    try:
+        return _get_package_and_deps(
+            codebase=codebase,
+            package_adder=package_adder,
+            strip_root=strip_root,
+            **kwargs,
+        )
+    finally:
+        clear_rootfs_path_indexes(codebase)
+
+
+def _get_package_and_deps(codebase, package_adder=add_to_package, strip_root=False, **kwargs):
+    """
+    Return a tuple of (Packages list, Dependency list) assembled from the
+    package data of the ``codebase`` files. See get_package_and_deps().
+    """
     packages = []
     dependencies = []
 
@@ -8,9 +8,12 @@
 #
 
 import os
+import re
 import sys
+from fnmatch import translate
 
 from commoncode import filetype
+from commoncode.fileutils import as_posixpath
 from packagedcode import APPLICATION_PACKAGE_DATAFILE_HANDLERS
 from packagedcode import SYSTEM_PACKAGE_DATAFILE_HANDLERS
 from packagedcode import ALL_DATAFILE_HANDLERS
@@ -83,7 +86,8 @@ def _parse(
     Default to use application packages
     """
 
-    for handler in datafile_handlers:
+    matcher = get_datafile_handlers_matcher(datafile_handlers)
+    for handler in matcher.get_candidates(location):
         if TRACE:
             logger_debug(f'_parse:.is_datafile: {handler}')
 
@@ -113,3 +117,108 @@ def _parse(
 
             if TRACE:
                 raise
+
+
+# characters with a special meaning in fnmatch patterns
+GLOB_CHARS = frozenset('*?[')
+
+
+class DatafileHandlersMatcher:
+    """
+    Find the candidate DatafileHandlers for a path among a ``handlers`` list
+    without trying each of their ``path_patterns`` in turn.
+
+    Patterns made of a leading "*" followed by a non-empty literal path suffix
+    (such as "*/package.json" or "*.gemspec") are indexed in hash tables by suffix
+    length. The few other patterns are combined in a single regex to quickly
+    discard a path that matches none of them, and tried one by one otherwise.
+
+    Handlers that override DatafileHandler.is_datafile() may recognize files
+    using other means than their path patterns and are always candidates.
+    The candidates are returned in the ``handlers`` order and are only likely
+    datafiles: their is_datafile() must still be called.
+    """
+
+    def __init__(self, handlers):
+        self.handlers = list(handlers)
+
+        # mapping of {suffix length: {suffix: set of handler positions}}
+        self.positions_by_suffix_by_length = {}
+        # list of (compiled fnmatch regex, handler position)
+        self.glob_patterns = []
+        # set of positions of handlers that are always candidates
+        self.always_candidates = set()
+
+        default_is_datafile = models.DatafileHandler.is_datafile.__func__
+        globs = []
+        for position, handler in enumerate(self.handlers):
+            if handler.is_datafile.__func__ is not default_is_datafile:
+                self.always_candidates.add(position)
+                continue
+
+            for pattern in handler.path_patterns:
+                suffix = pattern[1:]
+                # a bare "*" pattern has no suffix to index and matches any path
+                if (
+                    pattern.startswith('*')
+                    and suffix
+                    and not GLOB_CHARS.intersection(suffix)
+                ):
+                    by_suffix = self.positions_by_suffix_by_length.setdefault(len(suffix), {})
+                    by_suffix.setdefault(suffix, set()).add(position)
+                else:
+                    glob = translate(pattern)
+                    globs.append(glob)
+                    self.glob_patterns.append((re.compile(glob), position))
+
+        # a single regex to check if a path matches any of the glob patterns
+        self.any_glob_pattern = globs and re.compile('|'.join(globs))
+
+    def get_candidates(self, location):
+        """
+        Return a list of candidate DatafileHandlers for the file at
+        ``location``.
+        """
+        loc = as_posixpath(location)
+        positions = set(self.always_candidates)
+
+        for length, positions_by_suffix in self.positions_by_suffix_by_length.items():
+            matched = positions_by_suffix.get(loc[-length:])
+            if matched:
+                positions.update(matched)
+
+        if self.any_glob_pattern and self.any_glob_pattern.match(loc):
+            positions.update(
+                position for pattern, position in self.glob_patterns
+                if pattern.match(loc)
+            )
+
+        handlers = self.handlers
+        return [handlers[position] for position in sorted(positions)]
+
+
+# mapping of {id of a handlers list: (handlers list, DatafileHandlersMatcher)}
+# the handlers list is kept such that its id is never reused
+_MATCHERS_BY_HANDLERS_ID = {}
+
+
+def get_datafile_handlers_matcher(handlers):
+    """
+    Return a cached DatafileHandlersMatcher for a ``handlers`` list of
+    DatafileHandler classes.
+    """
+    cached = _MATCHERS_BY_HANDLERS_ID.get(id(handlers))
+    if cached and cached[0] is handlers:
+        return cached[1]
+
+    matcher = DatafileHandlersMatcher(handlers)
+    _MATCHERS_BY_HANDLERS_ID[id(handlers)] = handlers, matcher
+    return matcher
+
+
+for _handlers in (
+    APPLICATION_PACKAGE_DATAFILE_HANDLERS,
+    SYSTEM_PACKAGE_DATAFILE_HANDLERS,
+    ALL_DATAFILE_HANDLERS,
+):
+    get_datafile_handlers_matcher(_handlers)
@@ -7,6 +7,8 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from collections import defaultdict
+
 from packageurl import PackageURL
 
 try:
@@ -194,6 +196,97 @@ def find_root_resource(path, resource, codebase):
     return resource
 
 
+class RootfsPathIndex:
+    """
+    An index of the paths of all the Resources under the root directory
+    Resource of an installed root filesystem. Installed package handlers use
+    this to find the files of each package with a dictionary lookup by path or
+    by path suffix rather than with a walk of the whole root filesystem for each
+    package.
+
+    Only paths are indexed: Resources are always fetched fresh from the
+    codebase as they are updated during package assembly.
+    """
+
+    def __init__(self, root_resource, codebase):
+        self.root_path = root_resource.path
+        # mapping of {path: position in a topdown walk}
+        self.positions_by_path = {}
+        # mappings of {last path segment(s): [list of paths]}
+        self.paths_by_name = defaultdict(list)
+        self.paths_by_tail = defaultdict(list)
+
+        for position, res in enumerate(root_resource.walk(codebase)):
+            path = res.path
+            self.positions_by_path[path] = position
+            segments = path.split('/')
+            self.paths_by_name[segments[-1]].append(path)
+            self.paths_by_tail['/'.join(segments[-2:])].append(path)
+
+    def get_resources(self, paths, codebase):
+        """
+        Return a list of the Resources under the root directory at any of the
+        ``paths`` path strings in topdown walk order. Paths that do not exist
+        under the root directory are ignored.
+        """
+        positions_by_path = self.positions_by_path
+        paths = sorted(
+            (path for path in set(paths) if path in positions_by_path),
+            key=positions_by_path.__getitem__,
+        )
+        return [codebase.get_resource(path=path) for path in paths]
+
+    def get_resources_by_suffix(self, suffixes, codebase):
+        """
+        Return a list of the Resources under the root directory with a path
+        ending with any of the ``suffixes`` path strings in topdown walk order.
+        """
+        paths = set()
+        for suffix in suffixes:
+            segments = suffix.split('/')
+            if len(segments) > 2:
+                # the last two segments of a matched path are complete in suffix
+                candidates = self.paths_by_tail.get('/'.join(segments[-2:]), [])
+            elif len(segments) == 2:
+                candidates = self.paths_by_name.get(segments[-1], [])
+            else:
+                candidates = self.positions_by_path
+            paths.update(path for path in candidates if path.endswith(suffix))
+
+        paths = sorted(paths, key=self.positions_by_path.__getitem__)
+        return [codebase.get_resource(path=path) for path in paths]
+
+
+# mapping of {id(codebase): (codebase, {root path: RootfsPathIndex})}. A
+# Codebase cannot be weakly referenced: we keep it with its indexes to avoid
+# reusing the indexes of a discarded Codebase that had the same id.
+_rootfs_path_indexes = {}
+
+
+def get_rootfs_path_index(root_resource, codebase):
+    """
+    Return a RootfsPathIndex for the ``root_resource`` root directory of an
+    installed root filesystem in ``codebase``. This index is built once and
+    shared by all the package handlers until clear_rootfs_path_indexes() is
+    called for this ``codebase``.
+    """
+    cached_codebase, indexes = _rootfs_path_indexes.get(id(codebase), (None, None))
+    if cached_codebase is not codebase:
+        indexes = {}
+        _rootfs_path_indexes[id(codebase)] = codebase, indexes
+    index = indexes.get(root_resource.path)
+    if not index:
+        index = indexes[root_resource.path] = RootfsPathIndex(root_resource, codebase)
+    return index
+
+
+def clear_rootfs_path_indexes(codebase):
+    """
+    Discard the RootfsPathIndex built for ``codebase``.
+    """
+    _rootfs_path_indexes.pop(id(codebase), None)
+
+
 def yield_dependencies_from_package_data(package_data, datafile_path, package_uid):
     """
     Yield a Dependency for each dependency from ``package_data.dependencies``
@@ -43,9 +43,17 @@ class ScancodeCliUsageError(ScancodeError, click.UsageError):
     """Exception for command line usage errors"""
 
 
-# Holds a scan plugin result "key and the corresponding function.
-# click.Parameter instance
-Scanner = namedtuple('Scanner', 'name function')
+# Holds a scan plugin result key and the corresponding scanner function.
+# `content_addressable` is the value of the optional `content_addressable`
+# attribute of a ScanPlugin class: set it to True in a ScanPlugin when its scan
+# results depend only on the content and name of a file. These results are then
+# reused for the files with the same content with --dedupe and --scan-cache and
+# for the unchanged files with --incremental-from.
+Scanner = namedtuple(
+    'Scanner',
+    'name function content_addressable',
+    defaults=(False,),
+)
 
 notice = '''Generated with ScanCode and provided on an "AS IS" BASIS, WITHOUT WARRANTIES
 OR CONDITIONS OF ANY KIND, either express or implied. No content created from
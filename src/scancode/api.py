@@ -155,6 +155,7 @@ def get_licenses(
     license_diagnostics=False,
     deadline=sys.maxsize,
     unknown_licenses=False,
+    license_profile=False,
     **kwargs,
 ):
     """
@@ -175,10 +176,14 @@ def get_licenses(
     This is used to determine if a file contains mostly licensing.
 
     If ``unknown_licenses`` is True, also detect unknown licenses.
+
+    If ``license_profile`` is True, also return a license matching profile
+    mapping with stage timings and counters in the "license_profile" extra_data.
     """
     from licensedcode.cache import build_spdx_license_expression
     from licensedcode.cache import get_cache
     from licensedcode.detection import detect_licenses
+    from licensedcode.profiling import MatchProfile
     from packagedcode.utils import combine_expressions
 
     license_clues = []
@@ -187,11 +192,16 @@ def get_licenses(
     detected_license_expression = None
     detected_license_expression_spdx = None
 
+    profile = None
+    if license_profile:
+        profile = MatchProfile()
+
     detections = detect_licenses(
         location=location,
         min_score=min_score,
         deadline=deadline,
         unknown_licenses=unknown_licenses,
+        profile=profile,
         **kwargs,
     )
 
@@ -236,13 +246,16 @@ def get_licenses(
     if detection:
         percentage_of_license_text = detection.percentage_license_text_of_file(all_qspans)
 
-    return dict([
+    results = dict([
         ('detected_license_expression', detected_license_expression),
         ('detected_license_expression_spdx', detected_license_expression_spdx),
         ('license_detections', license_detections),
         ('license_clues', license_clues),
         ('percentage_of_license_text', percentage_of_license_text),
     ])
+    if profile:
+        results['extra_data.license_profile'] = profile.to_dict()
+    return results
 
 
 SCANCODE_DEBUG_PACKAGE_API = os.environ.get('SCANCODE_DEBUG_PACKAGE_API', False)
@@ -292,15 +305,31 @@ def get_package_info(location, **kwargs):
     return dict(packages=[p.to_dict() for p in packages])
 
 
-def get_package_data(location, application=True, system=False, package_only=False, **kwargs):
+def get_package_data(
+    location,
+    application=True,
+    system=False,
+    package_only=False,
+    license_statements_stats=False,
+    **kwargs,
+):
     """
     Return a mapping of package manifest information detected in the file at
     `location`.
     Include ``application`` packages (such as pypi) and/or ``system`` packages.
+
+    If `license_statements_stats` is True, also return the usage counts of the
+    extracted license statements detection cache for this file in the
+    "extra_data.license_statements_cache" key.
     """
     if TRACE:
         print('  scancode.api.get_package_data: kwargs', kwargs)
 
+    if license_statements_stats:
+        from packagedcode.licensing import get_license_statements_cache
+        statements_cache = get_license_statements_cache()
+        counts_before = statements_cache.get_counts()
+
     package_datas = _get_package_data(
         location=location,
         application=application,
@@ -309,7 +338,17 @@ def get_package_data(location, application=True, system=False, package_only=Fals
         **kwargs,
     ) or []
 
-    return dict(package_data=[pd.to_dict() for pd in package_datas])
+    results = dict(package_data=[pd.to_dict() for pd in package_datas])
+
+    if license_statements_stats:
+        counts = {
+            name: value - counts_before[name]
+            for name, value in statements_cache.get_counts().items()
+        }
+        if any(counts.values()):
+            results['extra_data.license_statements_cache'] = counts
+
+    return results
 
 
 def get_file_info(location, **kwargs):
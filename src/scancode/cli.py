@@ -22,6 +22,7 @@ import traceback
 
 from collections import defaultdict
 from functools import partial
+from itertools import chain
 from multiprocessing import TimeoutError
 from time import sleep
 from time import time
@@ -67,10 +68,13 @@ from scancode import print_about
 from scancode import Scanner
 from scancode.help import epilog_text
 from scancode.help import examples_text
+from scancode.incremental import PreviousScan
 from scancode.interrupt import DEFAULT_TIMEOUT
 from scancode.interrupt import fake_interruptible
 from scancode.interrupt import interruptible
 from scancode.pool import ScanCodeTimeoutError
+from scancode.scan_cache import CachedScans
+from scancode.scan_cache import ScanCache
 
 # Tracing flags
 TRACE = False
@@ -244,6 +248,39 @@ def validate_input_path(ctx, param, value):
          f'[default: {DEFAULT_TIMEOUT} seconds]',
     help_group=cliutils.CORE_GROUP, sort_order=10, cls=PluggableCommandLineOption)
 
+@click.option('--batch',
+    is_flag=True,
+    help='Scan small files in batches of multiple files in each parallel process '
+         'task to reduce the per-file multiprocessing overhead. Large files are '
+         'still scanned one at a time. Useful for codebases with many small files.',
+    help_group=cliutils.CORE_GROUP, sort_order=15, cls=PluggableCommandLineOption)
+
+@click.option('--dedupe',
+    is_flag=True,
+    help='Scan files with the same content and name only once and reuse their '
+         'scan results. This applies to the scans that depend on the file '
+         'content alone such as license, copyright, email and url scans.',
+    help_group=cliutils.CORE_GROUP, sort_order=16, cls=PluggableCommandLineOption)
+
+@click.option('--scan-cache',
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, writable=True),
+    metavar='FILE',
+    help='Save the scan results of files in the FILE SQLite database and reuse '
+         'these for files with the same content and name in later scans with '
+         'the same scan options. Implies --dedupe.',
+    help_group=cliutils.CORE_GROUP, sort_order=17, cls=PluggableCommandLineOption)
+
+@click.option('--incremental-from',
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+    metavar='FILE',
+    conflicting_options=['from_json'],
+    help='Reuse the scan results of the previous JSON scan FILE for the files '
+         'with the same path, size and SHA1 and scan only new and modified '
+         'files. This applies to the scans that depend on the file content '
+         'alone such as license, copyright, email and url scans. FILE must '
+         'include file info and use the same scan options.',
+    help_group=cliutils.CORE_GROUP, sort_order=18, cls=PluggableCommandLineOption)
+
 @click.option('-q', '--quiet',
     is_flag=True,
     conflicting_options=['verbose'],
@@ -288,6 +325,16 @@ def validate_input_path(ctx, param, value):
         'the starting directory. Use 0 for no scan depth limit.',
     help_group=cliutils.CORE_GROUP, sort_order=301, cls=PluggableCommandLineOption)
 
+@click.option('--serve',
+    metavar='ADDRESS',
+    help='Run a local scan server at ADDRESS, either a HOST:PORT or a :PORT '
+         'localhost TCP address or the path to a Unix domain socket. The '
+         'server keeps the license index and worker processes loaded and '
+         'returns the results of each scan as JSON Lines once this scan is '
+         'completed. The selected scan options '
+         'are used as defaults for each scan request. Use Ctrl+C to stop.',
+    help_group=cliutils.CORE_GROUP, sort_order=310, cls=PluggableCommandLineOption)
+
 @click.help_option('-h', '--help',
     help_group=cliutils.DOC_GROUP, sort_order=10, cls=PluggableCommandLineOption)
 
@@ -380,12 +427,17 @@ def scancode(
     full_root,
     processes,
     timeout,
+    batch,
+    dedupe,
+    scan_cache,
+    incremental_from,
     quiet,
     verbose,
     max_depth,
     from_json,
     timing,
     max_in_memory,
+    serve,
     test_mode,
     test_slow_mode,
     test_error_mode,
@@ -450,6 +502,18 @@ def scancode(
       if the license scan is interrupted they other scans may complete, each
       withing the timeout)
 
+    - `batch`: boolean flag: send small files to the parallel processes in
+      batches of multiple files rather than one file at a time.
+
+    - `dedupe`: boolean flag: scan files with the same content and name only
+      once for content-only scans and reuse their results.
+
+    - `scan_cache`: string: the path to an SQLite database file where to save
+      and reuse scan results across scans. Implies `dedupe`.
+
+    - `incremental_from`: string: the path to a previous JSON scan file whose
+      results are reused for the files that did not change since this scan.
+
     - `quiet` and `verbose`: boolean flags: Do not display any message if
       `quiet` is True. Otherwise, display extra verbose messages if `quiet` is
       False and `verbose` is True. These two options are mutually exclusive.
@@ -457,6 +521,9 @@ def scancode(
     - `timing`: boolean flag: collect per-scan and per-file scan timings if
       True.
 
+    - `serve`: string: if provided run a scan server at this address instead
+      of scanning `input`. See scancode.server for details.
+
     Other **kwargs are passed down to plugins as CommandOption indirectly
     through Click context machinery.
     """
@@ -474,6 +541,28 @@ def scancode(
                 logger_debug('  scancode: ctx.params:', co)
 
         cliutils.validate_option_dependencies(ctx)
+
+        if serve:
+            serve_scans(
+                ctx=ctx,
+                address=serve,
+                input=input,
+                strip_root=strip_root,
+                full_root=full_root,
+                processes=processes,
+                timeout=timeout,
+                batch=batch,
+                dedupe=dedupe,
+                scan_cache=scan_cache,
+                quiet=quiet,
+                max_depth=max_depth,
+                timing=timing,
+                max_in_memory=max_in_memory,
+                echo_func=echo_func,
+                **kwargs,
+            )
+            ctx.exit(0)
+
         pretty_params = get_pretty_params(ctx, generic_paths=test_mode)
 
         # Check for updates
@@ -489,6 +578,10 @@ def scancode(
             full_root=full_root,
             processes=processes,
             timeout=timeout,
+            batch=batch,
+            dedupe=dedupe,
+            scan_cache=scan_cache,
+            incremental_from=incremental_from,
             quiet=quiet,
             verbose=verbose,
             max_depth=max_depth,
@@ -523,6 +616,38 @@ def scancode(
     ctx.exit(rc)
 
 
+def serve_scans(ctx, address, input, processes, quiet, echo_func=echo_stderr, **kwargs):  # NOQA
+    """
+    Run a scan server at ``address`` using the scan options in ``kwargs`` as
+    defaults for each scan request.
+    """
+    if input:
+        msg = 'The --serve option cannot be used with an <input>.'
+        raise click.UsageError(msg)
+
+    output_option_names = {
+        clio.name for clio in plugin_options
+        if clio.help_group == cliutils.OUTPUT_GROUP
+    }
+    if any(ctx.params.get(name) for name in output_option_names):
+        msg = 'The --serve option cannot be used with output options.'
+        raise click.UsageError(msg)
+
+    options = {
+        name: value for name, value in kwargs.items()
+        if name not in output_option_names
+    }
+
+    from scancode.server import serve
+    serve(
+        address=address,
+        options=options,
+        processes=processes,
+        quiet=quiet,
+        echo_func=echo_func,
+    )
+
+
 def run_scan(
     input,  # NOQA
     from_json=False,
@@ -531,6 +656,10 @@ def run_scan(
     max_in_memory=10000,
     processes=1,
     timeout=120,
+    batch=False,
+    dedupe=False,
+    scan_cache=None,
+    incremental_from=None,
     quiet=True,
     verbose=False,
     max_depth=0,
@@ -546,6 +675,7 @@ def run_scan(
     pretty_params=None,
     plugin_options=plugin_options,
     outdated=None,
+    pool=None,
     *args,
     **kwargs
 ):
@@ -555,6 +685,10 @@ def run_scan(
     "files" items using the same data structure as the "files" in the JSON scan
     results but as native Python. Raise Exceptions (e.g. ScancodeError) on
     error. See scancode() for arguments details.
+
+    `pool` is an optional scancode.pool.ScanWorkerPool to run the scan with
+    long-lived worker processes that are reused across multiple run_scan()
+    calls instead of creating new processes for each scan.
     """
 
     assert not (return_results is True and return_codebase is True), 'Only one of return_results and return_codebase can be True'
@@ -638,6 +772,10 @@ def run_scan(
         full_root=full_root,
         processes=processes,
         timeout=timeout,
+        batch=batch,
+        dedupe=dedupe,
+        scan_cache=scan_cache,
+        incremental_from=incremental_from,
         quiet=quiet,
         verbose=verbose,
         from_json=from_json,
@@ -946,10 +1084,15 @@ def run_scan(
             processes=processes,
             timeout=timeout,
             timing=timeout,
+            batch=batch,
+            dedupe=dedupe,
+            scan_cache=scan_cache,
+            incremental_from=incremental_from,
             quiet=quiet,
             verbose=verbose,
             kwargs=requested_options,
             echo_func=echo_func,
+            pool=pool,
         )
         success = success and scan_success
 
@@ -1010,12 +1153,9 @@ def run_scan(
         # any output plugin
         if output_plugins:
             # TODO: add progress indicator
-            output_success = run_codebase_plugins(
-                stage='output',
+            output_success = run_output_plugins(
                 plugins=output_plugins,
                 codebase=codebase,
-                stage_msg='Save scan results...',
-                plugin_msg=' Save scan results as: %(name)s...',
                 quiet=quiet,
                 verbose=verbose,
                 kwargs=requested_options,
@@ -1131,6 +1271,148 @@ def run_codebase_plugins(
     return success
 
 
+def run_output_plugins(
+    plugins,
+    codebase,
+    quiet=False,
+    verbose=False,
+    kwargs=None,
+    echo_func=echo_stderr,
+):
+    """
+    Run the list of output `plugins` on `codebase` and return True on success
+    and False otherwise.
+
+    The codebase is walked and its resources are serialized only once for all
+    the plugins that provide a `get_files_writer()` method: each scanned file
+    mapping is fed in turn to the FilesWriter of each of these plugins. Other
+    plugins are run with their process_codebase() method.
+    """
+    kwargs = kwargs or {}
+
+    stage_start = time()
+    streaming_plugins = [p for p in plugins if hasattr(p, 'get_files_writer')]
+    if len(streaming_plugins) < 2:
+        return run_codebase_plugins(
+            stage='output',
+            plugins=plugins,
+            codebase=codebase,
+            stage_msg='Save scan results...',
+            plugin_msg=' Save scan results as: %(name)s...',
+            quiet=quiet,
+            verbose=verbose,
+            kwargs=kwargs,
+            echo_func=echo_func,
+        )
+
+    # run the other plugins first such that their updates to the codebase
+    # headers are included in the outputs written from the files writers.
+    other_plugins = [p for p in plugins if p not in streaming_plugins]
+    success = run_codebase_plugins(
+        stage='output',
+        plugins=other_plugins,
+        codebase=codebase,
+        stage_msg='Save scan results...',
+        plugin_msg=' Save scan results as: %(name)s...',
+        quiet=quiet,
+        verbose=verbose,
+        kwargs=kwargs,
+        echo_func=echo_func,
+    )
+
+    streaming_success = write_output_files(
+        plugins=streaming_plugins,
+        codebase=codebase,
+        verbose=verbose,
+        kwargs=kwargs,
+        echo_func=echo_func,
+    )
+
+    codebase.timings['output'] = time() - stage_start
+    return success and streaming_success
+
+
+def write_output_files(
+    plugins,
+    codebase,
+    verbose=False,
+    kwargs=None,
+    echo_func=echo_stderr,
+):
+    """
+    Write the scanned files of `codebase` with the FilesWriter of each output
+    `plugins` walking the codebase once. Return True on success and False
+    otherwise. A plugin that fails is reported and its writer is not used
+    anymore.
+    """
+    kwargs = kwargs or {}
+    if verbose:
+        sorted_names = ', '.join(sorted(p.name for p in plugins))
+        echo_func(f'Save scan results as: {sorted_names}...', fg='green')
+
+    stage = 'output'
+    success = True
+    durations = {}
+
+    def fail(name):
+        nonlocal success
+        msg = 'ERROR: failed to run %(stage)s plugin: %(name)s:' % locals()
+        echo_func(msg, fg='red')
+        tb = traceback.format_exc()
+        echo_func(tb)
+        codebase.errors.append(msg + '\n' + tb)
+        success = False
+
+    # mapping of {plugin name: FilesWriter} for the writers that did not fail
+    writers = {}
+    for plugin in sorted(plugins, key=lambda x: x.run_order):
+        name = plugin.name
+        start = time()
+        try:
+            writer = plugin.get_files_writer(codebase, **kwargs)
+            writer.start()
+            writers[name] = writer
+        except Exception:
+            fail(name)
+        durations[name] = time() - start
+
+    files_start = time()
+    writing_duration = 0
+    try:
+        for scanned_file in output.OutputPlugin.get_files(codebase, **kwargs):
+            for name, writer in list(writers.items()):
+                start = time()
+                try:
+                    writer.write(scanned_file)
+                except Exception:
+                    fail(name)
+                    del writers[name]
+                duration = time() - start
+                durations[name] += duration
+                writing_duration += duration
+    except Exception:
+        # failing to collect the files fails all the plugins
+        for name in writers:
+            fail(name)
+        writers = {}
+
+    # the time to walk and serialize the files is shared by all plugins
+    codebase.timings['output:files'] = time() - files_start - writing_duration
+
+    for name, writer in writers.items():
+        start = time()
+        try:
+            writer.finish()
+        except Exception:
+            fail(name)
+        durations[name] += time() - start
+
+    for name, duration in durations.items():
+        codebase.timings['%(stage)s:%(name)s' % locals()] = duration
+
+    return success
+
+
 def run_scanners(
     stage,
     plugins,
@@ -1138,10 +1420,15 @@ def run_scanners(
     processes,
     timeout,
     timing,
+    batch=False,
+    dedupe=False,
+    scan_cache=None,
+    incremental_from=None,
     quiet=False,
     verbose=False,
     kwargs=None,
     echo_func=echo_stderr,
+    pool=None,
 ):
     """
     Run the list of `stage` ScanPlugin `plugins` on `codebase`.
@@ -1154,7 +1441,13 @@ def run_scanners(
     Use multiple `processes` and limit the runtime of a single scanner
     function to `timeout` seconds.
     Compute detailed timings if `timing` is True.
+    Scan small files in batches if `batch` is True.
+    Scan files with the same content once if `dedupe` is True and save and
+    reuse scan results in the optional `scan_cache` SQLite database file.
+    Reuse the scan results of the files that did not change since the previous
+    scan in the optional `incremental_from` JSON scan file.
     Display progress and errors based on the `quiet` and `verbose` flags.
+    Use the optional ScanWorkerPool `pool` for multiprocessing.
     """
 
     kwargs = kwargs or {}
@@ -1162,9 +1455,17 @@ def run_scanners(
     scan_start = time()
 
     scanners = []
+    content_attributes = []
     for plugin in plugins:
         func = plugin.get_scanner(**kwargs)
-        scanners.append(Scanner(name=plugin.name, function=func))
+        content_addressable = getattr(plugin, 'content_addressable', False)
+        if content_addressable:
+            content_attributes.extend(plugin.resource_attributes)
+        scanners.append(Scanner(
+            name=plugin.name,
+            function=func,
+            content_addressable=content_addressable,
+        ))
 
     if TRACE_DEEP: logger_debug('run_scanners: scanners:', scanners)
     if not scanners:
@@ -1180,10 +1481,30 @@ def run_scanners(
             item_show_func=item_show_func,
             verbose=verbose, file=sys.stderr)
 
+    cache = None
+    content_scanners = [s for s in scanners if s.content_addressable]
+    if (dedupe or scan_cache) and content_scanners:
+        cache = ScanCache(scanners=content_scanners, location=scan_cache)
+
+    previous_scan = None
+    if incremental_from and content_scanners:
+        previous_scan = get_previous_scan(
+            location=incremental_from,
+            attributes=content_attributes,
+            kwargs=kwargs,
+            quiet=quiet,
+            echo_func=echo_func,
+        )
+
     # TODO: add CLI option to bypass cache entirely?
-    scan_success = scan_codebase(
-        codebase, scanners, processes, timeout,
-        with_timing=timing, progress_manager=progress_manager)
+    try:
+        scan_success = scan_codebase(
+            codebase, scanners, processes, timeout,
+            with_timing=timing, progress_manager=progress_manager, pool=pool,
+            batch=batch, scan_cache=cache, previous_scan=previous_scan)
+    finally:
+        if cache:
+            cache.close()
 
     # TODO: add progress indicator
     # run the process codebase of each scan plugin (most often a no-op)
@@ -1213,6 +1534,57 @@ def run_scanners(
     return scan_success
 
 
+def get_previous_scan(location, attributes, kwargs, quiet=False, echo_func=echo_stderr):
+    """
+    Return a PreviousScan for the JSON scan file at ``location`` to reuse the
+    ``attributes`` Resource scan results, or None if this scan was run with
+    other scan options than the ``kwargs`` options of this scan.
+    """
+    strip_root = kwargs.get('strip_root', False)
+    full_root = kwargs.get('full_root', False)
+    try:
+        previous_scan = PreviousScan(
+            location=location,
+            attributes=attributes,
+            strip_root=strip_root,
+            full_root=full_root,
+        )
+    except Exception as e:
+        msg = f'ERROR: failed to load previous scan file at: {location!r}'
+        raise ScancodeError(msg + '\n' + traceback.format_exc()) from e
+
+    # these options change the scan results or their paths
+    options = {
+        '--strip-root': (strip_root, False),
+        '--full-root': (full_root, False),
+    }
+    for stage in (scan.stage, post_scan.stage):
+        for plugin_cls in PluginManager.managers[stage].plugin_classes:
+            for option in plugin_cls.options:
+                # eager and hidden options are not reported in scan headers
+                if option.is_eager or getattr(option, 'hidden', False):
+                    continue
+                value = kwargs.get(option.name)
+                if value is None:
+                    value = option.default
+                options[option.opts[-1]] = value, option.default
+
+    mismatch = previous_scan.get_options_mismatch(
+        tool_version=scancode_config.__version__,
+        options=options,
+    )
+    if mismatch:
+        if not quiet:
+            echo_func(
+                f'Cannot reuse the results of the previous scan: {mismatch}. '
+                'Scanning all files.',
+                fg='yellow',
+            )
+        return
+
+    return previous_scan
+
+
 def scan_codebase(
     codebase,
     scanners,
@@ -1221,6 +1593,10 @@ def scan_codebase(
     with_timing=False,
     progress_manager=None,
     echo_func=echo_stderr,
+    pool=None,
+    batch=False,
+    scan_cache=None,
+    previous_scan=None,
 ):
     """
     Run the `scanners` Scanner objects on the `codebase` Codebase. Return True
@@ -1230,6 +1606,22 @@ def scan_codebase(
     single process. Disable multiprocessing with processes 0 or -1. Disable
     threading is processes is -1.
 
+    If a ScanWorkerPool `pool` is provided and `processes` is 1 or more, use
+    this pool worker processes instead of creating a new pool. This pool is
+    not terminated at the end of the scan and can be reused.
+
+    If `batch` is True and `processes` is 1 or more, send small files to the
+    worker processes in batches rather than one at a time. See get_batches()
+    for details. Each file scan is still limited by `timeout`.
+
+    If a ScanCache `scan_cache` is provided, run the content-addressable
+    scanners only once for each distinct file content not yet cached and reuse
+    these results for the other files. The other scanners run on every file.
+
+    If a PreviousScan `previous_scan` is provided, run the content-addressable
+    scanners only on the files that changed since this previous scan and reuse
+    its results for the unchanged files. The other scanners run on every file.
+
     Run each scanner function for up to `timeout` seconds and fail it otherwise.
 
     If `with_timing` is True, each Resource is updated with per-scanner
@@ -1245,13 +1637,33 @@ def scan_codebase(
     resources = ((r.location, r.path) for r in codebase.walk() if r.is_file)
 
     use_threading = processes >= 0
-    runner = partial(
-        scan_resource,
-        scanners=scanners,
-        timeout=timeout,
-        with_timing=with_timing,
-        with_threading=use_threading
-    )
+    use_batches = batch and processes >= 1
+
+    if use_batches:
+        scan_func = scan_resources
+    else:
+        scan_func = scan_resource
+
+    # list of tuples of (scanners, resources, cache) where cache is the
+    # ScanCache to add the scan results to or None
+    scan_tasks = [(scanners, resources, None)]
+    # list of (path, scan results) reused from a previous scan
+    previous_results = []
+    if scan_cache or previous_scan:
+        content_scanners = [s for s in scanners if s.content_addressable]
+        other_scanners = [s for s in scanners if not s.content_addressable]
+        resources = list(resources)
+        content_resources = resources
+        if previous_scan:
+            content_resources, previous_results = previous_scan.get_changed_resources(
+                location_paths=resources,
+                codebase=codebase,
+            )
+        if scan_cache:
+            content_resources = scan_cache.get_unique_resources(content_resources)
+        scan_tasks = [(content_scanners, content_resources, scan_cache)]
+        if other_scanners:
+            scan_tasks.append((other_scanners, resources, None))
 
     if TRACE:
         logger_debug('scan_codebase: scanners:', ', '.join(s.name for s in scanners))
@@ -1259,22 +1671,58 @@ def scan_codebase(
     get_resource = codebase.get_resource
 
     success = True
+    worker_pool = pool
     pool = None
     scans = None
     try:
-        if processes >= 1:
+        if processes >= 1 and not worker_pool:
             # maxtasksperchild helps with recycling processes in case of leaks
             pool = get_pool(processes=processes, maxtasksperchild=1000)
-            # Using chunksize is documented as much more efficient in the Python
-            # doc. Yet "1" still provides a better and more progressive
-            # feedback. With imap_unordered, results are returned as soon as
-            # ready and out of order so we never know exactly what is processing
-            # until completed.
-            scans = pool.imap_unordered(runner, resources, chunksize=1)
+
+        all_scans = []
+        for task_scanners, task_resources, task_cache in scan_tasks:
+            runner = partial(
+                scan_func,
+                scanners=task_scanners,
+                timeout=timeout,
+                with_timing=with_timing,
+                with_threading=use_threading
+            )
+            if use_batches:
+                task_resources = get_batches(task_resources)
+
+            if processes >= 1 and worker_pool:
+                # a long-lived pool is recycled based on its memory usage and is
+                # neither closed nor terminated once done
+                task_scans = worker_pool.imap_unordered(runner, task_resources, chunksize=1)
+            elif processes >= 1:
+                # Using chunksize is documented as much more efficient in the
+                # Python doc. Yet "1" still provides a better and more
+                # progressive feedback. With imap_unordered, results are
+                # returned as soon as ready and out of order so we never know
+                # exactly what is processing until completed.
+                task_scans = pool.imap_unordered(runner, task_resources, chunksize=1)
+            else:
+                # no multiprocessing with processes=0 or -1
+                task_scans = map(runner, task_resources)
+
+            if use_batches:
+                task_scans = BatchedScans(task_scans)
+            if task_cache:
+                task_scans = CachedScans(task_scans, task_cache)
+            all_scans.append(task_scans)
+
+        if pool:
             pool.close()
-        else:
-            # no multiprocessing with processes=0 or -1
-            scans = map(runner, resources)
+
+        scans = chain.from_iterable(all_scans)
+
+        # the scan results of a file split in several scan tasks are not
+        # counted more than once in the progress
+        repeated_scans = []
+        if len(scan_tasks) > 1:
+            scans = ResourceScans(scans)
+            repeated_scans = scans.repeated
 
         if progress_manager:
             scans = progress_manager(scans)
@@ -1284,12 +1732,17 @@ def scan_codebase(
 
         while True:
             try:
+                if repeated_scans:
+                    scan = repeated_scans.pop()
+                else:
+                    scan = next(scans)
+
                 (location,
                  path,
                  scan_errors,
                  scan_time,
                  scan_result,
-                 scan_timings) = next(scans)
+                 scan_timings) = scan
 
                 if TRACE_DEEP:
                     logger_debug(
@@ -1320,30 +1773,41 @@ def scan_codebase(
                 # NOTE: here we effectively single threaded the saving a
                 # Resource to the cache! .... not sure this is a good or bad
                 # thing for scale. Likely not
-                # FIXME: should we instead store these in the Plugin resource_attributes?
-                # these should be matched
-                for key, value in scan_result.items():
-                    if not value:
-                        # the scan attribute will have a default value
-                        continue
-                    if key.startswith('extra_data.'):
-                        key = key.replace('extra_data.', '')
-                        resource.extra_data[key] = value
-                    else:
-                        setattr(resource, key, value)
+                set_scan_results(resource, scan_result)
                 codebase.save_resource(resource)
             except (TimeoutError, ScanCodeTimeoutError):
                 codebase.errors.append("Timeout waiting for resource. Path unknown.")
                 success = False
                 continue
             except StopIteration:
+                if repeated_scans:
+                    continue
                 break
             except KeyboardInterrupt:
                 echo_func('\nAborted with Ctrl+C!', fg='red')
                 success = False
                 terminate_pool(pool)
+                if worker_pool:
+                    worker_pool.terminate()
+                scan_cache = None
                 break
 
+        if scan_cache:
+            # fan out the results of the files scanned once to their duplicates
+            for path, scan_result, scan_errors in scan_cache.get_duplicate_results():
+                resource = get_resource(path=path)
+                if scan_errors:
+                    success = False
+                    resource.scan_errors.extend(scan_errors)
+                set_scan_results(resource, scan_result)
+                codebase.save_resource(resource)
+
+        # add the results of the files that did not change since a previous scan
+        for path, scan_result in previous_results:
+            resource = get_resource(path=path)
+            set_scan_results(resource, scan_result)
+            codebase.save_resource(resource)
+
     finally:
         # ensure the pool is really dead to work around a Python 2.7.3 bug:
         # http://bugs.python.org/issue15101
@@ -1355,6 +1819,24 @@ def scan_codebase(
     return success
 
 
+def set_scan_results(resource, scan_result):
+    """
+    Set the attributes of a ``resource`` Resource from a ``scan_result``
+    mapping of {attribute name: value}.
+    """
+    # FIXME: should we instead store these in the Plugin resource_attributes?
+    # these should be matched
+    for key, value in scan_result.items():
+        if not value:
+            # the scan attribute will have a default value
+            continue
+        if key.startswith('extra_data.'):
+            key = key.replace('extra_data.', '')
+            resource.extra_data[key] = value
+        else:
+            setattr(resource, key, value)
+
+
 def terminate_pool(pool):
     """
     Invoke terminate() on a process pool and deal with possible Windows issues.
@@ -1377,6 +1859,114 @@ def terminate_pool_with_backoff(pool, number_of_trials=3):
             sleep(trial)
 
 
+# Maximum number of files and maximum total size in bytes of the files of a
+# batch of files scanned together in a single parallel process task. A file
+# larger than MAX_BATCH_SIZE is scanned alone.
+MAX_BATCH_FILES = 100
+MAX_BATCH_SIZE = 512 * 1024
+
+
+def get_batches(
+    location_paths,
+    max_batch_files=MAX_BATCH_FILES,
+    max_batch_size=MAX_BATCH_SIZE,
+):
+    """
+    Yield lists of (location, path) tuples from a ``location_paths`` iterable of
+    (location, path) tuples. Small files are grouped in batches of up to
+    ``max_batch_files`` files and ``max_batch_size`` total bytes. Larger files
+    are yielded alone in their own batch.
+    """
+    batch = []
+    batch_size = 0
+    for location_path in location_paths:
+        try:
+            size = os.path.getsize(location_path[0])
+        except OSError:
+            # an unknown size is treated as a large file
+            size = max_batch_size
+
+        if size >= max_batch_size:
+            yield [location_path]
+            continue
+
+        if batch and (
+            len(batch) >= max_batch_files
+            or batch_size + size > max_batch_size
+        ):
+            yield batch
+            batch = []
+            batch_size = 0
+
+        batch.append(location_path)
+        batch_size += size
+
+    if batch:
+        yield batch
+
+
+def scan_resources(location_paths, **kwargs):
+    """
+    Return a list of scan_resource() tuples for each of a ``location_paths``
+    list of (location, path) tuples. ``kwargs`` are passed down to
+    scan_resource().
+    """
+    return [scan_resource(location_path, **kwargs) for location_path in location_paths]
+
+
+class BatchedScans:
+    """
+    Iterate over the scan_resource() tuples of a ``batches`` iterator of lists
+    of scan_resource() tuples one tuple at a time.
+
+    This is a class rather than a generator such that the iteration can
+    continue after an exception such as a timeout raised by ``batches``.
+    """
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.scans = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self.scans:
+            batch = next(self.batches)
+            self.scans = list(reversed(batch))
+        return self.scans.pop()
+
+
+class ResourceScans:
+    """
+    Iterate over a ``scans`` iterator of scan_resource() tuples and return
+    only the first tuple of each path. The next tuples of an already returned
+    path are appended to the ``repeated`` list for the caller to consume.
+
+    This is used to show progress once per file when the scanners of a file
+    are run in more than one scan task. This is a class rather than a
+    generator such that the iteration can continue after an exception such as
+    a timeout raised by ``scans``.
+    """
+
+    def __init__(self, scans):
+        self.scans = scans
+        self.seen_paths = set()
+        self.repeated = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            scan = next(self.scans)
+            path = scan[1]
+            if path not in self.seen_paths:
+                self.seen_paths.add(path)
+                return scan
+            self.repeated.append(scan)
+
+
 def scan_resource(
     location_path,
     scanners,
@@ -1419,33 +2009,37 @@ def scan_resource(
     # and start returning values. The kill timeout is otherwise there
     # as a gatekeeper for runaway processes.
 
-    # run each scanner in sequence in its own interruptible
-    for scanner in scanners:
-        if with_timing:
-            start = time()
+    from textcode.analysis import prepared_text
 
-        try:
-            # pass a deadline that the scanner can opt to honor or not
-            if timeout:
-                deadline = time() + int(timeout / 2.5)
-            else:
-                deadline = sys.maxsize
+    # run each scanner in sequence in its own interruptible. The text of the
+    # file is extracted once and shared by all the scanners.
+    with prepared_text(location):
+        for scanner in scanners:
+            if with_timing:
+                start = time()
 
-            runner = partial(scanner.function, location, path=path, deadline=deadline)
-            error, values_mapping = interruptor(runner, timeout=timeout)
-            if error:
-                msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + error
+            try:
+                # pass a deadline that the scanner can opt to honor or not
+                if timeout:
+                    deadline = time() + int(timeout / 2.5)
+                else:
+                    deadline = sys.maxsize
+
+                runner = partial(scanner.function, location, path=path, deadline=deadline)
+                error, values_mapping = interruptor(runner, timeout=timeout)
+                if error:
+                    msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + error
+                    scan_errors.append(msg)
+                # the return value of a scanner fun MUST be a mapping
+                if values_mapping:
+                    results.update(values_mapping)
+
+            except Exception:
+                msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + traceback.format_exc()
                 scan_errors.append(msg)
-            # the return value of a scanner fun MUST be a mapping
-            if values_mapping:
-                results.update(values_mapping)
-
-        except Exception:
-            msg = 'ERROR: for scanner: ' + scanner.name + ':\n' + traceback.format_exc()
-            scan_errors.append(msg)
-        finally:
-            if with_timing:
-                timings[scanner.name] = time() - start
+            finally:
+                if with_timing:
+                    timings[scanner.name] = time() - start
 
     scan_time = time() - scan_time
 
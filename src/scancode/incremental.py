@@ -0,0 +1,214 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import json
+import os
+
+from commoncode.hash import sha1
+
+"""
+Reuse the results of a previous JSON scan for the files that did not change
+since this previous scan, such that only new and modified files are scanned.
+
+A file is unchanged if a file with the same path, size and SHA1 exists in the
+previous scan. The file modification time is not used: it changes on each
+checkout and the previous scan only reports a date. The previous scan must
+therefore include file information (e.g., with the --info option) and must have
+been run with the same ScanCode version and scan options.
+
+Only the results of the "content-addressable" scanners are reused: these are
+scanners whose results depend only on the content and name of a file (such as
+licenses or copyrights). The other scanners (such as file info or package
+manifests) still run on every file, and all the post-scan plugins run on the
+whole codebase.
+"""
+
+TRACE = os.environ.get('SCANCODE_DEBUG_INCREMENTAL', False)
+
+
+def logger_debug(*args):
+    pass
+
+
+if TRACE:
+    import logging
+    import sys
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(stream=sys.stdout)
+    logger.setLevel(logging.DEBUG)
+
+    def logger_debug(*args):
+        return logger.debug(' '.join(isinstance(a, str) and a or repr(a) for a in args))
+
+
+class PreviousScan:
+    """
+    The file scan results of a previous JSON scan file at ``location`` to reuse
+    for the ``attributes`` list of Resource attribute names. The paths of this
+    previous scan are reported using the ``strip_root`` and ``full_root``
+    flags.
+    """
+
+    def __init__(self, location, attributes, strip_root=False, full_root=False):
+        self.location = location
+        self.attributes = list(attributes)
+        self.strip_root = strip_root
+        self.full_root = full_root
+
+        with open(location) as scan_file:
+            scan = json.load(scan_file)
+
+        self.headers = scan.get('headers') or []
+        # {path: file mapping} for the files of the previous scan
+        self.files_by_path = {
+            scan_file['path']: scan_file
+            for scan_file in scan.get('files') or []
+            if scan_file.get('type') == 'file'
+        }
+
+    def get_options_mismatch(self, tool_version, options):
+        """
+        Return a message string explaining why the results of this previous
+        scan cannot be reused with a ScanCode ``tool_version`` and an
+        ``options`` mapping of {CLI option: (value, default value)} or an empty
+        string if these results can be reused.
+
+        The ``options`` mapping should contain all the options that affect the
+        scan results, including the options with a default value as these are
+        not reported in the scan header.
+        """
+        if len(self.headers) != 1:
+            return 'the previous scan must have been run on a single input'
+
+        header = self.headers[0]
+        previous_version = header.get('tool_version')
+        if previous_version != tool_version:
+            return (
+                f'the previous scan was run with ScanCode version '
+                f'{previous_version!r} and not {tool_version!r}'
+            )
+
+        previous_options = header.get('options') or {}
+        for option, (value, default) in options.items():
+            previous_value = previous_options.get(option, default)
+            if get_option_value(previous_value) != get_option_value(value):
+                return f'the previous scan was run with other {option} option values'
+
+        return ''
+
+    def get_changed_resources(self, location_paths, codebase):
+        """
+        Return a tuple of:
+        - a list of (location, path) for the files to scan and
+        - a list of (path, scan results) for the unchanged files,
+        from a ``location_paths`` list of (location, path) tuples of files in a
+        ``codebase``.
+        """
+        files_by_path = self.files_by_path
+        changed = []
+        unchanged = []
+        for location, path in location_paths:
+            resource = codebase.get_resource(path)
+            previous_path = resource.get_path(
+                full_root=self.full_root,
+                strip_root=self.strip_root,
+            )
+            previous_file = files_by_path.get(previous_path)
+            if (
+                previous_file
+                and is_unchanged(location, previous_file)
+                and is_reusable(previous_file)
+            ):
+                unchanged.append((path, self.get_scan_results(previous_file)))
+            else:
+                changed.append((location, path))
+
+        if TRACE:
+            logger_debug(
+                'PreviousScan.get_changed_resources: changed:', len(changed),
+                'unchanged:', len(unchanged),
+            )
+        return changed, unchanged
+
+    def get_scan_results(self, previous_file):
+        """
+        Return a mapping of {attribute name: value} of the reused scan results
+        from a ``previous_file`` mapping.
+        """
+        results = {
+            name: previous_file[name]
+            for name in self.attributes
+            if name in previous_file
+        }
+
+        # the license post-scan sets the "from_file" of license matches to the
+        # path of their file, which is unset in the scan results
+        for detection in results.get('license_detections') or []:
+            for match in detection['matches']:
+                match['from_file'] = None
+        for match in results.get('license_clues') or []:
+            match['from_file'] = None
+
+        return results
+
+
+def get_option_value(value):
+    """
+    Return a comparable ``value`` of a CLI option as reported in the "options"
+    of a JSON scan header.
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [get_option_value(v) for v in value]
+    # files are reported by name
+    if hasattr(value, 'read'):
+        return getattr(value, 'name', '<file>')
+    return str(value)
+
+
+def is_unchanged(location, previous_file):
+    """
+    Return True if the file at ``location`` has the same size and SHA1 as a
+    ``previous_file`` scan mapping.
+    """
+    previous_sha1 = previous_file.get('sha1')
+    if not previous_sha1 or previous_file.get('scan_errors'):
+        return False
+    try:
+        if os.path.getsize(location) != previous_file.get('size'):
+            return False
+        return sha1(location) == previous_sha1
+    except OSError:
+        return False
+
+
+def is_reusable(previous_file):
+    """
+    Return True if the license scan results of a ``previous_file`` scan mapping
+    were not modified by a post-scan and can be reused.
+
+    License detections that reference other files (such as "see LICENSE") are
+    updated with the license detections of these files when the codebase is
+    post-processed and cannot be reused as-is: these files are scanned again.
+    """
+    license_detections = previous_file.get('license_detections')
+    if not license_detections:
+        return True
+
+    from licensedcode.cache import get_index
+    rules_by_id = get_index().rules_by_id
+
+    for detection in license_detections:
+        for match in detection['matches']:
+            rule = rules_by_id.get(match.get('rule_identifier'))
+            if not rule or rule.referenced_filenames:
+                return False
+    return True
@@ -47,7 +47,7 @@ WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 
-
+import os
 from multiprocessing import pool
 from multiprocessing import TimeoutError
 
@@ -89,3 +89,137 @@ pool.IMapUnorderedIterator.__next__ = pool.IMapUnorderedIterator.next
 
 def get_pool(processes=None, initializer=None, initargs=(), maxtasksperchild=None):
     return pool.Pool(processes, initializer, initargs, maxtasksperchild)
+
+
+class ScanWorkerPool:
+    """
+    A long-lived pool of scan worker processes that can be reused across
+    multiple scans, for instance with ``run_scan(pool=...)``.
+
+    Workers are not recycled after a fixed number of tasks: they keep their
+    loaded license index, copyright detector and package handlers warm between
+    scans. Instead, the whole pool is restarted between scans when a worker
+    process is no longer responsive or when a worker resident memory exceeds
+    ``max_worker_memory`` bytes (this is only checked on Linux).
+
+    Workers are forked from the current process when the pool is (re)started
+    and inherit everything already loaded at that time. An optional
+    ``initializer`` callable is called with ``initargs`` in each new worker.
+    """
+
+    def __init__(
+        self,
+        processes=None,
+        initializer=None,
+        initargs=(),
+        max_worker_memory=None,
+        health_check_timeout=30,
+    ):
+        self.processes = processes
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_worker_memory = max_worker_memory
+        self.health_check_timeout = health_check_timeout
+        self.restarts = 0
+        self._pool = None
+        self.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.terminate()
+
+    def start(self):
+        """
+        Start the worker processes unless already started.
+        """
+        if not self._pool:
+            self._pool = get_pool(
+                processes=self.processes,
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+
+    def terminate(self):
+        """
+        Stop the worker processes immediately.
+        """
+        if self._pool:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def restart(self):
+        self.terminate()
+        self.start()
+        self.restarts += 1
+
+    def get_worker_pids(self):
+        """
+        Return a list of the worker process ids.
+        """
+        if not self._pool:
+            return []
+        return [p.pid for p in self._pool._pool if p.pid]
+
+    def is_healthy(self):
+        """
+        Return True if all the worker processes are alive and the pool processes
+        a no-op task in time.
+        """
+        if not self._pool:
+            return False
+        if not all(p.is_alive() for p in self._pool._pool):
+            return False
+        try:
+            self._pool.apply_async(_ping).get(timeout=self.health_check_timeout)
+        except Exception:
+            return False
+        return True
+
+    def needs_recycling(self):
+        """
+        Return True if any worker process uses more resident memory than
+        ``max_worker_memory``.
+        """
+        if not self.max_worker_memory:
+            return False
+        return any(
+            get_rss(pid) > self.max_worker_memory
+            for pid in self.get_worker_pids()
+        )
+
+    def check(self):
+        """
+        Ensure that the pool is ready to run a new scan, restarting unhealthy or
+        memory-hungry worker processes.
+        """
+        if not self.is_healthy() or self.needs_recycling():
+            self.restart()
+
+    def imap_unordered(self, func, iterable, chunksize=1):
+        """
+        Return an iterator of ``func`` results applied to each item of the
+        ``iterable`` as in ``multiprocessing.Pool.imap_unordered``. Check the
+        pool health first.
+        """
+        self.check()
+        return self._pool.imap_unordered(func, iterable, chunksize=chunksize)
+
+
+def _ping():
+    return True
+
+
+def get_rss(pid):
+    """
+    Return the resident memory size in bytes of the process with ``pid`` or 0
+    if this cannot be determined.
+    """
+    try:
+        with open(f'/proc/{pid}/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
@@ -0,0 +1,306 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+
+from commoncode.hash import sha256
+
+"""
+A content-addressed cache of scan results such that files with the same content
+are scanned only once.
+
+Only the "content-addressable" scanners are cached: these are scanners whose
+results depend only on the content and name of a file (such as licenses or
+copyrights) and not on its path or other file system attributes (such as file
+info or package manifests). The file name matters as file type detection uses
+file extensions. A few traits of the full path of a file also change how its
+text is extracted and are part of the key too.
+
+Scan results are keyed by the SHA256 of a file content, the file name, the file
+path traits and a signature of the scanners and their options, the ScanCode
+version and the license index. They are kept in memory for a scan run and optionally saved in
+an SQLite database to reuse them in later scans.
+"""
+
+TRACE = os.environ.get('SCANCODE_DEBUG_SCAN_CACHE', False)
+
+
+def logger_debug(*args):
+    pass
+
+
+if TRACE:
+    import logging
+    import sys
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(stream=sys.stdout)
+    logger.setLevel(logging.DEBUG)
+
+    def logger_debug(*args):
+        return logger.debug(' '.join(isinstance(a, str) and a or repr(a) for a in args))
+
+
+class ScanCache:
+    """
+    Cache the scan results of the content-addressable ``scanners`` keyed by
+    file content. Also save these in the SQLite database file at ``location``
+    if provided.
+    """
+
+    def __init__(self, scanners, location=None):
+        self.signature = get_scanners_signature(scanners)
+
+        # {path: (sha256, name, traits)} for files that are either scanned or
+        # duplicated
+        self.key_by_path = {}
+        # paths of the files that are scanned once for a content
+        self.scanned_paths = set()
+        # {(sha256, name, traits): (scan results, scan errors)}
+        self.results_by_key = {}
+
+        self.db = None
+        if location:
+            self.db = sqlite3.connect(location)
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS scans ('
+                'checksum TEXT, name TEXT, traits TEXT, signature TEXT, results TEXT, '
+                'PRIMARY KEY (checksum, name, traits, signature))'
+            )
+
+    def close(self):
+        if self.db:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+    def get_unique_resources(self, location_paths):
+        """
+        Return a list of (location, path) tuples to scan from a
+        ``location_paths`` iterable of (location, path) tuples such that only
+        one file is returned for each distinct content not yet cached. The other
+        files results are available from get_duplicate_results() once the
+        returned files are scanned and added with add().
+        """
+        location_paths = list(location_paths)
+
+        if self.db:
+            # all files need a checksum to lookup the saved results
+            candidates = location_paths
+            unique = []
+        else:
+            # a file with a unique size has a unique content in this scan
+            # and there is no need to compute its checksum
+            candidates, unique = get_same_size_resources(location_paths)
+
+        scannable = []
+        for location, path in candidates:
+            try:
+                checksum = sha256(location)
+            except OSError:
+                checksum = None
+
+            if not checksum:
+                unique.append((location, path))
+                continue
+
+            key = checksum, os.path.basename(path), get_path_traits(location)
+            seen = key in self.results_by_key
+            self.key_by_path[path] = key
+            if seen:
+                continue
+
+            saved = self.get_saved_results(key)
+            if saved is not None:
+                self.results_by_key[key] = saved, []
+            else:
+                # None is a marker for results not yet available
+                self.results_by_key[key] = None
+                self.scanned_paths.add(path)
+                scannable.append((location, path))
+
+        if TRACE:
+            logger_debug(
+                'ScanCache.get_unique_resources: files:', len(location_paths),
+                'to scan:', len(unique) + len(scannable),
+            )
+        return unique + scannable
+
+    def add(self, path, results, errors):
+        """
+        Add the scan ``results`` mapping and ``errors`` list of the file at
+        ``path``. Save these results if there are no errors.
+        """
+        if path not in self.scanned_paths:
+            return
+
+        key = self.key_by_path[path]
+        results = {
+            name: value for name, value in results.items()
+            if name not in FILE_ONLY_RESULTS
+        }
+        self.results_by_key[key] = results, errors
+
+        if self.db and not errors:
+            checksum, name, traits = key
+            self.db.execute(
+                'INSERT OR REPLACE INTO scans VALUES (?, ?, ?, ?, ?)',
+                (checksum, name, traits, self.signature, json.dumps(results)),
+            )
+
+    def get_saved_results(self, key):
+        """
+        Return a mapping of scan results saved for a ``key`` tuple of
+        (checksum, name, traits) or None.
+        """
+        if not self.db:
+            return
+        checksum, name, traits = key
+        row = self.db.execute(
+            'SELECT results FROM scans '
+            'WHERE checksum = ? AND name = ? AND traits = ? AND signature = ?',
+            (checksum, name, traits, self.signature),
+        ).fetchone()
+        if row:
+            return json.loads(row[0])
+
+    def get_duplicate_results(self):
+        """
+        Yield tuples of (path, scan results, scan errors) for the files that
+        were not scanned and reuse the results of another file or saved results.
+        A file gets an error if the scan of the file with the same content did
+        not return, such as on a timeout.
+        """
+        scanned_path_by_key = {
+            self.key_by_path[path]: path for path in self.scanned_paths
+        }
+        for path, key in self.key_by_path.items():
+            if path in self.scanned_paths:
+                continue
+            results_errors = self.results_by_key.get(key)
+            if results_errors:
+                results, errors = results_errors
+                # each file gets its own copy of the results
+                yield path, json.loads(json.dumps(results)), list(errors)
+            else:
+                scanned_path = scanned_path_by_key.get(key)
+                error = (
+                    'ERROR: no scan results: the scan of the file with the same '
+                    f'content: {scanned_path!r} did not complete.'
+                )
+                yield path, {}, [error]
+
+
+class CachedScans:
+    """
+    Iterate over a ``scans`` iterator of scan_resource() tuples and add the
+    scan results of each file to a ``scan_cache`` ScanCache.
+
+    This is a class rather than a generator such that the iteration can
+    continue after an exception such as a timeout raised by ``scans``.
+    """
+
+    def __init__(self, scans, scan_cache):
+        self.scans = scans
+        self.scan_cache = scan_cache
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        scan = next(self.scans)
+        _location, path, scan_errors, _scan_time, scan_result, _timings = scan
+        self.scan_cache.add(path=path, results=scan_result, errors=scan_errors)
+        return scan
+
+
+# scan results that are specific to a scanned file and are not reused for
+# other files with the same content
+FILE_ONLY_RESULTS = frozenset([
+    # license matching profile collected with --license-profile
+    'extra_data.license_profile',
+])
+
+
+def get_path_traits(location):
+    """
+    Return a string of the traits of a file ``location`` full path that change
+    how the text of this file is extracted, beyond its content and name.
+    """
+    from textcode.analysis import is_locale_path
+    return 'locale' if is_locale_path(location) else ''
+
+
+def get_same_size_resources(location_paths):
+    """
+    Return a tuple of two lists of (location, path) from a ``location_paths``
+    list of (location, path): files that have the same size as another file,
+    and files with a unique size.
+    """
+    by_size = defaultdict(list)
+    unique = []
+    for location, path in location_paths:
+        try:
+            size = os.path.getsize(location)
+        except OSError:
+            unique.append((location, path))
+            continue
+        by_size[size].append((location, path))
+
+    same_size = []
+    for resources in by_size.values():
+        if len(resources) == 1:
+            unique.extend(resources)
+        else:
+            same_size.extend(resources)
+    return same_size, unique
+
+
+def get_scanners_signature(scanners):
+    """
+    Return a signature string for a list of ``scanners`` Scanner and their
+    options, the ScanCode version and the license index cache.
+    """
+    from scancode_config import __version__
+
+    signature = [__version__, get_license_index_version()]
+    for scanner in scanners:
+        function = scanner.function
+        options = {}
+        # scanner functions are often partial() with options as keywords
+        while hasattr(function, 'func'):
+            options.update(function.keywords)
+            function = function.func
+        name = f'{function.__module__}.{function.__qualname__}'
+        options = sorted((k, repr(v)) for k, v in options.items())
+        signature.append([scanner.name, name, options])
+
+    signature = json.dumps(signature).encode('utf-8')
+    return hashlib.sha256(signature).hexdigest()
+
+
+def get_license_index_version():
+    """
+    Return a string identifying the current license index cache, or an empty
+    string if there is no cache yet.
+    """
+    from licensedcode.cache import LICENSE_INDEX_DIR
+    from licensedcode.cache import LICENSE_INDEX_FILENAME
+    from scancode_config import licensedcode_cache_dir
+
+    cache_file = os.path.join(licensedcode_cache_dir, LICENSE_INDEX_DIR, LICENSE_INDEX_FILENAME)
+    try:
+        stat = os.stat(cache_file)
+    except OSError:
+        return ''
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
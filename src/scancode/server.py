@@ -0,0 +1,308 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import io
+import json
+import os
+import socket
+import socketserver
+import traceback
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from commoncode import fileutils
+
+"""
+A local scan server that keeps the license index and a pool of scan worker
+processes loaded between scans, such that the startup cost of a scan is paid
+only once.
+
+The server listens on a localhost TCP port or on a Unix domain socket and uses
+a minimal HTTP/1.0 protocol:
+
+- ``GET /health`` returns a ``{"status": "ok"}`` JSON object.
+
+- ``POST /scan`` accepts a JSON object body with these keys:
+
+  - either ``location``: the path to a file or directory to scan,
+  - or ``text``: a text string to scan as the content of a single file,
+  - and ``options``: an optional mapping of scan options as accepted by
+    ``scancode.cli.run_scan()`` such as ``{"license": true}``. These override
+    the default options the server was started with. Only the scan, pre-scan,
+    post-scan, output filters and output control options are accepted: output,
+    cache and other options that use a file path are rejected.
+
+  The response is JSON Lines using the same layout as the ``--json-lines``
+  output: a first line with the scan headers, then one line per
+  codebase-level attribute, then one line for each file. This JSON Lines
+  response is sent once the scan is completed, including its post-scan steps:
+  the results of a file are not sent while the other files are still scanned.
+
+For example::
+
+    scancode --license --serve 127.0.0.1:8765
+    curl -d '{"location": "/some/dir"}' http://127.0.0.1:8765/scan
+
+Scans are processed one at a time, in the order they are received.
+"""
+
+DEFAULT_HOST = '127.0.0.1'
+
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handle scan requests using the ``server`` ScanServer options and pool.
+    """
+
+    def address_string(self):
+        # Unix domain sockets have no client address
+        return str(self.client_address and self.client_address[0] or 'local')
+
+    def log_message(self, format, *args):  # NOQA
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, code, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self.send_json(200, dict(status='ok'))
+        else:
+            self.send_json(404, dict(error=f'Unknown path: {self.path!r}'))
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/scan':
+            self.send_json(404, dict(error=f'Unknown path: {self.path!r}'))
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            scan_request = json.loads(self.rfile.read(length) or b'{}')
+            location, text, options = get_scan_request_args(scan_request)
+        except Exception as e:
+            self.send_json(400, dict(error=f'Invalid scan request: {e}'))
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+
+        # the JSON Lines output plugin writes to this text stream that is
+        # flushed to the client on each line
+        output = io.TextIOWrapper(
+            self.wfile,
+            encoding='utf-8',
+            line_buffering=True,
+            write_through=True,
+        )
+        try:
+            self.server.scan(
+                location=location,
+                text=text,
+                options=options,
+                output=output,
+            )
+        except Exception:
+            error = dict(error='ERROR: failed to scan:\n' + traceback.format_exc())
+            output.write(json.dumps(error))
+            output.write('\n')
+        finally:
+            output.flush()
+            # the wfile is owned by the handler and closed there
+            output.detach()
+
+
+def get_scan_request_args(scan_request):
+    """
+    Return a tuple of (location, text, options) from a ``scan_request`` mapping.
+    Raise an Exception if the request is not valid.
+    """
+    if not isinstance(scan_request, dict):
+        raise Exception('request must be a JSON object.')
+
+    location = scan_request.get('location')
+    text = scan_request.get('text')
+    if bool(location) == bool(text is not None):
+        raise Exception('exactly one of "location" or "text" is required.')
+
+    if location and not os.path.exists(location):
+        raise Exception(f'location: {location!r} does not exist.')
+
+    options = scan_request.get('options') or {}
+    if not isinstance(options, dict):
+        raise Exception('"options" must be a JSON object.')
+
+    request_options = get_request_options()
+    for name in options:
+        if name not in request_options:
+            raise Exception(f'option: {name!r} cannot be used in a request.')
+
+    return location, text, options
+
+
+# the groups of command line options that select the scans and filter or shape
+# the scanned files and results. The other groups (core, output formats,
+# documentation and misc.) are controlled by the server.
+REQUEST_OPTIONS_GROUPS = frozenset([
+    'pre-scan',
+    'primary scans',
+    'other scans',
+    'scan options',
+    'post-scan',
+    'output filters',
+    'output control',
+])
+
+# options that accept a file path but have a string type
+FILE_OPTIONS = frozenset([
+    'license_policy',
+])
+
+
+def get_request_options():
+    """
+    Return a set of the names of the scan options that can be used in a scan
+    request. Options that accept a file or directory path to read or write
+    such as output, cache and profile files are not accepted: the server would
+    otherwise read or write files at any location of a client's choice.
+    """
+    import click
+    from scancode.cli import scancode
+
+    request_options = set()
+    for param in scancode.params:
+        if getattr(param, 'help_group', None) not in REQUEST_OPTIONS_GROUPS:
+            continue
+        if isinstance(param.type, (click.Path, click.File)):
+            continue
+        if param.name in FILE_OPTIONS:
+            continue
+        request_options.add(param.name)
+    return request_options
+
+
+class ScanServerMixin:
+    """
+    Hold the state shared by all the scan requests: the default scan options and
+    a long-lived pool of scan worker processes.
+    """
+
+    def setup_scans(self, options, processes=1, quiet=True):
+        self.options = options
+        self.processes = processes
+        self.quiet = quiet
+        self.pool = None
+        if processes >= 1:
+            from scancode.pool import ScanWorkerPool
+            self.pool = ScanWorkerPool(processes=processes)
+
+    def scan(self, location=None, text=None, options=None, output=None):
+        """
+        Scan a file or directory ``location`` or a ``text`` string and write
+        results as JSON Lines to the ``output`` text stream.
+        """
+        from scancode.cli import run_scan
+
+        scan_options = dict(self.options)
+        scan_options.update(options or {})
+        scan_options.update(
+            processes=self.processes,
+            pool=self.pool,
+            quiet=True,
+            return_results=False,
+            output_json_lines=output,
+        )
+
+        if text is not None:
+            text_dir = fileutils.get_temp_dir(prefix='scancode-serve-')
+            location = os.path.join(text_dir, 'text.txt')
+            with open(location, 'w', encoding='utf-8') as tf:
+                tf.write(text)
+            # the temp dir name is meaningless: report only the file name
+            scan_options['strip_root'] = True
+            scan_options.pop('full_root', None)
+
+        try:
+            run_scan(input=location, **scan_options)
+        finally:
+            if text is not None:
+                fileutils.delete(text_dir)
+
+    def server_close(self):
+        super().server_close()
+        if self.pool:
+            self.pool.terminate()
+
+
+class TCPScanServer(ScanServerMixin, HTTPServer):
+    pass
+
+
+if hasattr(socket, 'AF_UNIX'):
+
+    class UnixScanServer(ScanServerMixin, socketserver.UnixStreamServer):
+
+        def server_bind(self):
+            socketserver.UnixStreamServer.server_bind(self)
+            self.server_name = self.server_address
+            self.server_port = 0
+
+        def server_close(self):
+            super().server_close()
+            fileutils.delete(self.server_address)
+
+
+def get_server(address, options=None, processes=1, quiet=True):
+    """
+    Return a scan server listening at ``address``: either a "HOST:PORT" or
+    ":PORT" TCP address or the path to a Unix domain socket file. Use
+    ``options`` as the default scan options and ``processes`` worker processes.
+    """
+    host, _, port = address.rpartition(':')
+    if port.isdigit() and (not host or '/' not in host):
+        server = TCPScanServer((host or DEFAULT_HOST, int(port)), ScanRequestHandler)
+    elif hasattr(socket, 'AF_UNIX'):
+        server = UnixScanServer(address, ScanRequestHandler)
+    else:
+        raise Exception(f'Invalid TCP scan server address: {address!r}')
+
+    server.setup_scans(options=options or {}, processes=processes, quiet=quiet)
+    return server
+
+
+def serve(address, options=None, processes=1, quiet=True, echo_func=None):
+    """
+    Run a scan server at ``address`` until interrupted. See get_server() for
+    arguments details.
+    """
+    # load the license index once in this process such that the forked worker
+    # processes inherit it
+    from licensedcode.cache import populate_cache
+    populate_cache()
+
+    server = get_server(
+        address=address,
+        options=options,
+        processes=processes,
+        quiet=quiet,
+    )
+    if echo_func and not quiet:
+        echo_func(f'Serving scans at: {address}', fg='green')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -52,6 +52,8 @@ class GeneratedCodeDetector(ScanPlugin):
     run_order = 50
     sort_order = 50
 
+    content_addressable = True
+
     options = [
         PluggableCommandLineOption(('--generated',),
             is_flag=True, default=False,
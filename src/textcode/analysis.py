@@ -12,6 +12,7 @@ import json
 import os
 import re
 import unicodedata
+from contextlib import contextmanager
 
 import chardet
 import typecode
@@ -48,6 +49,97 @@ if TRACE:
         return logger.debug(' '.join(isinstance(a, str) and a or repr(a) for a in args))
 
 
+class PreparedText:
+    """
+    Cache of the numbered text lines extracted from a single file such that the
+    text of a file is extracted only once even when it is used by multiple
+    scanners (e.g. license, copyright, email and URL scans). Each variant of the
+    extracted lines (e.g. with or without markup) is cached separately.
+    """
+
+    def __init__(self, location):
+        self.location = location
+        # mapping of {(demarkup, plain_text, start_line): [(line number, line)]}
+        self.numbered_lines_by_variant = {}
+
+    def numbered_text_lines(self, demarkup=False, plain_text=False, start_line=1):
+        """
+        Return a list of (line number, text line) tuples for this file or an
+        iterator of these tuples for a large file whose lines are not cached.
+        See numbered_text_lines() for arguments.
+        """
+        location = self.location
+        if demarkup and (plain_text or not markup.is_markup(location)):
+            # demarkup is a no-op on non-markup files: share the same lines
+            demarkup = False
+
+        if is_large_file(location):
+            # do not keep the text of very large files in memory
+            return _numbered_text_lines(
+                location=location,
+                demarkup=demarkup,
+                plain_text=plain_text,
+                start_line=start_line,
+            )
+
+        variant = demarkup, plain_text, start_line
+        numbered_lines = self.numbered_lines_by_variant.get(variant)
+        if numbered_lines is None:
+            numbered_lines = list(_numbered_text_lines(
+                location=location,
+                demarkup=demarkup,
+                plain_text=plain_text,
+                start_line=start_line,
+            ))
+            self.numbered_lines_by_variant[variant] = numbered_lines
+        return numbered_lines
+
+
+# Files larger than this size in bytes are "large files": their text lines are
+# not cached and they are matched for licenses in windows of limited size.
+LARGE_FILE_SIZE = 32 * 1024 * 1024
+
+
+def is_large_file(location, large_file_size=None):
+    """
+    Return True if ``location`` is the path to a file larger than
+    ``large_file_size`` bytes or LARGE_FILE_SIZE by default.
+    """
+    if not isinstance(location, str):
+        return False
+    if large_file_size is None:
+        large_file_size = LARGE_FILE_SIZE
+    try:
+        return os.path.getsize(location) > large_file_size
+    except OSError:
+        return False
+
+
+# The PreparedText of the file currently being scanned, if any.
+_prepared_text = None
+
+
+@contextmanager
+def prepared_text(location):
+    """
+    Context manager to extract the text of the file at ``location`` only once
+    while in this context: numbered_text_lines() calls for this ``location``
+    return cached lines. This is used to share the text of a file across all the
+    scanners of a file. For example::
+
+        with prepared_text(location):
+            licenses = get_licenses(location)
+            copyrights = get_copyrights(location)
+    """
+    global _prepared_text
+    previous = _prepared_text
+    _prepared_text = PreparedText(location)
+    try:
+        yield _prepared_text
+    finally:
+        _prepared_text = previous
+
+
 def numbered_text_lines(
     location,
     demarkup=False,
@@ -71,6 +163,35 @@ def numbered_text_lines(
 
     Note: For testing or building from strings, location can be a is a list of
     unicode line strings.
+
+    Note: within a prepared_text() context for this `location`, the lines are
+    extracted once and reused.
+    """
+    prepared = _prepared_text
+    if prepared and isinstance(location, str) and prepared.location == location:
+        return iter(prepared.numbered_text_lines(
+            demarkup=demarkup,
+            plain_text=plain_text,
+            start_line=start_line,
+        ))
+
+    return _numbered_text_lines(
+        location=location,
+        demarkup=demarkup,
+        plain_text=plain_text,
+        start_line=start_line,
+    )
+
+
+def _numbered_text_lines(
+    location,
+    demarkup=False,
+    plain_text=False,
+    start_line=1,
+):
+    """
+    Return an iterable of tuples of (line number, text line) from the file at
+    `location`. See numbered_text_lines() for details.
     """
     if not location:
         return iter([])
@@ -147,7 +268,7 @@ def numbered_text_lines(
             not location.endswith('package.json')
             and (
                 T.is_text_with_long_lines or T.is_compact_js
-                or T.filetype_file == 'data' or 'locale' in location
+                or T.filetype_file == 'data' or is_locale_path(location)
             )
         ):
 
@@ -334,9 +455,12 @@ def unicode_text_lines(location, decrlf=False):
 
 
 def _unicode_text_lines(location):
+    # read the file line by line rather than at once to keep the memory usage
+    # bounded. Lines are split on LF first and then on CR as with bytes.splitlines()
     with open(location, 'rb') as f:
-        for line in f.read().splitlines(True):
-            yield as_unicode(line)
+        for lf_line in f:
+            for line in lf_line.splitlines(True):
+                yield as_unicode(line)
 
 
 def unicode_text(location, decrlf=False):
@@ -348,6 +472,14 @@ def unicode_text(location, decrlf=False):
     return u' '.join(unicode_text_lines(location, decrlf=decrlf))
 
 
+def is_locale_path(location):
+    """
+    Return True if the file at location is likely a localization file based on
+    its path. The lines of these files are broken like long lines.
+    """
+    return 'locale' in location
+
+
 def is_source(location):
     """
     Return True if the file at location is source code, based on its file
@@ -7,13 +7,14 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import mmap
 import re
 import string
 
 """
 Extract raw ASCII strings from (possibly) binary strings.
-Both plain ASCII and UTF-16-LE-encoded (aka. wide) strings are extracted.
-The later is found typically in some Windows PEs.
+Both plain ASCII and UTF-16-LE or UTF-16-BE-encoded (aka. wide) strings are
+extracted. The later are found typically in some Windows PEs.
 
 This is more or less similar to what GNU Binutils strings does.
 
@@ -36,18 +37,62 @@ MIN_LEN_STR = b'4'
 def strings_from_file(location, buff_size=1024 * 1024, clean=True, min_len=MIN_LEN):
     """
     Yield unicode strings made only of printable ASCII characters found in file
-    at `location``. Process the file in chunks of `buff_size` bytes (to limit
-    memory usage).
+    at `location``. Process the memory-mapped file in chunks of `buff_size`
+    bytes (to limit memory usage). Strings are not split across chunks, unless
+    they are longer than a chunk.
     """
     with open(location, 'rb') as f:
-        while 1:
-            buf = f.read(buff_size)
-            if not buf:
+        try:
+            # map the file in memory rather than reading it in chunks
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # empty files and some special files cannot be mapped
+            data = f.read()
+
+        try:
+            for match in get_string_matches(data, buff_size=buff_size):
+                for s in strings_from_match(match, clean=clean, min_len=min_len):
+                    s = s.strip()
+                    if len(s) >= min_len:
+                        yield s
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def get_string_matches(data, buff_size=1024 * 1024):
+    """
+    Yield regex match objects for the strings found in the ``data`` bytes-like
+    object (such as an mmap) processed in chunks of ``buff_size`` bytes.
+
+    A string found at the end of a chunk may continue in the next chunk: it is
+    searched again from its start with the next chunk such that strings are not
+    split across chunks, unless a string is longer than a whole chunk.
+    """
+    size = len(data)
+    # a string that is not yet long enough to match at the end of a chunk
+    # started in these last few bytes of a chunk
+    overlap = 2 * MIN_LEN
+    # chunks must be larger than the overlap to progress
+    buff_size = max(buff_size, 2 * overlap)
+    start = 0
+    while start < size:
+        end = min(start + buff_size, size)
+        is_last_chunk = end == size
+        next_start = max(start, end - overlap)
+
+        for match in ascii_strings(data, start, end):
+            match_start, match_end = match.span()
+            if not is_last_chunk and match_end > end - overlap and match_start > start:
+                # this string may continue in the next chunk
+                next_start = match_start
                 break
-            for s in strings_from_string(buf, clean=clean, min_len=min_len):
-                s = s.strip()
-                if len(s) >= min_len:
-                    yield s
+            yield match
+            next_start = max(next_start, match_end)
+
+        if is_last_chunk:
+            break
+        start = next_start
 
 
 # Extracted text is digit, letters, punctuation and white spaces
@@ -72,6 +117,12 @@ _ascii_pattern = (
 
 ascii_strings = re.compile(_ascii_pattern).finditer
 
+# set of printable byte values
+printable_bytes = frozenset(
+    byte for byte in range(256)
+    if re.match(b'[' + printable + b']', bytes([byte]))
+)
+
 replace_literal_line_returns = re.compile(
     '[\\n\\r]+$'
 ).sub
@@ -93,20 +144,66 @@ def strings_from_string(binary_string, clean=False, min_len=0):
     where a string was found (e.g. match.start).
     """
     for match in ascii_strings(binary_string):
-        s = decode(match.group())
-        if not s:
+        yield from strings_from_match(match, clean=clean, min_len=min_len)
+
+
+def strings_from_match(match, clean=False, min_len=0):
+    """
+    Yield strings extracted from an `ascii_strings` regex ``match``. See
+    strings_from_string() for details.
+    """
+    s = decode(get_match_bytes(match))
+    if not s:
+        return
+
+    if '\n' in s or '\r' in s:
+        lines = normalize_line_ends(s).splitlines(False)
+    else:
+        lines = [s]
+
+    for line in lines:
+        line = line.strip()
+        if len(line) < min_len:
             continue
-        s = normalize_line_ends(s)
-        for line in s.splitlines(False):
-            line = line.strip()
-            if len(line) < min_len:
-                continue
 
-            if clean:
-                for ss in clean_string(line, min_len=min_len):
-                    yield ss
-            else:
-                yield line
+        if clean:
+            yield from clean_string(line, min_len=min_len)
+        else:
+            yield line
+
+
+def get_match_bytes(match, printable_bytes=printable_bytes):
+    """
+    Return the bytes of an `ascii_strings` regex ``match``.
+
+    A utf-16-be-encoded ASCII string is a sequence of null byte+ASCII and is
+    matched as a utf-16-le string shifted by one byte, without its last ASCII
+    when it is not followed by a null byte: in this case return the whole
+    utf-16-be string including its first null byte and its last ASCII.
+
+    For example:
+    >>> data = b'\\x00\\x00\\x00a\\x00b\\x00c\\x00d\\x00e\\x01'
+    >>> get_match_bytes(next(ascii_strings(data)))
+    b'\\x00a\\x00b\\x00c\\x00d\\x00e'
+    >>> data = b'a\\x00b\\x00c\\x00d\\x00\\x00\\x00'
+    >>> get_match_bytes(next(ascii_strings(data)))
+    b'a\\x00b\\x00c\\x00d\\x00'
+    """
+    s = match.group()
+    if not match.group(2):
+        return s
+
+    data = match.string
+    start, end = match.span()
+    if (
+        start
+        and data[start - 1] == 0
+        and end < len(data)
+        and data[end] in printable_bytes
+        and (end + 1 == len(data) or data[end + 1] not in printable_bytes)
+    ):
+        return data[start - 1:end + 1]
+    return s
 
 
 def string_from_string(binary_string, clean=False, min_len=0):
@@ -122,8 +219,9 @@ def decode(s):
     Return a decoded unicode string from s or None if the string cannot be decoded.
     """
     if b'\x00' in s:
+        encoding = 'utf-16-be' if s.startswith(b'\x00') else 'utf-16-le'
         try:
-            return s.decode('utf-16-le')
+            return s.decode(encoding)
         except UnicodeDecodeError:
             pass
     else:
@@ -144,17 +242,14 @@ def clean_string(s, min_len=MIN_LEN, junk=JUNK):
      * not made of only of digits, punctuations and whitespaces
     """
     s = s.strip()
-
-    def valid(st):
-        st = remove_junk('', st)
-        return (st and len(st) >= min_len
-                # ignore character repeats, e.g need more than two unique characters
-                and len(set(st.lower())) > 1
-                # ignore string made only of digits, spaces or punctuations
-                and not all(c in junk for c in st))
-
-    if valid(s):
-        yield s.strip()
+    st = remove_junk('', s)
+    if (st and len(st) >= min_len
+        # ignore character repeats, e.g need more than two unique characters
+        and len(set(st.lower())) > 1
+        # ignore string made only of digits, spaces or punctuations
+        and not junk.issuperset(st)
+    ):
+        yield s
 
 #####################################################################################
 # TODO: Strings classification
@@ -224,6 +224,23 @@ class TestTextPreparation(FileBasedTesting):
         result = list(copyrights.collect_candidate_lines(enumerate(lines, 1)))
         assert result == expected
 
+    def test_collect_candidate_lines_without_markers(self):
+        lines = ['int a = 1;', 'return a;', '']
+        assert list(copyrights.collect_candidate_lines(enumerate(lines, 1))) == []
+
+    def test_get_marked_line_indexes_finds_spaced_or_escaped_markers(self):
+        lines = [
+            'int a = 1;',
+            'something ( C) Foo',
+            'x = 1',
+            'Foo all rig-hts reser-ved.',
+            'see: h_t_t_p://foo',
+            'written by\tFoo',
+            r'\A9 Foo',
+            'return a;',
+        ]
+        assert sorted(copyrights.get_marked_line_indexes(lines)) == [1, 3, 4, 5, 6]
+
     def test_is_candidates_should_not_select_line_with_bare_full_year(self):
         line = '2012'
         line = prepare_text_line(line)
@@ -339,6 +356,33 @@ class TestCopyrightDetector(FileBasedTesting):
         ))
         assert results == expected
 
+    def test_compiled_lexer_labels_tokens_like_the_pygmars_lexer(self):
+        from pygmars import lex
+        from textcode.analysis import numbered_text_lines
+        location = self.get_test_loc('copyrights_basic/blender_debian-blender.copyright')
+        numbered_lines = list(numbered_text_lines(location))
+        values = [t.value for t in copyrights.get_tokens(numbered_lines)]
+        # repeat values to use cached labels
+        values = values + values
+
+        lexer = lex.Lexer(matchers=copyrights.PATTERNS)
+        expected = [t.label for t in lexer.lex_strings(values)]
+
+        compiled_lexer = copyrights.CompiledLexer(
+            matchers=copyrights.PATTERNS,
+            chunk_size=7,
+            cache_size=50,
+            with_stats=True,
+        )
+        results = [t.label for t in compiled_lexer.lex_strings(values)]
+        assert results == expected
+        assert len(compiled_lexer.matcher_index_by_value) <= 50
+
+        hits = sum(compiled_lexer.hits_by_matcher.values())
+        assert hits == len([label for label in expected if label])
+        unused = compiled_lexer.get_unused_matchers()
+        assert len(unused) == len(copyrights.PATTERNS) - len(compiled_lexer.hits_by_matcher)
+
 
 def check_full_detections(expected, test_file):
     """
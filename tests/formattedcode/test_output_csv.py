@@ -17,6 +17,7 @@ import pytest
 from commoncode.testcase import FileDrivenTesting
 
 from formattedcode.output_csv import flatten_scan
+from formattedcode.output_csv import get_csv_columns
 from scancode.cli_test_utils import run_scan_click
 from scancode.cli_test_utils import run_scan_plain
 from scancode_config import REGEN_TEST_FIXTURES
@@ -220,6 +221,83 @@ def test_flatten_scan_can_process_package_license_when_license_value_is_null():
     check_json(result, expected_file)
 
 
+def test_csv_stream_writes_the_same_rows_as_csv():
+    test_dir = test_env.get_test_loc('csv/srp')
+    result_file = test_env.get_temp_file('csv')
+    args = ['--copyright', test_dir, '--csv', result_file]
+    run_scan_click(args)
+
+    stream_result_file = test_env.get_temp_file('csv')
+    args = ['--copyright', test_dir, '--csv', stream_result_file, '--csv-stream']
+    run_scan_click(args)
+
+    fields, rows = load_csv(result_file)
+    stream_fields, stream_rows = load_csv(stream_result_file)
+    assert set(fields).issubset(stream_fields)
+
+    ignore_keys = ('date',)
+
+    def non_empty(row):
+        return {k: v for k, v in row.items() if v and k not in ignore_keys}
+
+    assert sorted(map(non_empty, stream_rows), key=lambda d: sorted(d.items())) == (
+        sorted(map(non_empty, rows), key=lambda d: sorted(d.items())))
+
+
+def test_csv_stream_writes_the_same_rows_as_csv_with_all_scans():
+    test_dir = test_env.get_test_loc('common/manifests')
+    result_file = test_env.get_temp_file('csv')
+    args = ['-clieu', '--package', test_dir, '--csv', result_file]
+    run_scan_click(args)
+
+    stream_result_file = test_env.get_temp_file('csv')
+    args = ['-clieu', '--package', test_dir, '--csv', stream_result_file, '--csv-stream']
+    run_scan_click(args)
+
+    fields, rows = load_csv(result_file)
+    stream_fields, stream_rows = load_csv(stream_result_file)
+    assert set(fields).issubset(stream_fields)
+    for key in ('license_expression', 'copyright', 'email', 'url', 'package__purl'):
+        assert any(row[key] for row in rows)
+
+    def non_empty(row):
+        return {k: v for k, v in row.items() if v}
+
+    assert [non_empty(row) for row in stream_rows] == [non_empty(row) for row in rows]
+
+
+def test_csv_stream_fails_on_unknown_columns():
+    from formattedcode.output_csv import CsvStreamColumnError
+    from formattedcode.output_csv import CsvStreamFilesWriter
+    output = io.StringIO()
+    writer = CsvStreamFilesWriter(codebase=None, output_file=output)
+    writer.write(dict(path='foo', type='file', emails=[], scan_errors=[]))
+    with pytest.raises(CsvStreamColumnError):
+        writer.write(dict(
+            path='bar',
+            type='file',
+            emails=[dict(email='a@b.com', start_line=1, end_line=1, domain='b.com')],
+            scan_errors=[],
+        ))
+
+
+def test_get_csv_columns_with_copyrights_and_packages():
+    scanned_file = dict(
+        path='foo',
+        type='file',
+        copyrights=[],
+        holders=[],
+        authors=[],
+        package_data=[],
+        scan_errors=[],
+    )
+    columns = get_csv_columns(scanned_file)
+    assert columns[:6] == ['path', 'type', 'scan_errors', 'copyright', 'start_line', 'end_line']
+    assert 'package__purl' in columns
+    assert 'package__components' not in columns
+    assert len(columns) == len(set(columns))
+
+
 @pytest.mark.scanslow
 def test_csv_tree():
     test_dir = test_env.get_test_loc('csv/tree/scan')
@@ -81,3 +81,104 @@ def test_scan_output_for_timestamp():
     header = result_json['headers'][0]
     assert 'start_timestamp' in header
     assert 'end_timestamp' in header
+
+
+def test_FastJSONEncoder_output_is_the_same_json():
+    import json
+    from formattedcode.output_json import FastJSONEncoder
+    value = {
+        'path': 'some/ünicode/path',
+        'size': 2 ** 70,
+        'scan_errors': [],
+        'extra_data': {1: 'non string key', 'nested': [1.5, None, True]},
+    }
+    for indent in (None, 2, 4):
+        encoder = FastJSONEncoder(indent=indent)
+        result = json.loads(encoder.encode(value))
+        expected = json.loads(json.JSONEncoder(indent=indent).encode(value))
+        assert result == expected
+        result = json.loads(''.join(encoder.iterencode(value)))
+        assert result == expected
+
+    value = {'path': 'ascii/path', 'files': [{'size': 1, 'errors': []}]}
+    for indent in (None, 2):
+        encoder = FastJSONEncoder(indent=indent)
+        assert encoder.encode(value) == json.JSONEncoder(indent=indent).encode(value)
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+def test_write_results_is_the_same_bytes_with_or_without_orjson(pretty, monkeypatch):
+    from commoncode.resource import VirtualCodebase
+    from formattedcode import output_json
+    scan = {
+        'headers': [{'tool_name': 'scancode-toolkit'}],
+        'files': [
+            {'path': 'ünï-文件', 'type': 'directory', 'extra_data': {1: 'x'}},
+            {'path': 'ünï-文件/a.c', 'type': 'file', 'size': 2 ** 70},
+            {'path': 'ünï-文件/b.c', 'type': 'file', 'scores': [1.5, None, True]},
+        ],
+    }
+    results = []
+    for orjson in (output_json.orjson, None):
+        monkeypatch.setattr(output_json, 'orjson', orjson)
+        codebase = VirtualCodebase(scan)
+        result_file = test_env.get_temp_file('json')
+        output_json.write_results(codebase, output_file=result_file, pretty=pretty)
+        with open(result_file, 'rb') as res:
+            results.append(res.read())
+
+    with_orjson, without_orjson = results
+    assert with_orjson == without_orjson
+    assert with_orjson.isascii()
+
+
+def test_FastJSONEncoder_writes_floats_like_json_dumps():
+    import json
+    from formattedcode.output_json import FastJSONEncoder
+    value = {
+        'path': 'a/b.c',
+        'scan_timings': {'small': 3.5e-05, 'large': 1e16, 'nan': float('nan')},
+    }
+    for indent in (None, 2):
+        encoder = FastJSONEncoder(indent=indent)
+        expected = json.dumps(value, indent=indent)
+        assert encoder.encode(value) == expected
+        assert ''.join(encoder.iterencode(value)) == expected
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+def test_write_results_writes_floats_like_json_dumps(pretty):
+    from commoncode.resource import VirtualCodebase
+    from formattedcode import output_json
+    scan = {
+        'headers': [{
+            'tool_name': 'scancode-toolkit',
+            'extra_data': {'small': 3.5e-05, 'large': 1e16},
+        }],
+        'files': [
+            {'path': 'a', 'type': 'directory'},
+            {'path': 'a/b.c', 'type': 'file'},
+        ],
+    }
+    codebase = VirtualCodebase(scan)
+    result_file = test_env.get_temp_file('json')
+    output_json.write_results(codebase, output_file=result_file, pretty=pretty)
+    with open(result_file, 'rb') as res:
+        result = res.read()
+    assert b'"small": 3.5e-05' in result
+    assert b'"large": 1e+16' in result
+
+
+def test_json_pretty_print_streams_files_one_at_a_time():
+    import json
+    from commoncode.resource import VirtualCodebase
+    from formattedcode.output_json import write_results
+    test_file = test_env.get_test_loc('json/simple-expected.jsonpp')
+    codebase = VirtualCodebase(test_file)
+    result_file = test_env.get_temp_file('json')
+    write_results(codebase, output_file=result_file, pretty=True)
+    with open(result_file) as res:
+        results = json.load(res)
+    with open(test_file) as exp:
+        expected = json.load(exp)
+    assert [f['path'] for f in results['files']] == [f['path'] for f in expected['files']]
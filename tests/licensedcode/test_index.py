@@ -17,7 +17,9 @@ from licensedcode import index
 from licensedcode import match_seq
 from licensedcode import models
 from licensedcode.legalese import build_dictionary_from_iterable
+from licensedcode.profiling import MatchProfile
 from licensedcode.query import Query
+from licensedcode.query import build_query_windows
 from licensedcode.spans import Span
 from licensedcode.tracing import get_texts
 from licensedcode_test_utils import mini_legalese
@@ -118,6 +120,17 @@ class TestIndexing(IndexTesting):
 
         assert sorted([t for i, t in enumerate(idx.tokens_by_tid) if i >= idx.len_legalese]) == xtbi
 
+    def test_get_rule_sort_key_sorts_like_rules(self):
+        rules = self.get_test_rules('index/bsd')
+        rules += [
+            create_rule_from_text_and_expression(text='the gpl', license_expression='gpl'),
+            create_rule_from_text_and_expression(text='the mit', license_expression='mit'),
+        ]
+        rules.reverse()
+        expected = [r.identifier for r in sorted(rules)]
+        results = [r.identifier for r in sorted(rules, key=index.get_rule_sort_key)]
+        assert results == expected
+
     def test_index_structures_with__add_rules(self):
         base = self.get_test_loc('index/tokens_count')
         keys = sorted(os.listdir(base))
@@ -242,6 +255,91 @@ class TestMatchNoTemplates(IndexTesting):
         assert match.qspan == Span(0, 13)
         assert match.ispan == Span(0, 13)
 
+    def test_match_with_profile_collects_stages_and_counters(self):
+        rule_text = 'Distribution and use in source and binary forms, with or without modification, are permitted under this license'
+        idx = MiniLicenseIndex([create_rule_from_text_and_expression(text=rule_text, license_expression='bsd')])
+        querys = 'The Distribution and use in source and forms, with or without modification, are permitted under this license.'
+
+        profile = MatchProfile()
+        result = idx.match(query_string=querys, profile=profile)
+        assert len(result) == 1
+        idx.match(query_string=querys, profile=profile)
+
+        assert profile.counts['queries'] == 2
+        assert profile.counts['seq matches'] == 2
+        assert profile.counts['match_blocks calls'] >= 2
+        for stage in ('query', 'hash', 'aho', 'spdx_lid', 'seq', 'refine', 'final refine'):
+            assert stage in profile.timings
+
+    def test_match_windows_is_the_same_as_match(self):
+        rule_text = 'licensed under the GPL, licensed under the GPL'
+        rule = models.Rule(license_expression='tst', text=rule_text)
+        idx = MiniLicenseIndex([rule])
+
+        query_loc = self.get_temp_file()
+        with open(query_loc, 'w') as qf:
+            for i in range(20):
+                qf.write(f'some {i} filler text\n' * 3)
+                qf.write('licensed under the GPL,\nlicensed under the GPL\n')
+
+        def get_results(matches):
+            return [
+                (m.rule.identifier, m.start_line, m.end_line, m.matched_text())
+                for m in matches
+            ]
+
+        expected = get_results(idx.match(location=query_loc))
+        assert len(expected) == 20
+
+        windows = list(build_query_windows(
+            location=query_loc,
+            idx=idx,
+            window_tokens=40,
+            overlap_tokens=10,
+        ))
+        assert len(windows) > 5
+
+        results = idx.match_windows(location=query_loc, window_tokens=40, overlap_tokens=10)
+        assert get_results(results) == expected
+
+    def test_match_windows_discards_matches_contained_in_a_match_of_another_window(self):
+        rule_text = (
+            'Permission is hereby granted free of charge to any person '
+            'obtaining a copy of this software and associated documentation files'
+        )
+        rules = [
+            models.Rule(license_expression='tst', text=rule_text),
+            models.Rule(
+                license_expression='tst-head',
+                text='Permission is hereby granted free of charge to any person',
+            ),
+            models.Rule(
+                license_expression='tst-tail',
+                text='copy of this software and associated documentation files',
+            ),
+        ]
+        idx = MiniLicenseIndex(rules)
+
+        query_loc = self.get_temp_file()
+        with open(query_loc, 'w') as qf:
+            for i in range(6):
+                qf.write(f'some {i} filler text\n' * 3)
+                qf.write('\n'.join(rule_text.split()) + '\n')
+
+        # the windows overlap by fewer tokens than the longest rule, like for a
+        # match with large gaps: a window sees the end of a match that starts in
+        # the previous window and matches it to a contained rule
+        results = idx.match_windows(location=query_loc, window_tokens=20, overlap_tokens=8)
+        results = [(m.rule.license_expression, m.start_line, m.end_line) for m in results]
+        assert results == [
+            ('tst-head', 4, 13),
+            ('tst', 27, 46),
+            ('tst-head', 50, 59),
+            ('tst', 73, 92),
+            ('tst', 96, 115),
+            ('tst-head', 119, 128),
+        ]
+
     def test_match_exact_from_string_twice_with_repeated_text(self):
         _text = u'licensed under the GPL, licensed under the GPL'
         #                0    1   2   3         4      5   6   7
@@ -9,11 +9,14 @@
 
 import os
 
+from intbitset import intbitset
+
 from commoncode.testcase import FileBasedTesting
 from licensedcode import index
 from licensedcode import match_aho
 from licensedcode import models
 from licensedcode import query
+from licensedcode.spans import Span
 
 
 TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
@@ -34,3 +37,37 @@ class TestMatchExact(FileBasedTesting):
         assert len(matches) == 1
         match = matches[0]
         assert match.matcher == match_aho.MATCH_AHO_EXACT
+        assert match.hispan == Span(
+            p for p in match.ispan
+            if idx.tids_by_rid[match.rule.rid][p] < idx.len_legalese
+        )
+
+    def test_index_hispans_by_rid_are_the_high_token_positions_of_rules(self):
+        rule_dir = self.get_test_loc('mach_aho/rtos_exact/')
+        idx = index.LicenseIndex(models.load_rules(rules_data_dir=rule_dir))
+        for rid, tids in enumerate(idx.tids_by_rid):
+            expected = [p for p, tid in enumerate(tids) if tid < idx.len_legalese]
+            assert list(idx.hispans_by_rid[rid]) == expected
+
+    def test_get_matched_spans_skips_matches_with_unmatchable_positions(self):
+        matchables = intbitset([2, 3, 4, 6, 7, 8, 9])
+        positions = [
+            (0, 2, 5, 0, 3),
+            (1, 1, 4, 0, 3),
+            (2, 4, 7, 0, 3),
+            (3, 6, 10, 1, 5),
+            (4, 8, 11, 0, 3),
+        ]
+        results = [
+            (rid, list(qspan), list(ispan)) for rid, qspan, ispan
+            in match_aho.get_matched_spans(positions, matchables)
+        ]
+        expected = [
+            (0, [2, 3, 4], [0, 1, 2]),
+            (3, [6, 7, 8, 9], [1, 2, 3, 4]),
+        ]
+        assert results == expected
+
+    def test_get_matched_spans_with_empty_matchables(self):
+        positions = [(0, 2, 5, 0, 3)]
+        assert list(match_aho.get_matched_spans(positions, intbitset())) == []
@@ -0,0 +1,69 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+from unittest import mock
+
+from commoncode.testcase import FileBasedTesting
+from intbitset import intbitset
+
+from licensedcode import cache
+from licensedcode import match_set
+from licensedcode.query import Query
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def get_all_rids(qset, idx):
+    return intbitset(range(len(idx.rules_by_rid)))
+
+
+class TestMatchSet(FileBasedTesting):
+    test_data_dir = TEST_DATA_DIR
+
+    def check_candidates_with_all_rules(self, query_loc, high_resemblance):
+        idx = cache.get_index()
+        qry = Query(location=query_loc, idx=idx)
+        query_runs = [qry.whole_query_run()] + list(qry.query_runs)
+
+        for query_run in query_runs:
+            candidates = match_set.compute_candidates(
+                query_run=query_run,
+                idx=idx,
+                matchable_rids=idx.approx_matchable_rids,
+                high_resemblance=high_resemblance,
+            )
+            # compare with candidates computed with every rule
+            with mock.patch('licensedcode.match_set.get_high_tids_rids', get_all_rids):
+                expected = match_set.compute_candidates(
+                    query_run=query_run,
+                    idx=idx,
+                    matchable_rids=idx.approx_matchable_rids,
+                    high_resemblance=high_resemblance,
+                )
+            assert candidates == expected
+
+    def test_compute_candidates_is_the_same_as_with_all_rules(self):
+        query_loc = self.get_test_loc('perf/test1.txt')
+        self.check_candidates_with_all_rules(query_loc, high_resemblance=False)
+
+    def test_compute_candidates_is_the_same_as_with_all_rules_with_high_resemblance(self):
+        query_loc = self.get_test_loc('perf/bsd-new_37.txt')
+        self.check_candidates_with_all_rules(query_loc, high_resemblance=True)
+
+    def test_get_high_tids_rids_returns_rules_with_a_query_high_token(self):
+        idx = cache.get_index()
+        qset = intbitset([0, 1, idx.len_legalese + 1])
+        rids = match_set.get_high_tids_rids(qset, idx)
+        expected = intbitset([
+            rid for rid, rule_set in enumerate(idx.sets_by_rid)
+            # false positive rules have no sets
+            if rule_set and (0 in rule_set or 1 in rule_set)
+        ])
+        assert rids == expected
@@ -61,6 +61,32 @@ class TestUnknownLicenses(FileBasedTesting):
 
         assert LicenseMatchFromResult.from_dict(match.to_dict())
 
+    def test_get_good_tokens_ngram_starts_is_the_same_as_is_good_tokens_ngram(self):
+        from licensedcode import tokenize
+        from licensedcode.match_unknown import get_good_tokens_ngram_starts
+        from licensedcode.match_unknown import is_good_tokens_ngram
+
+        len_legalese = 3
+        text = (
+            'Copyright 2021 foo. this license is a free license a b c d 1 2 3 '
+            'with the license permission granted granted granted permission '
+            'for any purpose a license is 12 13 permission is granted'
+        )
+        tokens = text.lower().replace('.', '').split()
+        tids_by_token = {'license': 0, 'permission': 1, 'granted': 2}
+        for token in tokens:
+            tids_by_token.setdefault(token, len(tids_by_token))
+        tids = [tids_by_token[t] for t in tokens]
+
+        expected = [
+            start for start, (toks_ngram, tids_ngram) in enumerate(zip(
+                tokenize.ngrams(tokens, 6), tokenize.ngrams(tids, 6)))
+            if is_good_tokens_ngram(toks_ngram, tids_ngram, len_legalese)
+        ]
+        assert expected
+        results = list(get_good_tokens_ngram_starts(tokens, tids, len_legalese, 6))
+        assert results == expected
+
     def test_unknown_licenses_works(self):
         test_dir = self.get_test_loc('match_unknown/unknown.txt', copy=True)
         result_file = self.get_temp_file('json')
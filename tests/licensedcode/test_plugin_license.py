@@ -31,6 +31,64 @@ def test_license_detection_api_works():
     assert detections
 
 
+def test_license_detection_store_rehydrates_detections_once():
+    from licensedcode.detection import detections_from_license_detection_mappings
+    from licensedcode.detection import LicenseDetectionStore
+    from licensedcode.detection import UniqueDetection
+    test_loc = test_env.get_test_loc('plugin_license/scan/ffmpeg-LICENSE.md')
+    mappings = get_licenses(location=test_loc)['license_detections']
+    assert mappings
+
+    store = LicenseDetectionStore()
+    store.add_mappings(license_detection_mappings=mappings, file_path='first')
+    detections = dict(store.detections_by_identifier)
+    store.add_mappings(license_detection_mappings=mappings, file_path='second')
+    assert store.detections_by_identifier == detections
+    assert len(store) == 2 * len(mappings)
+
+    all_detections = (
+        detections_from_license_detection_mappings(mappings, file_path='first')
+        + detections_from_license_detection_mappings(mappings, file_path='second')
+    )
+    expected = [
+        unique.to_dict(include_text=True)
+        for unique in UniqueDetection.get_unique_detections(all_detections)
+    ]
+    results = [
+        unique.to_dict(include_text=True)
+        for unique in UniqueDetection.get_unique_detections(store)
+    ]
+    assert results == expected
+    assert [
+        [region.path for region in unique.file_regions]
+        for unique in UniqueDetection.get_unique_detections(store)
+    ] == [['first', 'second']] * len(detections)
+
+
+def test_license_detection_plugin_with_license_profile():
+    import json
+    test_dir = test_env.get_test_loc('plugin_license/scan/e2fsprogs/', copy=True)
+    result_file = test_env.get_temp_file('json')
+    profile_file = test_env.get_temp_file('json')
+    args = [
+        '--license',
+        '--license-profile', profile_file,
+        '--json', result_file,
+        test_dir,
+    ]
+    run_scan_click(args)
+    with open(profile_file) as pf:
+        profile = json.load(pf)
+    assert profile['codebase']['counts']['queries']
+    assert 'query' in profile['codebase']['timings']
+    assert profile['files']
+    assert all('path' in f and 'timings' in f for f in profile['files'])
+
+    with open(result_file) as rf:
+        results = json.load(rf)
+    assert not any('license_profile' in f.get('extra_data', {}) for f in results['files'])
+
+
 def test_license_detection_plugin_works():
     test_dir = test_env.get_test_loc('plugin_license/scan/e2fsprogs/', copy=True)
     result_file = test_env.get_temp_file('json')
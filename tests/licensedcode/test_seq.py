@@ -7,6 +7,7 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import random
 from unittest.case import TestCase
 
 from licensedcode import seq
@@ -172,3 +173,50 @@ class TestSeq(TestCase):
             matchables=matchables,
         )
         assert tests == seq.Match(a=357, b=0, size=8)
+
+    def test_get_matching_runs(self):
+        a = [1, 2, 3, 9, 1, 2, 5, 3]
+        b = [0, 1, 2, 3, 1, 2]
+        b2j = {1: [1, 4], 2: [2, 5], 3: [3]}
+        len_good = 4
+        matchables = set(range(len(a)))
+        runs = seq.get_matching_runs(a, b, 0, len(a), b2j, len_good, matchables)
+        expected = [
+            (-3, 0, 1),
+            (-2, 0, 4),
+            (-2, 4, 1),
+            (-2, 4, 4),
+            (-1, 7, 3),
+        ]
+        assert runs == expected
+
+    def test_find_longest_run_clips_runs_to_range(self):
+        runs = [(-3, 0, 1), (-2, 0, 4), (-2, 4, 1), (-2, 4, 4), (-1, 7, 3)]
+        assert seq.find_longest_run(runs, 0, 8, 0, 6) == (0, 1, 3)
+        assert seq.find_longest_run(runs, 1, 8, 0, 6) == (1, 2, 2)
+        assert seq.find_longest_run(runs, 3, 8, 0, 3) == (4, 1, 2)
+        assert seq.find_longest_run(runs, 0, 8, 4, 5) == (0, 4, 1)
+        assert seq.find_longest_run(runs, 5, 7, 0, 6) == (5, 2, 1)
+        assert seq.find_longest_run(runs, 6, 7, 0, 6) == (6, 0, 0)
+
+    def test_match_blocks_is_the_same_as_match_blocks_reference(self):
+        rnd = random.Random(42)
+        for _ in range(5000):
+            len_tokens = rnd.randint(2, 12)
+            len_good = rnd.randint(1, len_tokens)
+            a = [rnd.randrange(len_tokens) for _ in range(rnd.randint(0, 60))]
+            b = [rnd.randrange(len_tokens) for _ in range(rnd.randint(0, 40))]
+            b2j = {}
+            for j, tid in enumerate(b):
+                # some high tokens in b may not be in the postings
+                if tid < len_good and rnd.random() < 0.9:
+                    b2j.setdefault(tid, []).append(j)
+            matchables = set(i for i in range(len(a)) if rnd.random() < 0.85)
+            a_start = rnd.randint(0, len(a))
+            a_end = rnd.randint(a_start, len(a))
+
+            expected = seq.match_blocks_reference(
+                a, b, a_start, a_end, b2j, len_good, matchables)
+            results = seq.match_blocks(
+                a, b, a_start, a_end, b2j, len_good, matchables)
+            assert results == expected
@@ -8,6 +8,7 @@
 #
 
 import os
+from unittest import mock
 
 import pytest
 
@@ -93,6 +94,234 @@ class LicenseIndexCacheTest(FileBasedTesting):
         )
         assert hash.sha1(cache_file) == idx_checksum_before
 
+    def test_LicenseCache_load_or_build_maps_token_ids_arrays(self):
+        licensedcode_cache_dir = self.get_temp_dir('index_cache')
+        scancode_cache_dir = self.get_temp_dir('index_metafiles')
+        licenses_data_dir = self.get_test_loc('cache/data/licenses', copy=True)
+        rules_data_dir = self.get_test_loc('cache/data/rules', copy=True)
+
+        built = cache.LicenseCache.load_or_build(
+            licensedcode_cache_dir=licensedcode_cache_dir,
+            scancode_cache_dir=scancode_cache_dir,
+            force=True,
+            timeout=10,
+            licenses_data_dir=licenses_data_dir,
+            rules_data_dir=rules_data_dir,
+        )
+        arrays_file = os.path.join(
+            licensedcode_cache_dir,
+            cache.LICENSE_INDEX_DIR,
+            cache.LICENSE_INDEX_ARRAYS_FILENAME,
+        )
+        assert os.path.exists(arrays_file)
+
+        expected_phases = [
+            'load licenses',
+            'load rules',
+            'tokenize rules',
+            'index rules',
+            'build licensing',
+            'save cache',
+        ]
+        assert list(built.timings) == expected_phases
+
+        loaded = cache.LicenseCache.load_or_build(
+            licensedcode_cache_dir=licensedcode_cache_dir,
+            scancode_cache_dir=scancode_cache_dir,
+            force=False,
+            timeout=10,
+            licenses_data_dir=licenses_data_dir,
+            rules_data_dir=rules_data_dir,
+        )
+        built_index = built.index
+        loaded_index = loaded.index
+        assert isinstance(loaded_index.tids_by_rid, cache.MappedTokenIds)
+        expected = [list(tids) for tids in built_index.tids_by_rid]
+        assert [list(tids) for tids in loaded_index.tids_by_rid] == expected
+
+        assert isinstance(loaded_index.sets_by_rid, cache.MappedTokenIdsSets)
+        assert list(loaded_index.sets_by_rid) == list(built_index.sets_by_rid)
+
+        assert isinstance(loaded_index.msets_by_rid, cache.MappedTokenIdsMultisets)
+        assert list(loaded_index.msets_by_rid) == list(built_index.msets_by_rid)
+
+        assert isinstance(loaded_index.high_postings_by_rid, cache.MappedHighPostings)
+
+        def as_lists(postings):
+            if postings is not None:
+                return {tid: list(positions) for tid, positions in postings.items()}
+
+        expected = [as_lists(postings) for postings in built_index.high_postings_by_rid]
+        results = [as_lists(postings) for postings in loaded_index.high_postings_by_rid]
+        assert results == expected
+
+    def test_LicenseCache_load_or_build_rebuilds_with_arrays_of_another_build(self):
+        licensedcode_cache_dir = self.get_temp_dir('index_cache')
+        scancode_cache_dir = self.get_temp_dir('index_metafiles')
+        licenses_data_dir = self.get_test_loc('cache/data/licenses', copy=True)
+        rules_data_dir = self.get_test_loc('cache/data/rules', copy=True)
+
+        built = cache.LicenseCache.load_or_build(
+            licensedcode_cache_dir=licensedcode_cache_dir,
+            scancode_cache_dir=scancode_cache_dir,
+            force=True,
+            timeout=10,
+            licenses_data_dir=licenses_data_dir,
+            rules_data_dir=rules_data_dir,
+        )
+        cache_file = os.path.join(
+            licensedcode_cache_dir,
+            cache.LICENSE_INDEX_DIR,
+            cache.LICENSE_INDEX_FILENAME,
+        )
+        # simulate arrays saved by another index build
+        index = built.index
+        index.tids_by_rid = index.tids_by_rid[:-1]
+        index.sets_by_rid = index.sets_by_rid[:-1]
+        index.msets_by_rid = index.msets_by_rid[:-1]
+        index.high_postings_by_rid = index.high_postings_by_rid[:-1]
+        cache.dump_index_arrays(index, cache.get_arrays_file(cache_file))
+
+        with pytest.raises(Exception):
+            cache.load_cache_file(cache_file)
+
+        rebuilt = cache.LicenseCache.load_or_build(
+            licensedcode_cache_dir=licensedcode_cache_dir,
+            scancode_cache_dir=scancode_cache_dir,
+            force=False,
+            timeout=10,
+            licenses_data_dir=licenses_data_dir,
+            rules_data_dir=rules_data_dir,
+        )
+        assert len(rebuilt.index.tids_by_rid) == len(rebuilt.index.rules_by_rid)
+        assert cache.load_cache_file(cache_file).arrays_checksum == rebuilt.arrays_checksum
+
+    def test_LicenseCache_load_or_build_reuses_cached_rule_tokens(self):
+        licensedcode_cache_dir = self.get_temp_dir('index_cache')
+        scancode_cache_dir = self.get_temp_dir('index_metafiles')
+        licenses_data_dir = self.get_test_loc('cache/data/licenses', copy=True)
+        rules_data_dir = self.get_test_loc('cache/data/rules', copy=True)
+        rule_tokens_file = os.path.join(
+            licensedcode_cache_dir, cache.LICENSE_RULE_TOKENS_FILENAME)
+
+        built = cache.LicenseCache.load_or_build(
+            licensedcode_cache_dir=licensedcode_cache_dir,
+            scancode_cache_dir=scancode_cache_dir,
+            force=True,
+            timeout=10,
+            licenses_data_dir=licenses_data_dir,
+            rules_data_dir=rules_data_dir,
+            processes=2,
+        )
+        tokenized_by_key = cache.load_rule_tokens_cache(rule_tokens_file)
+        assert len(tokenized_by_key) == len(built.index.rules_by_rid)
+
+        # a missing index is rebuilt without tokenizing any rule
+        os.remove(os.path.join(
+            licensedcode_cache_dir,
+            cache.LICENSE_INDEX_DIR,
+            cache.LICENSE_INDEX_FILENAME,
+        ))
+        with mock.patch.object(cache, '_tokenize_rule') as tokenize_rule:
+            rebuilt = cache.LicenseCache.load_or_build(
+                licensedcode_cache_dir=licensedcode_cache_dir,
+                scancode_cache_dir=scancode_cache_dir,
+                force=False,
+                timeout=10,
+                licenses_data_dir=licenses_data_dir,
+                rules_data_dir=rules_data_dir,
+            )
+        assert not tokenize_rule.called
+        expected = [list(tids) for tids in built.index.tids_by_rid]
+        assert [list(tids) for tids in rebuilt.index.tids_by_rid] == expected
+        expected = [r.key_phrase_spans for r in built.index.rules_by_rid]
+        assert [r.key_phrase_spans for r in rebuilt.index.rules_by_rid] == expected
+
+        # a forced reindex tokenizes all the rules again
+        with mock.patch.object(cache, '_tokenize_rule', wraps=cache._tokenize_rule) as tokenize_rule:
+            cache.LicenseCache.load_or_build(
+                licensedcode_cache_dir=licensedcode_cache_dir,
+                scancode_cache_dir=scancode_cache_dir,
+                force=True,
+                timeout=10,
+                licenses_data_dir=licenses_data_dir,
+                rules_data_dir=rules_data_dir,
+            )
+        assert tokenize_rule.call_count == len(tokenized_by_key)
+
+    def test_get_rule_tokens_key_depends_on_the_tokenizer_code(self):
+        from licensedcode.models import Rule
+        rule = Rule(text='some license text', license_expression='mit')
+        key = cache.get_rule_tokens_key(rule)
+        with mock.patch.object(cache, '_rule_tokenizer_checksum', 'other'):
+            assert cache.get_rule_tokens_key(rule) != key
+
+    def test_tokenize_rules_reports_the_identifier_of_an_invalid_rule(self):
+        from licensedcode.models import InvalidRule
+        from licensedcode.models import Rule
+        rule = Rule(
+            text='some {{license text',
+            license_expression='mit',
+            identifier='mit_9999.RULE',
+        )
+        with pytest.raises(InvalidRule, match='mit_9999.RULE'):
+            cache.tokenize_rules([rule])
+
+    def test_tokenize_rules_only_tokenizes_uncached_rules(self):
+        from licensedcode.models import Rule
+        rules = [
+            Rule(text='some {{license}} text', license_expression='mit'),
+            Rule(text='other license text', license_expression='gpl'),
+        ]
+        key = cache.get_rule_tokens_key(rules[1])
+        cached = (['cached'], {}, [])
+        results = cache.tokenize_rules(rules, cached_tokenized_by_key={key: cached})
+        assert results[key] == cached
+        tokens, _stopwords_by_pos, key_phrase_spans = results[cache.get_rule_tokens_key(rules[0])]
+        assert tokens == ['some', 'license', 'text']
+        assert [list(s) for s in key_phrase_spans] == [[1]]
+
+    def test_MappedRuleArrays_can_be_pickled(self):
+        import pickle
+        from array import array
+        from intbitset import intbitset
+
+        class Index:
+            tids_by_rid = [array('h', [1, 2, 3]), array('h'), array('h', [-1, 32000])]
+            sets_by_rid = [intbitset([1, 2, 3]), None, intbitset([32000])]
+            msets_by_rid = [{1: 1, 2: 1, 3: 1}, None, {32000: 1}]
+            high_postings_by_rid = [{1: array('h', [0])}, None, {}]
+
+        arrays_file = self.get_temp_file('arrays')
+        checksum = cache.dump_index_arrays(Index, arrays_file)
+        arrays = cache.IndexArrays(arrays_file, checksum=checksum)
+        mapped = cache.MappedTokenIds(arrays)
+        assert len(mapped) == 3
+        assert list(mapped[2]) == [-1, 32000]
+        unpickled = pickle.loads(pickle.dumps(mapped))
+        assert [list(t) for t in unpickled] == [list(t) for t in Index.tids_by_rid]
+
+        assert list(cache.MappedTokenIdsSets(arrays)) == Index.sets_by_rid
+        assert list(cache.MappedTokenIdsMultisets(arrays)) == Index.msets_by_rid
+        postings = cache.MappedHighPostings(arrays)
+        assert list(postings[0][1]) == [0]
+        assert postings[1] is None
+        assert postings[2] == {}
+
+    def test_IndexArrays_fails_with_checksum_of_another_build(self):
+        from array import array
+
+        class Index:
+            tids_by_rid = [array('h', [1, 2, 3])]
+            sets_by_rid = [None]
+            msets_by_rid = [None]
+            high_postings_by_rid = [None]
+
+        arrays_file = self.get_temp_file('arrays')
+        cache.dump_index_arrays(Index, arrays_file)
+        with pytest.raises(Exception):
+            cache.IndexArrays(arrays_file, checksum=b'0' * 32)
+
     def test_load_index_with_corrupted_index(self):
         test_file = self.get_temp_file('test')
         with open(test_file, 'w') as tf:
@@ -338,3 +338,49 @@ def test_license_package_multi_flavored():
     run_scan_click(args)
     test_loc = test_env.get_test_loc('license_detection/multi-flavor/jquery-form-3.51.0.expected.json')
     check_json_scan(test_loc, result_file, regen=REGEN_TEST_FIXTURES)
+
+
+def test_license_reference_to_unknown_package_complex_package_with_processes(monkeypatch):
+    from packagedcode import plugin_package
+    monkeypatch.setattr(plugin_package, 'MIN_PARALLEL_RESOURCES', 0)
+
+    test_dir = test_env.get_test_loc('license_detection/reference-to-package/google_appengine_sdk/')
+    result_file = test_env.get_temp_file('json')
+    args = [
+        '--license',
+        '--license-text',
+        '--license-text-diagnostics',
+        '--license-diagnostics',
+        '--package',
+        '--strip-root',
+        '--processes', '2',
+        '--verbose',
+        '--json', result_file,
+        test_dir,
+    ]
+    run_scan_click(args)
+    test_loc = test_env.get_test_loc('license_detection/reference-to-package/google_appengine_sdk.expected.json')
+    check_json_scan(test_loc, result_file, regen=False)
+
+
+def test_license_reference_to_unknown_package_paddlenlp_with_processes(monkeypatch):
+    from packagedcode import plugin_package
+    monkeypatch.setattr(plugin_package, 'MIN_PARALLEL_RESOURCES', 0)
+
+    test_dir = test_env.get_test_loc('license_detection/reference-to-package/paddlenlp/')
+    result_file = test_env.get_temp_file('json')
+    args = [
+        '--license',
+        '--license-text',
+        '--license-text-diagnostics',
+        '--license-diagnostics',
+        '--package',
+        '--strip-root',
+        '--processes', '2',
+        '--verbose',
+        '--json', result_file,
+        test_dir,
+    ]
+    run_scan_click(args)
+    test_loc = test_env.get_test_loc('license_detection/reference-to-package/paddlenlp.expected.json')
+    check_json_scan(test_loc, result_file, regen=False)
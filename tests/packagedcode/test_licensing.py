@@ -9,7 +9,12 @@
 
 from unittest import TestCase
 
+from packagedcode.licensing import build_license_statements_table
+from packagedcode.licensing import get_license_detections_and_expression
+from packagedcode.licensing import get_license_statements_cache
 from packagedcode.licensing import get_only_expression_from_extracted_license
+from packagedcode.licensing import LicenseStatementsCache
+from packagedcode.models import PackageData
 
 
 class TestLicensing(TestCase):
@@ -21,3 +26,71 @@ class TestLicensing(TestCase):
         assert get_only_expression_from_extracted_license('mit asasa or Apache-2.0') == 'mit OR apache-2.0'
         assert get_only_expression_from_extracted_license('') is None
         assert get_only_expression_from_extracted_license(None) is None
+
+    def test_get_license_detections_and_expression_is_cached(self):
+        statements_cache = get_license_statements_cache()
+        statements_cache.clear()
+        statements_cache.precomputed = {}
+
+        detections, expression = get_license_detections_and_expression('mit or Apache-2.0')
+        assert statements_cache.get_counts() == dict(hits=0, precomputed_hits=0, misses=1)
+
+        # callers update the detections in place
+        detections[0]['matches'][0]['from_file'] = 'package.json'
+
+        cached_detections, cached_expression = get_license_detections_and_expression('mit or Apache-2.0')
+        assert statements_cache.get_counts() == dict(hits=1, precomputed_hits=0, misses=1)
+        assert cached_expression == expression
+        assert cached_detections[0]['matches'][0]['from_file'] is None
+
+        get_license_detections_and_expression('mit or Apache-2.0', default_relation_license='OR')
+        assert statements_cache.get_counts() == dict(hits=1, precomputed_hits=0, misses=2)
+        statements_cache.clear()
+
+    def test_get_license_detections_and_expression_cache_replays_statement_updates(self):
+        statements_cache = get_license_statements_cache()
+        statements_cache.clear()
+        statements_cache.precomputed = {}
+
+        def get_statement():
+            return [dict(name='MIT', url=None, comments=None, distribution='repo')]
+
+        statement = get_statement()
+        get_license_detections_and_expression(statement, datasource_id='maven_pom')
+        assert statements_cache.get_counts() == dict(hits=0, precomputed_hits=0, misses=1)
+        # the Maven package data class removes empty license fields in place
+        assert statement == [dict(name='MIT')]
+
+        cached_statement = get_statement()
+        get_license_detections_and_expression(cached_statement, datasource_id='maven_pom')
+        assert statements_cache.get_counts() == dict(hits=1, precomputed_hits=0, misses=1)
+        assert cached_statement == statement
+        statements_cache.clear()
+
+    def test_license_statements_cache_is_bounded_and_uses_precomputed(self):
+        statements_cache = LicenseStatementsCache(maxsize=2, precomputed={'d': 4})
+        statements_cache.set('a', 1)
+        statements_cache.set('b', 2)
+        assert statements_cache.get('a') == 1
+        statements_cache.set('c', 3)
+        assert statements_cache.get('b') is None
+        assert statements_cache.get('a') == 1
+        assert statements_cache.get('c') == 3
+        assert statements_cache.get('d') == 4
+        assert statements_cache.get_counts() == dict(hits=3, precomputed_hits=1, misses=1)
+
+    def test_license_statements_table_is_used_for_package_data_of_any_datasource(self):
+        statements_cache = get_license_statements_cache()
+        statements_cache.clear()
+        statements_cache.precomputed = build_license_statements_table(statements=['MIT'])
+
+        for datasource_id in ('npm_package_json', 'pypi_sdist_pkginfo', 'maven_pom', None):
+            package_data = PackageData(
+                datasource_id=datasource_id,
+                extracted_license_statement='MIT',
+            )
+            _detections, expression = package_data.get_license_detections_and_expression()
+            assert expression == 'mit'
+
+        assert statements_cache.get_counts() == dict(hits=0, precomputed_hits=4, misses=0)
+        statements_cache.clear()
@@ -10,9 +10,12 @@
 import os
 from unittest.case import skipIf
 
+import attr
+from commoncode.resource import Codebase
 from commoncode.system import on_windows
 
 from packagedcode.plugin_package import get_installed_packages
+from packagedcode.plugin_package import run_resource_step
 from packages_test_utils import PackageTester
 from scancode.cli_test_utils import check_json_scan
 from scancode.cli_test_utils import run_scan_click
@@ -272,3 +275,40 @@ class TestPlugins(PackageTester):
         expected_file = self.get_test_loc('plugin/get_installed_packages-expected.json')
         results = list(get_installed_packages(test_dir))
         self.check_packages_data(results, expected_file, remove_uuid=True, regen=REGEN_TEST_FIXTURES)
+
+    def test_run_resource_step_with_processes_runs_in_worker_processes(self):
+        test_dir = self.get_temp_dir()
+        for dir_name in ('a', 'b', 'c'):
+            os.makedirs(os.path.join(test_dir, dir_name))
+            for file_name in ('f1', 'f2'):
+                with open(os.path.join(test_dir, dir_name, file_name), 'w') as f:
+                    f.write(file_name)
+
+        codebase = Codebase(
+            test_dir,
+            resource_attributes=dict(license_detections=attr.ib(default=attr.Factory(list))),
+        )
+        paths = [resource.path for resource in codebase.walk() if resource.is_file]
+        assert len(paths) == 6
+
+        run_resource_step(
+            codebase=codebase,
+            resource_step=add_worker_process_id,
+            attributes=('license_detections',),
+            paths=paths,
+            processes=2,
+            min_parallel_resources=2,
+        )
+
+        worker_pids = set()
+        for path in paths:
+            license_detections = codebase.get_resource(path).license_detections
+            assert len(license_detections) == 1
+            worker_pids.add(license_detections[0]['pid'])
+        assert os.getpid() not in worker_pids
+
+
+def add_worker_process_id(resource, codebase):
+    resource.license_detections = [dict(pid=os.getpid())]
+    codebase.save_resource(resource)
+    return True
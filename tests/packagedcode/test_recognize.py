@@ -11,7 +11,10 @@ import os
 
 from commoncode.testcase import FileBasedTesting
 
+from packagedcode import ALL_DATAFILE_HANDLERS
 from packagedcode import models
+from packagedcode.recognize import DatafileHandlersMatcher
+from packagedcode.recognize import get_datafile_handlers_matcher
 from packagedcode.recognize import recognize_package_data
 
 # TODO: this needs to be updated to use either a full scan of to use parse and assemble
@@ -202,3 +205,44 @@ class TestRecognize(FileBasedTesting):
         packages = recognize_package_data(test_file, system=True)
         assert packages
         assert isinstance(packages[0], models.PackageData)
+
+    def test_datafile_handlers_matcher_returns_all_path_pattern_matches_in_order(self):
+        from fnmatch import fnmatchcase
+
+        matcher = get_datafile_handlers_matcher(ALL_DATAFILE_HANDLERS)
+        locations = ['/tmp/foo/bar.txt', '/tmp/README', '/tmp/a/b/c/d.py']
+        for handler in ALL_DATAFILE_HANDLERS:
+            for pattern in handler.path_patterns:
+                locations.append('/tmp/' + pattern.replace('*', 'x/y').replace('?', 'z'))
+
+        for location in locations:
+            candidates = matcher.get_candidates(location)
+            positions = [ALL_DATAFILE_HANDLERS.index(h) for h in candidates]
+            assert positions == sorted(positions)
+            for handler in ALL_DATAFILE_HANDLERS:
+                if any(fnmatchcase(location, pat) for pat in handler.path_patterns):
+                    assert handler in candidates, (location, handler)
+
+    def test_datafile_handlers_matcher_excludes_non_matching_handlers(self):
+        matcher = get_datafile_handlers_matcher(ALL_DATAFILE_HANDLERS)
+        all_candidates = matcher.get_candidates('/tmp/foo/bar.txt')
+        package_json_candidates = matcher.get_candidates('/tmp/foo/package.json')
+        assert len(all_candidates) < len(ALL_DATAFILE_HANDLERS)
+        assert set(all_candidates).issubset(package_json_candidates)
+        assert any(h.datasource_id == 'npm_package_json' for h in package_json_candidates)
+
+    def test_datafile_handlers_matcher_matches_any_path_with_a_bare_star_pattern(self):
+
+        class AnyFileHandler(models.DatafileHandler):
+            datasource_id = 'any_file'
+            path_patterns = ('*',)
+
+        class PackageJsonHandler(models.DatafileHandler):
+            datasource_id = 'package_json'
+            path_patterns = ('*/package.json',)
+
+        matcher = DatafileHandlersMatcher([AnyFileHandler, PackageJsonHandler])
+        assert matcher.get_candidates('/tmp/foo/bar.txt') == [AnyFileHandler]
+        assert matcher.get_candidates('README') == [AnyFileHandler]
+        expected = [AnyFileHandler, PackageJsonHandler]
+        assert matcher.get_candidates('/tmp/foo/package.json') == expected
@@ -7,8 +7,15 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import os
 from unittest import TestCase
 
+import pytest
+from commoncode.resource import Codebase
+from commoncode.testcase import FileBasedTesting
+
+from packagedcode.utils import clear_rootfs_path_indexes
+from packagedcode.utils import get_rootfs_path_index
 from packagedcode.utils import normalize_vcs_url
 
 
@@ -128,3 +135,54 @@ class TestPackageUtils(TestCase):
         assert normalize_vcs_url(None) == None
         assert normalize_vcs_url('') == None
         assert normalize_vcs_url(' ') == None
+
+
+class TestRootfsPathIndex(FileBasedTesting):
+    test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+    def test_RootfsPathIndex_get_resources_and_get_resources_by_suffix(self):
+        test_dir = self.get_test_loc('debian/basic-rootfs', copy=True)
+        codebase = Codebase(test_dir)
+        root = codebase.root
+        index = get_rootfs_path_index(root_resource=root, codebase=codebase)
+        assert get_rootfs_path_index(root_resource=root, codebase=codebase) is index
+
+        expected = [
+            f'{root.path}/usr/share/doc/libncurses5/copyright',
+            f'{root.path}/usr/share/doc/libndp0/copyright',
+        ]
+        # resources are returned in walk order and missing paths are ignored
+        paths = [
+            f'{root.path}/usr/share/doc/libndp0/copyright',
+            f'{root.path}/usr/share/doc/foo/copyright',
+            f'{root.path}/usr/share/doc/libncurses5/copyright',
+        ]
+        results = [r.path for r in index.get_resources(paths, codebase)]
+        assert results == expected
+
+        suffixes = ('doc/libndp0/copyright', 'usr/share/doc/libncurses5/copyright')
+        results = [r.path for r in index.get_resources_by_suffix(suffixes, codebase)]
+        assert results == expected
+
+        results = [r.path for r in index.get_resources_by_suffix(('copyright',), codebase)]
+        assert results == expected
+
+        clear_rootfs_path_indexes(codebase)
+        assert get_rootfs_path_index(root_resource=root, codebase=codebase) is not index
+
+    def test_get_package_and_deps_clears_rootfs_path_indexes_on_errors(self):
+        from unittest import mock
+        from packagedcode import plugin_package
+        from packagedcode import utils
+
+        test_dir = self.get_test_loc('debian/basic-rootfs', copy=True)
+        codebase = Codebase(test_dir)
+
+        def failing_get_package_and_deps(codebase, **kwargs):
+            get_rootfs_path_index(root_resource=codebase.root, codebase=codebase)
+            raise Exception('failed')
+
+        with mock.patch.object(plugin_package, '_get_package_and_deps', failing_get_package_and_deps):
+            with pytest.raises(Exception):
+                plugin_package.get_package_and_deps(codebase)
+        assert id(codebase) not in utils._rootfs_path_indexes
@@ -113,6 +113,36 @@ def test_can_call_run_scan_as_a_function():
     assert not results['headers'][0]['errors']
 
 
+def test_run_scan_can_reuse_a_scan_worker_pool():
+    from scancode.cli import run_scan
+    from scancode.pool import ScanWorkerPool
+    test_dir = test_env.get_test_loc('license', copy=True)
+    with ScanWorkerPool(processes=2) as pool:
+        pids = pool.get_worker_pids()
+        for _ in range(2):
+            rc, results = run_scan(
+                test_dir,
+                license=True,
+                processes=2,
+                pool=pool,
+                return_results=True,
+            )
+            assert rc
+            assert len(results['files']) == 2
+        assert pool.get_worker_pids() == pids
+        assert not pool.restarts
+
+
+def test_scan_worker_pool_is_restarted_when_unhealthy():
+    from scancode.pool import ScanWorkerPool
+    with ScanWorkerPool(processes=1) as pool:
+        pool.terminate()
+        assert not pool.is_healthy()
+        pool.check()
+        assert pool.is_healthy()
+        assert pool.restarts == 1
+
+
 def test_run_scan_includes_outdated_in_extra():
     from scancode.cli import run_scan
     test_dir = test_env.get_test_loc('license', copy=True)
@@ -200,6 +230,124 @@ def test_scan_info_license_copyrights():
     check_json_scan(test_env.get_test_loc('info/all.expected.json'), result_file, regen=REGEN_TEST_FIXTURES)
 
 
+def test_scan_info_license_copyrights_with_batch():
+    test_dir = test_env.extract_test_tar('info/basic.tgz')
+    result_file = test_env.get_temp_file('json')
+    args = [
+        '--info', '--license', '--copyright', '--strip-root', '--batch', '-n', '2',
+        test_dir, '--json', result_file,
+    ]
+    run_scan_click(args)
+    check_json_scan(test_env.get_test_loc('info/all.expected.json'), result_file, regen=False)
+
+
+def test_scan_info_license_copyrights_with_dedupe():
+    test_dir = test_env.extract_test_tar('info/basic.tgz')
+    result_file = test_env.get_temp_file('json')
+    args = [
+        '--info', '--license', '--copyright', '--strip-root', '--dedupe', '-n', '2',
+        test_dir, '--json', result_file,
+    ]
+    run_scan_click(args)
+    check_json_scan(test_env.get_test_loc('info/all.expected.json'), result_file, regen=False)
+
+
+def test_scan_with_dedupe_shows_progress_once_per_file(monkeypatch):
+    test_dir = test_env.extract_test_tar('info/basic.tgz')
+    args = ['--info', '--copyright', '--verbose', '-n', '0', test_dir, '--json']
+
+    def get_scanned_lines(*options):
+        result_file = test_env.get_temp_file('json')
+        result = run_scan_click(args + [result_file, *options], monkeypatch=monkeypatch)
+        return sorted(line for line in result.output.splitlines() if 'Scanned: ' in line)
+
+    # the info and copyright scanners run in two scan tasks with --dedupe
+    expected = get_scanned_lines()
+    assert len(set(expected)) == 6
+    assert get_scanned_lines('--dedupe') == expected
+
+
+def test_scan_info_license_copyrights_with_scan_cache_reuses_saved_results():
+    import sqlite3
+    test_dir = test_env.extract_test_tar('info/basic.tgz')
+    scan_cache = test_env.get_temp_file('sqlite')
+    expected_file = test_env.get_test_loc('info/all.expected.json')
+    for _ in range(2):
+        result_file = test_env.get_temp_file('json')
+        args = [
+            '--info', '--license', '--copyright', '--strip-root',
+            '--scan-cache', scan_cache, test_dir, '--json', result_file,
+        ]
+        run_scan_click(args)
+        check_json_scan(expected_file, result_file, regen=False)
+
+    with sqlite3.connect(scan_cache) as db:
+        assert db.execute('SELECT count(*) FROM scans').fetchone()[0]
+
+
+def test_scan_info_license_copyrights_with_incremental_from_reuses_unchanged_files(monkeypatch):
+    from scancode.incremental import PreviousScan
+    test_dir = test_env.extract_test_tar('info/basic.tgz')
+    expected_file = test_env.get_test_loc('info/all.expected.json')
+    args = ['--info', '--license', '--copyright', '--strip-root', test_dir, '--json']
+    previous_file = test_env.get_temp_file('json')
+    run_scan_click(args + [previous_file])
+
+    changed_resources = []
+    get_changed_resources = PreviousScan.get_changed_resources
+
+    def spy(self, *args, **kwargs):
+        changed, unchanged = get_changed_resources(self, *args, **kwargs)
+        changed_resources.append((len(changed), len(unchanged)))
+        return changed, unchanged
+
+    monkeypatch.setattr(PreviousScan, 'get_changed_resources', spy)
+    result_file = test_env.get_temp_file('json')
+    run_scan_click(args + [result_file, '--incremental-from', previous_file])
+    check_json_scan(expected_file, result_file, regen=False)
+    # all the files are unchanged, but main.c is scanned again as its license
+    # detection references another file
+    assert changed_resources == [(1, 5)]
+
+
+def test_scan_with_incremental_from_scans_all_files_with_other_options(monkeypatch):
+    from scancode.incremental import PreviousScan
+    test_dir = test_env.extract_test_tar('info/basic.tgz')
+    previous_file = test_env.get_temp_file('json')
+    run_scan_click(['--info', '--copyright', test_dir, '--json', previous_file])
+
+    def fail(*args, **kwargs):
+        raise Exception('Previous scan should not be used')
+
+    monkeypatch.setattr(PreviousScan, 'get_changed_resources', fail)
+    result_file = test_env.get_temp_file('json')
+    args = [
+        '--info', '--copyright', '--strip-root', test_dir,
+        '--json', result_file, '--incremental-from', previous_file,
+    ]
+    result = run_scan_click(args)
+    assert 'Cannot reuse the results of the previous scan' in result.output
+
+
+def test_get_batches_groups_small_files_and_keeps_large_files_alone():
+    from scancode.cli import get_batches
+    test_dir = test_env.get_temp_dir()
+    sizes = dict(a=10, b=10, big=100, c=10, d=10, e=10)
+    location_paths = []
+    for name, size in sizes.items():
+        location = os.path.join(test_dir, name)
+        with open(location, 'w') as f:
+            f.write('x' * size)
+        location_paths.append((location, name))
+    location_paths.append((os.path.join(test_dir, 'missing'), 'missing'))
+
+    batches = get_batches(location_paths, max_batch_files=2, max_batch_size=50)
+    result = [[path for _, path in batch] for batch in batches]
+    # large files are sent right away, before the pending small files batch
+    expected = [['big'], ['a', 'b'], ['c', 'd'], ['missing'], ['e']]
+    assert result == expected
+
+
 def test_scan_noinfo_license_copyrights_with_root():
     test_dir = test_env.extract_test_tar('info/basic.tgz')
     result_file = test_env.get_temp_file('json')
@@ -283,6 +431,35 @@ def test_scan_license_should_not_fail_with_output_to_html_and_json():
     assert 'Object of type License is not JSON serializable' not in result.output
 
 
+def test_scan_with_multiple_outputs_writes_the_same_files_in_each_output():
+    test_dir = test_env.get_test_loc('dual_output_with_license', copy=True)
+    result_file_json = test_env.get_temp_file('json')
+    result_file_json_pp = test_env.get_temp_file('json')
+    result_file_json_lines = test_env.get_temp_file('jsonl')
+    result_file_html = test_env.get_temp_file('html')
+    args = ['--info', '--license', test_dir,
+            '--json', result_file_json,
+            '--json-pp', result_file_json_pp,
+            '--json-lines', result_file_json_lines,
+            '--html', result_file_html]
+    run_scan_click(args)
+
+    json_results = load_json_result(result_file_json)
+    json_pp_results = load_json_result(result_file_json_pp)
+    assert json_pp_results['files'] == json_results['files']
+    assert json_results['files']
+
+    with io.open(result_file_json_lines, encoding='utf-8') as res:
+        lines = [json.loads(line) for line in res]
+    json_lines_files = [f for line in lines for f in line.get('files', [])]
+    assert [f['path'] for f in json_lines_files] == [f['path'] for f in json_results['files']]
+
+    with io.open(result_file_html, encoding='utf-8') as res:
+        html = res.read()
+    for scanned_file in json_results['files']:
+        assert scanned_file['path'] in html
+
+
 def test_scan_should_not_fail_on_faulty_pdf_or_pdfminer_bug_but_instead_report_errors_and_keep_trucking_with_html_app():
     test_file = test_env.get_test_loc('failing/patchelf.pdf')
     result_file = test_env.get_temp_file('test.app.html')
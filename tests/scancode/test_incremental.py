@@ -0,0 +1,69 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import json
+import os
+
+from commoncode.hash import sha1
+from commoncode.testcase import FileDrivenTesting
+
+from scancode.incremental import PreviousScan
+from scancode.incremental import get_option_value
+from scancode.incremental import is_unchanged
+
+test_env = FileDrivenTesting()
+test_env.test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def create_previous_scan(files, options=None, tool_version='1.0'):
+    location = test_env.get_temp_file('json')
+    scan = dict(
+        headers=[dict(tool_version=tool_version, options=options or {})],
+        files=files,
+    )
+    with open(location, 'w') as f:
+        json.dump(scan, f)
+    return location
+
+
+def test_is_unchanged_checks_size_and_sha1():
+    location = test_env.get_temp_file()
+    with open(location, 'w') as f:
+        f.write('foo')
+
+    previous_file = dict(size=3, sha1=sha1(location), scan_errors=[])
+    assert is_unchanged(location, previous_file)
+    assert not is_unchanged(location, dict(previous_file, size=4))
+    assert not is_unchanged(location, dict(previous_file, sha1='0' * 40))
+    # scans without file info cannot be reused
+    assert not is_unchanged(location, dict(previous_file, sha1=None))
+    assert not is_unchanged(location, dict(previous_file, scan_errors=['failed']))
+
+
+def test_previous_scan_get_options_mismatch():
+    location = create_previous_scan(files=[], options={'--copyright': True, '--license-score': '10'})
+    previous_scan = PreviousScan(location=location, attributes=['copyrights'])
+
+    options = {
+        '--copyright': (True, False),
+        '--license-score': (10, 0),
+        '--email': (False, False),
+    }
+    assert previous_scan.get_options_mismatch('1.0', options) == ''
+    assert 'version' in previous_scan.get_options_mismatch('2.0', options)
+
+    options['--email'] = True, False
+    assert '--email' in previous_scan.get_options_mismatch('1.0', options)
+
+
+def test_get_option_value_is_comparable_with_json_scan_header_options():
+    assert get_option_value(True) is True
+    assert get_option_value(None) is None
+    assert get_option_value(10) == get_option_value('10')
+    assert get_option_value(('a', 'b')) == get_option_value(['a', 'b'])
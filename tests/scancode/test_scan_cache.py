@@ -0,0 +1,120 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+
+from commoncode.testcase import FileDrivenTesting
+
+from scancode import Scanner
+from scancode.scan_cache import ScanCache
+
+test_env = FileDrivenTesting()
+test_env.test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def fake_scanner(location, **kwargs):
+    return {}
+
+
+def create_files(contents_by_path):
+    test_dir = test_env.get_temp_dir()
+    location_paths = []
+    for path, content in contents_by_path.items():
+        location = os.path.join(test_dir, path)
+        os.makedirs(os.path.dirname(location), exist_ok=True)
+        with open(location, 'w') as f:
+            f.write(content)
+        location_paths.append((location, path))
+    return location_paths
+
+
+def test_scan_cache_scans_each_content_and_name_once():
+    location_paths = create_files({
+        'a/LICENSE': 'same',
+        'b/LICENSE': 'same',
+        'c/COPYING': 'same',
+        'd/LICENSE': 'diff',
+        'e/README': 'unique size',
+    })
+    cache = ScanCache(scanners=[Scanner('fake', fake_scanner, True)])
+    unique = cache.get_unique_resources(location_paths)
+    assert sorted(path for _, path in unique) == [
+        'a/LICENSE', 'c/COPYING', 'd/LICENSE', 'e/README',
+    ]
+
+    for _, path in unique:
+        cache.add(path, results=dict(scanned=path), errors=[])
+
+    expected = [('b/LICENSE', dict(scanned='a/LICENSE'), [])]
+    assert list(cache.get_duplicate_results()) == expected
+
+
+def test_scan_cache_reuses_saved_results_with_same_scanners():
+    location_paths = create_files({'a/LICENSE': 'foo', 'b/NOTICE': 'bar'})
+    db = test_env.get_temp_file('sqlite')
+    scanners = [Scanner('fake', fake_scanner, True)]
+
+    cache = ScanCache(scanners=scanners, location=db)
+    unique = cache.get_unique_resources(location_paths)
+    assert len(unique) == 2
+    cache.add('a/LICENSE', results=dict(foo=1), errors=[])
+    cache.add('b/NOTICE', results=dict(bar=1), errors=['failed'])
+    cache.close()
+
+    cache = ScanCache(scanners=scanners, location=db)
+    unique = cache.get_unique_resources(location_paths)
+    # results with errors are not saved
+    assert unique == location_paths[1:]
+    assert list(cache.get_duplicate_results()) == [('a/LICENSE', dict(foo=1), [])]
+    cache.close()
+
+    other_scanners = [Scanner('other', fake_scanner, True)]
+    cache = ScanCache(scanners=other_scanners, location=db)
+    assert len(cache.get_unique_resources(location_paths)) == 2
+    cache.close()
+
+
+def test_scan_cache_scans_same_content_and_name_with_other_path_traits():
+    location_paths = create_files({
+        'a/messages.txt': 'same',
+        'b/messages.txt': 'same',
+        'locale/fr/messages.txt': 'same',
+    })
+    cache = ScanCache(scanners=[Scanner('fake', fake_scanner, True)])
+    unique = cache.get_unique_resources(location_paths)
+    assert sorted(path for _, path in unique) == ['a/messages.txt', 'locale/fr/messages.txt']
+
+
+def test_scan_cache_does_not_reuse_license_profiles():
+    location_paths = create_files({'a/LICENSE': 'same', 'b/LICENSE': 'same'})
+    db = test_env.get_temp_file('sqlite')
+    cache = ScanCache(scanners=[Scanner('fake', fake_scanner, True)], location=db)
+    unique = cache.get_unique_resources(location_paths)
+    assert [path for _, path in unique] == ['a/LICENSE']
+    results = {'license_detections': [], 'extra_data.license_profile': {'timings': {}}}
+    cache.add('a/LICENSE', results=results, errors=[])
+    assert list(cache.get_duplicate_results()) == [('b/LICENSE', {'license_detections': []}, [])]
+    cache.close()
+
+    cache = ScanCache(scanners=[Scanner('fake', fake_scanner, True)], location=db)
+    assert cache.get_unique_resources(location_paths[:1]) == []
+    assert list(cache.get_duplicate_results()) == [('a/LICENSE', {'license_detections': []}, [])]
+    cache.close()
+
+
+def test_scan_cache_reports_an_error_for_duplicates_of_a_file_without_results():
+    location_paths = create_files({'a/LICENSE': 'same', 'b/LICENSE': 'same'})
+    cache = ScanCache(scanners=[Scanner('fake', fake_scanner, True)])
+    unique = cache.get_unique_resources(location_paths)
+    assert [path for _, path in unique] == ['a/LICENSE']
+    # a/LICENSE is never added, such as when its scan times out in the pool
+    [(path, results, errors)] = cache.get_duplicate_results()
+    assert path == 'b/LICENSE'
+    assert results == {}
+    assert "'a/LICENSE'" in errors[0]
@@ -0,0 +1,130 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# ScanCode is a trademark of nexB Inc.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/scancode-toolkit for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import json
+import os
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from commoncode.testcase import FileDrivenTesting
+
+from scancode.cli_test_utils import run_scan_click
+from scancode.server import get_scan_request_args
+from scancode.server import get_server
+
+test_env = FileDrivenTesting()
+test_env.test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+
+@pytest.fixture
+def scan_server_url():
+    # processes=-1 since signal-based timeouts are not available in a thread
+    server = get_server(address='127.0.0.1:0', options=dict(license=True), processes=-1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield f'http://{host}:{port}'
+    server.shutdown()
+    server.server_close()
+
+
+def post_scan(url, scan_request):
+    data = json.dumps(scan_request).encode('utf-8')
+    with urlopen(f'{url}/scan', data=data) as response:
+        return [json.loads(line) for line in response]
+
+
+def test_scan_server_health(scan_server_url):
+    with urlopen(f'{scan_server_url}/health') as response:
+        assert json.load(response) == {'status': 'ok'}
+
+
+def test_scan_server_can_scan_a_location_many_times(scan_server_url):
+    test_dir = test_env.get_test_loc('license', copy=True)
+    for _ in range(2):
+        lines = post_scan(scan_server_url, dict(location=test_dir))
+        assert 'headers' in lines[0]
+        files = [line['files'][0] for line in lines if 'files' in line]
+        paths = sorted(f['path'] for f in files)
+        assert paths == ['license', 'license/apache-1.0.txt']
+        assert files[1]['detected_license_expression'] == 'apache-1.0'
+
+
+def test_scan_server_can_scan_text_with_request_options(scan_server_url):
+    scan_request = dict(
+        text='Copyright (c) Example Corp.\nLicensed under the MIT license.',
+        options=dict(copyright=True),
+    )
+    lines = post_scan(scan_server_url, scan_request)
+    files = [line['files'][0] for line in lines if 'files' in line]
+    assert len(files) == 1
+    scanned = files[0]
+    assert scanned['path'] == 'text.txt'
+    assert scanned['detected_license_expression'] == 'mit'
+    assert scanned['copyrights'][0]['copyright'] == 'Copyright (c) Example Corp.'
+
+
+def test_scan_server_rejects_invalid_requests(scan_server_url):
+    with pytest.raises(HTTPError) as e:
+        post_scan(scan_server_url, dict(text='foo', location='bar'))
+    assert e.value.code == 400
+
+
+def test_get_scan_request_args_rejects_reserved_options():
+    with pytest.raises(Exception):
+        get_scan_request_args(dict(text='foo', options=dict(processes=4)))
+
+
+@pytest.mark.parametrize('option', [
+    'output_json',
+    'output_csv',
+    'custom_output',
+    'custom_template',
+    'scan_cache',
+    'incremental_from',
+    'license_profile',
+    'license_policy',
+    'unknown_option',
+])
+def test_get_scan_request_args_rejects_output_cache_and_file_options(option):
+    with pytest.raises(Exception):
+        get_scan_request_args(dict(text='foo', options={option: '/tmp/foo'}))
+
+
+def test_get_scan_request_args_accepts_scan_and_filter_options():
+    options = dict(copyright=True, license_text=True, ignore=['*.c'], only_findings=True)
+    _location, text, request_options = get_scan_request_args(dict(text='foo', options=options))
+    assert text == 'foo'
+    assert request_options == options
+
+
+def test_scan_server_can_scan_with_a_pool_of_worker_processes():
+    server = get_server(address='127.0.0.1:0', options=dict(license=True), processes=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        test_dir = test_env.get_test_loc('license', copy=True)
+        lines = post_scan(f'http://{host}:{port}', dict(location=test_dir))
+        files = [line['files'][0] for line in lines if 'files' in line]
+        assert sorted(f['path'] for f in files) == ['license', 'license/apache-1.0.txt']
+        scanned = [f for f in files if f['type'] == 'file'][0]
+        assert scanned['detected_license_expression'] == 'apache-1.0'
+        assert not scanned['scan_errors']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_serve_option_cannot_be_used_with_an_input():
+    test_dir = test_env.get_test_loc('license')
+    result = run_scan_click(['--serve', ':0', test_dir], expected_rc=2)
+    assert 'The --serve option cannot be used with an <input>.' in result.output
@@ -17,8 +17,10 @@ from commoncode.fileutils import resource_iter
 from commoncode.testcase import FileBasedTesting
 
 from scancode_config import REGEN_TEST_FIXTURES
+from textcode import analysis
 from textcode.analysis import as_unicode
 from textcode.analysis import numbered_text_lines
+from textcode.analysis import prepared_text
 from textcode.analysis import unicode_text_lines
 
 
@@ -163,3 +165,51 @@ class TestAnalysis(FileBasedTesting):
         from_string = list(numbered_text_lines(location=text.splitlines(True)))
         assert from_string == from_file
 
+
+    def test_numbered_text_lines_in_prepared_text_returns_same_lines(self):
+        test_file = self.get_test_loc('analysis/verify.go')
+        expected = list(numbered_text_lines(test_file))
+        with prepared_text(test_file) as prepared:
+            assert list(numbered_text_lines(test_file)) == expected
+            assert list(numbered_text_lines(test_file)) == expected
+            # demarkup is a no-op for non-markup files and shares the same lines
+            assert list(numbered_text_lines(test_file, demarkup=True)) == expected
+        assert list(prepared.numbered_lines_by_variant) == [(False, False, 1)]
+
+    def test_numbered_text_lines_in_prepared_text_caches_markup_variants(self):
+        test_file = self.get_test_loc('markup/lgpl_license.html')
+        expected = list(numbered_text_lines(test_file))
+        expected_demarkup = list(numbered_text_lines(test_file, demarkup=True))
+        assert expected != expected_demarkup
+        with prepared_text(test_file) as prepared:
+            assert list(numbered_text_lines(test_file)) == expected
+            assert list(numbered_text_lines(test_file, demarkup=True)) == expected_demarkup
+        assert len(prepared.numbered_lines_by_variant) == 2
+
+    def test_numbered_text_lines_in_prepared_text_ignores_other_locations(self):
+        test_file = self.get_test_loc('analysis/verify.go')
+        other_file = self.get_test_loc('analysis/bsd-new')
+        with prepared_text(test_file) as prepared:
+            list(numbered_text_lines(other_file))
+        assert not prepared.numbered_lines_by_variant
+
+    def test_unicode_text_lines_splits_lines_like_splitlines(self):
+        test_file = self.get_temp_file()
+        content = b'a\r\nb\rc\n\nd\r\re'
+        with open(test_file, 'wb') as tf:
+            tf.write(content)
+        expected = [as_unicode(l) for l in content.splitlines(True)]
+        assert list(unicode_text_lines(test_file)) == expected
+
+    def test_numbered_text_lines_in_prepared_text_does_not_cache_large_files(self):
+        test_file = self.get_test_loc('analysis/verify.go')
+        expected = list(numbered_text_lines(test_file))
+        large_file_size = analysis.LARGE_FILE_SIZE
+        try:
+            analysis.LARGE_FILE_SIZE = 10
+            with prepared_text(test_file) as prepared:
+                assert list(numbered_text_lines(test_file)) == expected
+                assert list(numbered_text_lines(test_file)) == expected
+        finally:
+            analysis.LARGE_FILE_SIZE = large_file_size
+        assert not prepared.numbered_lines_by_variant
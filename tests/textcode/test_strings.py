@@ -180,3 +180,24 @@ class TestStrings(FileBasedTesting):
         test_file = 'strings/with-lf/strings.exe'
         expected_file = 'strings/with-lf/strings.exe.results'
         self.check_file_strings(test_file, expected_file, regen=REGEN_TEST_FIXTURES)
+
+    def test_strings_from_file_does_not_split_strings_across_chunks(self):
+        test_file = self.get_temp_file()
+        with open(test_file, 'wb') as tf:
+            tf.write(b'\x01\x02' * 7 + b'some long string across chunks\x01\x02')
+            tf.write('wide string'.encode('utf-16-le') + b'\x01\x02' * 5)
+        expected = ['some long string across chunks', 'wide string']
+        for buff_size in list(range(40, 80)) + [1024]:
+            results = list(strings.strings_from_file(test_file, buff_size=buff_size))
+            assert results == expected
+
+    def test_strings_from_string_with_utf16_strings(self):
+        data = (
+            b'\x01\x02'
+            + 'little endian'.encode('utf-16-le')
+            + b'\x00\x00\x01\x02'
+            + 'big endian'.encode('utf-16-be')
+            + b'\x01\x02'
+        )
+        expected = ['little endian', 'big endian']
+        assert list(strings.strings_from_string(data)) == expected